@@ -1,13 +1,22 @@
-import tkinter as tk
-from tkinter import scrolledtext, ttk, messagebox, filedialog
+import sys
+import csv
+import json
 import platform
 import socket
-import psutil
 import subprocess
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, KeepTogether
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
+import time
+import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Seconds any single probe may run before it is reported as timed out
+PROBE_TIMEOUT = 30
+TIMED_OUT = "Timed Out"
+
+# Fields that cannot change while the program runs are collected once; the rest
+# are reused by export_to_pdf for SNAPSHOT_TTL seconds after show_info.
+STATIC_FIELDS = ("System Name", "CPU Model Name", "CPU Details", "CPU Tag Number", "OS Name")
+SNAPSHOT_TTL = 60
+_snapshot = {"info": None, "time": 0.0}
 
 def get_system_name():
     return platform.node()
@@ -20,58 +29,74 @@ def get_ip_address():
         return "N/A"
 
 def get_ram():
+    import psutil
     ram_bytes = psutil.virtual_memory().total
     ram_gb = ram_bytes / (1024 ** 3)
     return f"{ram_gb:.2f} GB"
 
+def parse_disks_csv(output):
+    # `wmic diskdrive get Model,Size /format:csv` -> [(model, size)]
+    disks = []
+    for line in output.split('\n'):
+        if line.strip() and not line.startswith('Node,'):
+            parts = line.strip().split(',')
+            if len(parts) == 3:
+                _, model, size = parts
+                if "virtual" in model.lower():
+                    continue
+                if size.isdigit():
+                    size_gb = f"{int(size) / (1024 ** 3):.2f} GB"
+                else:
+                    size_gb = "Unknown Size"
+                disks.append((model, size_gb))
+    return disks
+
+def parse_first_value(output):
+    # `wmic <class> get <property>`: the first non-empty line after the header
+    for line in output.strip().split('\n')[1:]:
+        if line.strip():
+            return line.strip()
+    return None
+
+def parse_cpu_csv(output):
+    # wmic returns the columns in alphabetical order, not in the order asked for
+    header = None
+    for line in output.split('\n'):
+        parts = line.strip().split(',')
+        if parts[0] == 'Node':
+            header = parts
+        elif header and len(parts) == len(header):
+            cpu = dict(zip(header, parts))
+            return (f"{cpu['Name']}, {cpu['MaxClockSpeed']} MHz, {cpu['NumberOfCores']} Core(s), "
+                    f"{cpu['NumberOfLogicalProcessors']} Logical Processor(s)")
+    return "Unknown CPU"
+
 def get_disks_physical():
     try:
         result = subprocess.check_output(
-            'wmic diskdrive get Model,Size /format:csv',
-            shell=True
-        ).decode(errors="ignore").split('\n')
-        disks = []
-        for line in result:
-            if line.strip() and not line.startswith('Node,'):
-                parts = line.strip().split(',')
-                if len(parts) == 3:
-                    _, model, size = parts
-                    if "virtual" in model.lower():
-                        continue
-                    if size.isdigit():
-                        size_gb = f"{int(size) / (1024 ** 3):.2f} GB"
-                    else:
-                        size_gb = "Unknown Size"
-                    disks.append((model, size_gb))
-        return disks
+            ['wmic', 'diskdrive', 'get', 'Model,Size', '/format:csv'],
+            timeout=PROBE_TIMEOUT
+        ).decode(errors="ignore")
+        return parse_disks_csv(result)
     except Exception as e:
         return [("Error", str(e))]
 
 def get_system_model():
     try:
         result = subprocess.check_output(
-            'wmic computersystem get model', shell=True
-        ).decode(errors="ignore").strip().split('\n')
-        for line in result[1:]:
-            if line.strip():
-                return line.strip()
+            ['wmic', 'computersystem', 'get', 'model'], timeout=PROBE_TIMEOUT
+        ).decode(errors="ignore")
+        return parse_first_value(result) or "Unknown Model"
     except Exception:
-        pass
-    return "Unknown Model"
+        return "Unknown Model"
 
 def get_cpu_details():
     try:
         proc_info = subprocess.check_output(
-            'wmic cpu get Name,NumberOfCores,NumberOfLogicalProcessors,MaxClockSpeed /format:csv',
-            shell=True
-        ).decode(errors="ignore").split('\n')
-        for line in proc_info:
-            if line.strip() and not line.startswith('Node,'):
-                parts = line.strip().split(',')
-                if len(parts) == 5:
-                    _, name, cores, logical, freq = parts
-                    return f"{name}, {freq} MHz, {cores} Core(s), {logical} Logical Processor(s)"
-        return "Unknown CPU"
+            ['wmic', 'cpu', 'get', 'Name,NumberOfCores,NumberOfLogicalProcessors,MaxClockSpeed', '/format:csv'],
+            timeout=PROBE_TIMEOUT
+        ).decode(errors="ignore")
+        return parse_cpu_csv(proc_info)
     except Exception as e:
         return f"Error: {e}"
 
@@ -83,14 +108,10 @@ def get_status():
 
 def get_cpu_tag():
     try:
-        result = subprocess.check_output("wmic bios get serialnumber", shell=True)
-        lines = result.decode(errors="ignore").strip().split('\n')
-        for line in lines[1:]:
-            if line.strip():
-                return line.strip()
+        result = subprocess.check_output(['wmic', 'bios', 'get', 'serialnumber'], timeout=PROBE_TIMEOUT)
+        return parse_first_value(result.decode(errors="ignore")) or "Not Found"
     except Exception as e:
         return f"Error: {e}"
-    return "Not Found"
 
 def get_monitor_tags():
     powershell_script = r"""
@@ -117,29 +138,67 @@ $result -join "`n`n"
     try:
         result = subprocess.check_output(
             ["powershell", "-Command", powershell_script],
-            stderr=subprocess.STDOUT
+            stderr=subprocess.STDOUT,
+            timeout=PROBE_TIMEOUT
         )
         return result.decode(errors="ignore").strip()
     except Exception as e:
         return f"Error: {e}"
 
-def gather_info():
+def gather_info(fields=None):
+    probes = [
+        ("System Name", get_system_name),
+        ("IP Address", get_ip_address),
+        ("RAM", get_ram),
+        ("CPU Model Name", get_system_model),
+        ("CPU Details", get_cpu_details),
+        ("CPU Tag Number", get_cpu_tag),
+        ("Monitor Details", get_monitor_tags),
+        ("Disks", get_disks_physical),
+        ("OS Name", get_os_name),
+        ("OS Status", get_status),
+    ]
+    if fields is not None:
+        probes = [(key, probe) for key, probe in probes if key in fields]
+    # Run every probe at once; a hung one costs PROBE_TIMEOUT, not the whole run
+    executor = ThreadPoolExecutor(max_workers=len(probes))
+    futures = [(key, executor.submit(probe)) for key, probe in probes]
+    done, _ = wait([future for _, future in futures], timeout=PROBE_TIMEOUT)
+    executor.shutdown(wait=False)
     info = {}
-    info["System Name"] = get_system_name()
-    info["IP Address"] = get_ip_address()
-    info["RAM"] = get_ram()
-    info["CPU Model Name"] = get_system_model()
-    info["CPU Details"] = get_cpu_details()
-    info["CPU Tag Number"] = get_cpu_tag()
-    info["Monitor Details"] = get_monitor_tags()
-    info["Disks"] = get_disks_physical()
-    info["OS Name"] = get_os_name()
-    info["OS Status"] = get_status()
+    for key, future in futures:
+        if future not in done:
+            future.cancel()
+            info[key] = TIMED_OUT
+        elif future.exception():
+            info[key] = f"Error: {future.exception()}"
+        else:
+            info[key] = future.result()
+    if not isinstance(info.get("Disks", []), list):
+        info["Disks"] = [(info["Disks"], "")]
+    return info
+
+def _is_valid(value):
+    return value != TIMED_OUT and not str(value).startswith("Error:")
+
+def get_snapshot(max_age=SNAPSHOT_TTL):
+    cached = _snapshot["info"]
+    if cached is not None and time.monotonic() - _snapshot["time"] < max_age:
+        return cached
+    if cached is None:
+        info = gather_info()
+    else:
+        keep = [key for key in STATIC_FIELDS if _is_valid(cached[key])]
+        info = gather_info([key for key in cached if key not in keep])
+        info.update({key: cached[key] for key in keep})
+        info = {key: info[key] for key in cached}
+    _snapshot["info"] = info
+    _snapshot["time"] = time.monotonic()
     return info
 
 def show_info():
     try:
-        info = gather_info()
+        info = get_snapshot(max_age=0)
         for key in field_labels:
             field_labels[key]["value"].config(text=info[key] if key not in ["Disks", "Monitor Details", "CPU Tag Number"] else "")
         disk_tree.delete(*disk_tree.get_children())
@@ -156,8 +215,76 @@ def show_info():
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred:\n{e}")
 
+_pdf_styles = {}
+
+def get_pdf_styles():
+    # Built on the first export and reused afterwards; derived styles are used
+    # so the sample stylesheet is never modified
+    if _pdf_styles:
+        return _pdf_styles
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+    from reportlab.lib import colors
+    styles = getSampleStyleSheet()
+    _pdf_styles["normal"] = styles['Normal']
+    _pdf_styles["title"] = ParagraphStyle(
+        name='ReportTitle',
+        parent=styles['Title'],
+        fontSize=22,
+        alignment=1,  # Center
+    )
+    _pdf_styles["section_heading"] = ParagraphStyle(
+        name='SectionHeading',
+        parent=styles['Heading3'],
+        fontSize=13,
+        leading=16,
+        spaceBefore=14,
+        spaceAfter=6,
+        textColor=colors.HexColor("#1a237e"),
+    )
+    _pdf_styles["monitor_heading"] = ParagraphStyle(
+        name='MonitorHeading',
+        parent=styles['Heading4'],
+        fontSize=11,
+        leading=13,
+        spaceBefore=10,
+        italic=True,
+        textColor=colors.HexColor("#222")
+    )
+    _pdf_styles["footer"] = ParagraphStyle(
+        name='Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.HexColor("#888"),
+        alignment=0,
+        spaceBefore=24
+    )
+    _pdf_styles["info_table"] = TableStyle([
+        ('BACKGROUND', (0,0), (-1,-1), colors.HexColor("#f8faff")),
+        ('BOX', (0,0), (-1,-1), 1, colors.HexColor("#1a237e")),
+        ('INNERGRID', (0,0), (-1,-1), 0.5, colors.HexColor("#b0b6d6")),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+        ('FONTSIZE', (0,0), (-1,-1), 10),
+        ('LEFTPADDING', (0,0), (-1,-1), 10),
+        ('RIGHTPADDING', (0,0), (-1,-1), 8),
+        ('TOPPADDING', (0,0), (-1,-1), 5),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 5),
+    ])
+    _pdf_styles["disk_table"] = TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#e3e6f3")),
+        ('BOX', (0,0), (-1,-1), 1, colors.HexColor("#1a237e")),
+        ('INNERGRID', (0,0), (-1,-1), 0.5, colors.HexColor("#b0b6d6")),
+        ('FONTSIZE', (0,0), (-1,-1), 10),
+        ('LEFTPADDING', (0,0), (-1,-1), 10),
+        ('RIGHTPADDING', (0,0), (-1,-1), 8),
+        ('TOPPADDING', (0,0), (-1,-1), 4),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.HexColor("#f5f7fa")]),
+    ])
+    return _pdf_styles
+
 def export_to_pdf():
-    info = gather_info()
+    info = get_snapshot()
     default_filename = f"{info['System Name']}-Info.pdf"
     file_path = filedialog.asksaveasfilename(
         defaultextension=".pdf",
@@ -169,43 +296,14 @@ def export_to_pdf():
         return
 
     try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, KeepTogether
         doc = SimpleDocTemplate(file_path, pagesize=A4, rightMargin=36, leftMargin=36, topMargin=36, bottomMargin=36)
-        styles = getSampleStyleSheet()
-        # Custom styles
-        title_style = styles['Title']
-        title_style.fontSize = 22
-        title_style.alignment = 1  # Center
-
-        section_heading = ParagraphStyle(
-            name='SectionHeading',
-            parent=styles['Heading3'],
-            fontSize=13,
-            leading=16,
-            spaceBefore=14,
-            spaceAfter=6,
-            textColor=colors.HexColor("#1a237e"),
-        )
-        monitor_heading = ParagraphStyle(
-            name='MonitorHeading',
-            parent=styles['Heading4'],
-            fontSize=11,
-            leading=13,
-            spaceBefore=10,
-            italic=True,
-            textColor=colors.HexColor("#222")
-        )
-        footer_style = ParagraphStyle(
-            name='Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor("#888"),
-            alignment=0,
-            spaceBefore=24
-        )
+        styles = get_pdf_styles()
         elements = []
 
         # Title
-        elements.append(Paragraph("System Asset Information Report", title_style))
+        elements.append(Paragraph("System Asset Information Report", styles['title']))
         elements.append(Spacer(1, 20))
 
         # Info Table (no HTML tags, just bold text for keys)
@@ -222,49 +320,29 @@ def export_to_pdf():
         ]
         for key, value in field_names:
             table_data.append(
-                [Paragraph(f"<b>{key}</b>", styles['Normal']), Paragraph(str(value), styles['Normal'])]
+                [Paragraph(f"<b>{key}</b>", styles['normal']), Paragraph(str(value), styles['normal'])]
             )
         info_table = Table(table_data, colWidths=[155, 325])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,-1), colors.HexColor("#f8faff")),
-            ('BOX', (0,0), (-1,-1), 1, colors.HexColor("#1a237e")),
-            ('INNERGRID', (0,0), (-1,-1), 0.5, colors.HexColor("#b0b6d6")),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('FONTSIZE', (0,0), (-1,-1), 10),
-            ('LEFTPADDING', (0,0), (-1,-1), 10),
-            ('RIGHTPADDING', (0,0), (-1,-1), 8),
-            ('TOPPADDING', (0,0), (-1,-1), 5),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 5),
-        ]))
+        info_table.setStyle(styles['info_table'])
         elements.append(KeepTogether([info_table, Spacer(1, 12)]))
 
         # Disk Info
-        elements.append(Paragraph("SSD & HDD Info (Physical Drives)", section_heading))
-        disk_data = [[Paragraph("<b>Model</b>", styles['Normal']), Paragraph("<b>Size</b>", styles['Normal'])]]
+        elements.append(Paragraph("SSD & HDD Info (Physical Drives)", styles['section_heading']))
+        disk_data = [[Paragraph("<b>Model</b>", styles['normal']), Paragraph("<b>Size</b>", styles['normal'])]]
         for model, size in info["Disks"]:
-            disk_data.append([Paragraph(model, styles['Normal']), Paragraph(size, styles['Normal'])])
+            disk_data.append([Paragraph(model, styles['normal']), Paragraph(size, styles['normal'])])
         disk_table = Table(disk_data, colWidths=[300, 90])
-        disk_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#e3e6f3")),
-            ('BOX', (0,0), (-1,-1), 1, colors.HexColor("#1a237e")),
-            ('INNERGRID', (0,0), (-1,-1), 0.5, colors.HexColor("#b0b6d6")),
-            ('FONTSIZE', (0,0), (-1,-1), 10),
-            ('LEFTPADDING', (0,0), (-1,-1), 10),
-            ('RIGHTPADDING', (0,0), (-1,-1), 8),
-            ('TOPPADDING', (0,0), (-1,-1), 4),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 4),
-            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.HexColor("#f5f7fa")]),
-        ]))
+        disk_table.setStyle(styles['disk_table'])
         elements.append(KeepTogether([disk_table, Spacer(1, 16)]))
 
         # Monitor Details
-        elements.append(Paragraph("Monitor Details", monitor_heading))
+        elements.append(Paragraph("Monitor Details", styles['monitor_heading']))
         monitor_details = info["Monitor Details"].replace('\n', '<br/>')
-        elements.append(Paragraph(monitor_details, styles['Normal']))
+        elements.append(Paragraph(monitor_details, styles['normal']))
         elements.append(Spacer(1, 18))
 
         # Footer
-        elements.append(Paragraph("© 2025 System Asset Info | IT Department", footer_style))
+        elements.append(Paragraph("© 2025 System Asset Info | IT Department", styles['footer']))
 
         doc.build(elements)
         messagebox.showinfo("Exported", f"PDF exported successfully:\n{file_path}")
@@ -272,90 +350,136 @@ def export_to_pdf():
     except Exception as e:
         messagebox.showerror("Export Error", f"Failed to export PDF:\n{e}")
 
-# --------- UI Layout ---------
-root = tk.Tk()
-root.title("Professional System Asset Info")
-root.geometry("760x760")
-root.configure(bg="#f5f7fa")
-
-style = ttk.Style()
-style.configure('TLabel', font=('Segoe UI', 11), background="#f5f7fa")
-style.configure('TButton', font=('Segoe UI', 11, 'bold'), padding=6)
-style.configure('Treeview', font=('Consolas', 10), rowheight=24)
-style.configure('Treeview.Heading', font=('Segoe UI', 11, 'bold'))
-
-main_frame = ttk.Frame(root, padding=18, style='TFrame')
-main_frame.pack(fill=tk.BOTH, expand=True)
-
-header = ttk.Label(
-    main_frame,
-    text="System Asset Information",
-    font=('Segoe UI', 18, 'bold'),
-    background="#f5f7fa",
-    foreground="#1a237e"
-)
-header.pack(pady=(0,15))
-
-# Info fields
-fields = [
-    "System Name", "IP Address", "RAM",
-    "CPU Model Name", "CPU Details",
-    "OS Name", "OS Status"
-]
-field_labels = {}
-for f in fields:
-    frame = ttk.Frame(main_frame)
-    frame.pack(anchor='w', fill=tk.X, pady=2)
-    label = ttk.Label(frame, text=f + ":", width=18, font=('Segoe UI', 11, 'bold'))
-    label.pack(side=tk.LEFT)
-    value = ttk.Label(frame, text="", width=70, font=('Segoe UI', 11), foreground="#222")
-    value.pack(side=tk.LEFT, fill=tk.X, expand=True)
-    field_labels[f] = {"label": label, "value": value}
-
-# CPU Tag Number (as a highlighted, copyable field)
-cpu_tag_frame = ttk.Frame(main_frame)
-cpu_tag_frame.pack(anchor='w', fill=tk.X, pady=10)
-cpu_tag_label = ttk.Label(cpu_tag_frame, text="CPU Tag Number:", width=18, font=('Segoe UI', 11, 'bold'))
-cpu_tag_label.pack(side=tk.LEFT)
-cpu_tag_entry = ttk.Entry(cpu_tag_frame, width=60, font=('Segoe UI', 11))
-cpu_tag_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-cpu_tag_entry.config(state='readonly')
-
-# Disk Info
-disk_label = ttk.Label(main_frame, text="SSD & HDD Info (Physical Drives):", font=('Segoe UI', 12, 'bold'))
-disk_label.pack(anchor='w', pady=(15,3))
-disk_tree = ttk.Treeview(main_frame, columns=("Model", "Size"), show='headings', height=4)
-disk_tree.heading("Model", text="Model")
-disk_tree.heading("Size", text="Size")
-disk_tree.column("Model", width=400, anchor='w')
-disk_tree.column("Size", width=100, anchor='center')
-disk_tree.pack(fill=tk.X, padx=4)
-
-# Monitor Info
-monitor_label = ttk.Label(main_frame, text="Monitor Details:", font=('Segoe UI', 12, 'bold'))
-monitor_label.pack(anchor='w', pady=(15,3))
-monitor_text = scrolledtext.ScrolledText(main_frame, width=80, height=4, font=('Consolas', 10), wrap=tk.WORD)
-monitor_text.pack(fill=tk.X)
-monitor_text.config(state='disabled', background="#f8fafc")
-
-# Buttons
-btn_frame = ttk.Frame(main_frame)
-btn_frame.pack(pady=22)
-
-btn_info = ttk.Button(btn_frame, text="Get System Info", command=show_info)
-btn_info.pack(side=tk.LEFT, padx=(0,10))
-
-btn_pdf = ttk.Button(btn_frame, text="Export as PDF", command=export_to_pdf)
-btn_pdf.pack(side=tk.LEFT)
-
-# Footer
-footer = ttk.Label(
-    main_frame,
-    text="© 2025 System Asset Info | IT Department",
-    font=('Segoe UI', 9),
-    background="#f5f7fa",
-    foreground="#999"
-)
-footer.pack(side=tk.BOTTOM, pady=(18,0))
-
-root.mainloop()
\ No newline at end of file
+# --------- Headless mode ---------
+HEADLESS_FORMATS = ("json", "csv", "ndjson")
+
+def run_headless(argv):
+    # Collect without a window (no tkinter/reportlab) and write JSON, CSV or NDJSON
+    import argparse
+    parser = argparse.ArgumentParser(description="Collect system asset information without a window.")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--format", choices=HEADLESS_FORMATS, default="json")
+    parser.add_argument("--output", "-o", default="-", help="output file, '-' for stdout (default)")
+    args = parser.parse_args(argv)
+    if args.output == "-" and sys.stdout is None:
+        # The windowed EXE has no console; Asset_Info-cli.exe or --output FILE does
+        print("No console to write to: pass --output FILE, or run Asset_Info-cli.exe", file=sys.stderr)
+        return 2
+    record = {"Collected At": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")}
+    record.update(gather_info())
+    record["Disks"] = [list(disk) for disk in record["Disks"]]
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    try:
+        if args.format == "json":
+            out.write(json.dumps(record, indent=2, ensure_ascii=False) + "\n")
+        elif args.format == "ndjson":
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            record["Disks"] = "; ".join(" | ".join(disk) for disk in record["Disks"])
+            record["Monitor Details"] = record["Monitor Details"].replace("\n\n", "; ").replace("\n", ", ")
+            writer = csv.DictWriter(out, fieldnames=list(record))
+            writer.writeheader()
+            writer.writerow(record)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+if __name__ == "__main__" and "--headless" in sys.argv:
+    sys.exit(run_headless(sys.argv[1:]))
+
+if __name__ == "__main__":
+    # --------- UI Layout ---------
+    import tkinter as tk
+    from tkinter import scrolledtext, ttk, messagebox, filedialog
+
+    root = tk.Tk()
+    root.title("Professional System Asset Info")
+    root.geometry("760x760")
+    root.configure(bg="#f5f7fa")
+
+    style = ttk.Style()
+    style.configure('TLabel', font=('Segoe UI', 11), background="#f5f7fa")
+    style.configure('TButton', font=('Segoe UI', 11, 'bold'), padding=6)
+    style.configure('Treeview', font=('Consolas', 10), rowheight=24)
+    style.configure('Treeview.Heading', font=('Segoe UI', 11, 'bold'))
+
+    main_frame = ttk.Frame(root, padding=18, style='TFrame')
+    main_frame.pack(fill=tk.BOTH, expand=True)
+
+    header = ttk.Label(
+        main_frame,
+        text="System Asset Information",
+        font=('Segoe UI', 18, 'bold'),
+        background="#f5f7fa",
+        foreground="#1a237e"
+    )
+    header.pack(pady=(0,15))
+
+    # Info fields
+    fields = [
+        "System Name", "IP Address", "RAM",
+        "CPU Model Name", "CPU Details",
+        "OS Name", "OS Status"
+    ]
+    field_labels = {}
+    for f in fields:
+        frame = ttk.Frame(main_frame)
+        frame.pack(anchor='w', fill=tk.X, pady=2)
+        label = ttk.Label(frame, text=f + ":", width=18, font=('Segoe UI', 11, 'bold'))
+        label.pack(side=tk.LEFT)
+        value = ttk.Label(frame, text="", width=70, font=('Segoe UI', 11), foreground="#222")
+        value.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        field_labels[f] = {"label": label, "value": value}
+
+    # CPU Tag Number (as a highlighted, copyable field)
+    cpu_tag_frame = ttk.Frame(main_frame)
+    cpu_tag_frame.pack(anchor='w', fill=tk.X, pady=10)
+    cpu_tag_label = ttk.Label(cpu_tag_frame, text="CPU Tag Number:", width=18, font=('Segoe UI', 11, 'bold'))
+    cpu_tag_label.pack(side=tk.LEFT)
+    cpu_tag_entry = ttk.Entry(cpu_tag_frame, width=60, font=('Segoe UI', 11))
+    cpu_tag_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+    cpu_tag_entry.config(state='readonly')
+
+    # Disk Info
+    disk_label = ttk.Label(main_frame, text="SSD & HDD Info (Physical Drives):", font=('Segoe UI', 12, 'bold'))
+    disk_label.pack(anchor='w', pady=(15,3))
+    disk_tree = ttk.Treeview(main_frame, columns=("Model", "Size"), show='headings', height=4)
+    disk_tree.heading("Model", text="Model")
+    disk_tree.heading("Size", text="Size")
+    disk_tree.column("Model", width=400, anchor='w')
+    disk_tree.column("Size", width=100, anchor='center')
+    disk_tree.pack(fill=tk.X, padx=4)
+
+    # Monitor Info
+    monitor_label = ttk.Label(main_frame, text="Monitor Details:", font=('Segoe UI', 12, 'bold'))
+    monitor_label.pack(anchor='w', pady=(15,3))
+    monitor_text = scrolledtext.ScrolledText(main_frame, width=80, height=4, font=('Consolas', 10), wrap=tk.WORD)
+    monitor_text.pack(fill=tk.X)
+    monitor_text.config(state='disabled', background="#f8fafc")
+
+    # Buttons
+    btn_frame = ttk.Frame(main_frame)
+    btn_frame.pack(pady=22)
+
+    btn_info = ttk.Button(btn_frame, text="Get System Info", command=show_info)
+    btn_info.pack(side=tk.LEFT, padx=(0,10))
+
+    btn_pdf = ttk.Button(btn_frame, text="Export as PDF", command=export_to_pdf)
+    btn_pdf.pack(side=tk.LEFT)
+
+    # Footer
+    footer = ttk.Label(
+        main_frame,
+        text="© 2025 System Asset Info | IT Department",
+        font=('Segoe UI', 9),
+        background="#f5f7fa",
+        foreground="#999"
+    )
+    footer.pack(side=tk.BOTTOM, pady=(18,0))
+
+    # Used by v2/benchmarks/bench_startup.py: close as soon as the window is drawn
+    if "--startup-benchmark" in sys.argv:
+        root.bind('<Map>', lambda event: root.after_idle(root.destroy))
+
+    root.mainloop()
@@ -1,209 +1,209 @@
+import os
+import sys
+
+if __name__ == "__main__" and "--headless" in sys.argv:
+    # No window: collect and write JSON/CSV/NDJSON (see headless.py --help)
+    from headless import main
+    sys.exit(main([arg for arg in sys.argv[1:] if arg != "--headless"]))
+
+if __name__ == "__main__" and "--agent" in sys.argv:
+    # No window: serve the snapshot over HTTP (see agent.py --help)
+    from agent import main
+    sys.exit(main([arg for arg in sys.argv[1:] if arg != "--agent"]))
+
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox, filedialog
-import platform
-import socket
-import psutil
-import subprocess
-import json
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, KeepTogether
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-
-POWERSHELL_PATH = r"C:\Windows\System32\WindowsPowerShell\v1.0\powershell.exe"
-
-def get_system_name():
-    return platform.node()
-
-def get_ip_address():
-    try:
-        hostname = socket.gethostname()
-        return socket.gethostbyname(hostname)
-    except:
-        return "N/A"
+import queue
+import shutil
+import threading
+from collectors import FIELD_ORDER
+from records import TABLE_FIELDS, render_info, render_field
+from snapshot_cache import SnapshotCache, default_cache_path
+from instrumentation import RunMetrics, profile_call, profile_path
+from monitor import Sampler, RATES_HZ, DEFAULT_RATE_HZ, sparkline_points, format_value
 
-def get_ram():
-    ram_bytes = psutil.virtual_memory().total
-    ram_gb = ram_bytes / (1024 ** 3)
-    return f"{ram_gb:.2f} GB"
+# Shared by show_info and export_to_pdf so exporting does not re-run every probe.
+# Both are created on the first collection, on the worker thread: the cache
+# loads psutil and the store sqlite3, neither of which the first window needs.
+snapshot_cache = None
+snapshot_store = None
 
-def get_serial_number():
-    try:
-        result = subprocess.check_output(
-            [POWERSHELL_PATH, "-Command", "(Get-CimInstance Win32_BIOS).SerialNumber"],
-            stderr=subprocess.STDOUT
-        )
-        return result.decode(errors="ignore").strip()
-    except Exception as e:
-        return f"Error: {e}"
+def set_entry(entry, value):
+    entry.config(state='normal')
+    entry.delete(0, tk.END)
+    entry.insert(0, value)
+    entry.config(state='readonly')
 
-def get_product_key():
-    try:
-        ps_cmd = "(Get-WmiObject -query 'select * from SoftwareLicensingService').OA3xOriginalProductKey"
-        result = subprocess.check_output(
-            [POWERSHELL_PATH, "-Command", ps_cmd],
-            stderr=subprocess.STDOUT
-        )
-        key = result.decode(errors="ignore").strip()
-        if not key:
-            return "Not Found"
-        return key
-    except Exception as e:
-        return f"Error: {e}"
+def set_text(text, value):
+    text.config(state='normal')
+    text.delete(1.0, tk.END)
+    text.insert(tk.END, value)
+    text.config(state='disabled')
 
-def get_disks_physical():
-    try:
-        ps_cmd = """
-        $disks = Get-PhysicalDisk | Select-Object FriendlyName, MediaType, Size
-        if (-not $disks) {
-            $disks = Get-CimInstance Win32_DiskDrive | Select-Object Model, Size
-            foreach ($disk in $disks) { $disk | Add-Member -NotePropertyName MediaType -NotePropertyValue "Unknown" }
-        }
-        $disks | ConvertTo-Json
-        """
-        result = subprocess.check_output(
-            [POWERSHELL_PATH, "-Command", ps_cmd],
-            stderr=subprocess.STDOUT
-        )
-        disks = json.loads(result.decode(errors="ignore"))
-        if isinstance(disks, dict):  # Only one disk
-            disks = [disks]
-        output = []
-        for d in disks:
-            model = d.get("FriendlyName") or d.get("Model") or "Unknown"
-            size = d.get("Size")
-            size_gb = f"{int(size) / (1024 ** 3):.2f} GB" if size and str(size).isdigit() else "Unknown Size"
-            dtype = d.get("MediaType", "Unknown")
-            output.append((model, size_gb, dtype))
-        return output
-    except Exception as e:
-        return [("Error", str(e), "Unknown")]
+def set_rows(tree, rows):
+    tree.delete(*tree.get_children())
+    for row in rows:
+        tree.insert('', tk.END, values=row)
+
+def copy_rows(tree):
+    # Tab-separated, with headers, so it pastes into a spreadsheet
+    lines = ["\t".join(tree["columns"])]
+    lines += ["\t".join(map(str, tree.item(item, "values"))) for item in tree.get_children()]
+    root.clipboard_clear()
+    root.clipboard_append("\n".join(lines))
 
-def get_system_model():
+def show_field(key, value):
+    if key in field_labels:
+        set_entry(field_labels[key]["value"], value)
+    elif key == "Disks":
+        # Disk info (showing model, size, type) as copyable text
+        disk_lines = []
+        for model, size, dtype in value:
+            disk_lines.append(f"Model: {model}    Size: {size}    Type: {dtype}")
+        set_text(disk_text, "\n".join(disk_lines))
+    elif key == "Network Adapters":
+        set_rows(adapter_tree, value)
+    elif key == "Monitor Details":
+        set_text(monitor_text, value)
+    elif key == "Serial Number":
+        set_entry(serial_entry, value)
+    elif key == "Product Key":
+        set_entry(product_key_entry, value)
+
+def clear_fields():
+    for key in field_labels:
+        set_entry(field_labels[key]["value"], "")
+    for entry in (serial_entry, product_key_entry):
+        set_entry(entry, "")
+    for text in (disk_text, monitor_text):
+        set_text(text, "")
+    set_rows(adapter_tree, [])
+
+# --------- Background collection ---------
+# Probes run on a worker thread; results come back through a queue that the
+# Tk main loop polls, so the window stays responsive and fills in field by field.
+POLL_INTERVAL_MS = 40
+result_queue = queue.Queue()
+collection = {"worker": None, "cancel": None, "on_done": None, "received": set()}
+# Instrumentation of the last collection and the last PDF export
+diagnostics = {"Collection": None, "PDF Export": None}
+
+def record_history(snapshot):
+    # Every completed run is kept in the local snapshot history
+    global snapshot_store
     try:
-        result = subprocess.check_output(
-            [POWERSHELL_PATH, "-Command", "(Get-CimInstance Win32_ComputerSystem).Model"],
-            stderr=subprocess.STDOUT
-        )
-        return result.decode(errors="ignore").strip()
+        if snapshot_store is None:
+            from snapshot_store import SnapshotStore
+            snapshot_store = SnapshotStore()
+        snapshot_store.add(snapshot)
     except Exception:
-        return "Unknown Model"
+        pass
 
-def get_cpu_details():
-    try:
-        ps_cmd = """
-        $cpu = Get-CimInstance Win32_Processor
-        "$($cpu.Name), $($cpu.MaxClockSpeed) MHz, $($cpu.NumberOfCores) Core(s), $($cpu.NumberOfLogicalProcessors) Logical Processor(s)"
-        """
-        result = subprocess.check_output(
-            [POWERSHELL_PATH, "-Command", ps_cmd],
-            stderr=subprocess.STDOUT
-        )
-        return result.decode(errors="ignore").strip()
-    except Exception as e:
-        return f"Error: {e}"
-
-def get_os_name():
-    return f"{platform.system()} {platform.release()}"
-
-def get_status():
-    return "Active"
-
-def get_monitor_tags():
-    powershell_script = r"""
-function Decode {
-    param($data)
-    if ($data -is [System.Array]) {
-        return [System.Text.Encoding]::ASCII.GetString($data).Trim([char]0)
-    }
-    else {
-        return "Not Found"
-    }
-}
-$monitors = Get-WmiObject WmiMonitorID -Namespace root\wmi
-$result = @()
-foreach ($monitor in $monitors) {
-    $name = (Decode $monitor.UserFriendlyName).Trim()
-    $serial = (Decode $monitor.SerialNumberID).Trim()
-    if ($name -and $serial) {
-        $result += "Name: $name`nSerial: $serial"
-    }
-}
-$result -join "`n`n"
-"""
+def get_snapshot_cache():
+    global snapshot_cache
+    if snapshot_cache is None:
+        snapshot_cache = SnapshotCache(persist_path=default_cache_path())
+    return snapshot_cache
+
+def collect_worker(cancel_event):
+    metrics = RunMetrics("Collection")
+    diagnostics["Collection"] = metrics
     try:
-        result = subprocess.check_output(
-            [POWERSHELL_PATH, "-Command", powershell_script],
-            stderr=subprocess.STDOUT
-        )
-        return result.decode(errors="ignore").strip()
+        # Typed values from the cache; the window only ever gets display text
+        snapshot = get_snapshot_cache().get(
+            cancel_event, metrics=metrics,
+            on_result=lambda key, value: result_queue.put(("field", key, render_field(key, value))))
+        metrics.finish()
+        if not cancel_event.is_set():
+            record_history(snapshot)
+        result_queue.put(("done", render_info(snapshot), None))
     except Exception as e:
-        return f"Error: {e}"
-
-def gather_info():
-    info = {}
-    info["System Name"] = get_system_name()
-    info["IP Address"] = get_ip_address()
-    info["RAM"] = get_ram()
-    info["CPU Model Name"] = get_system_model()
-    info["CPU Details"] = get_cpu_details()
-    info["Serial Number"] = get_serial_number()
-    info["Product Key"] = get_product_key()
-    info["Monitor Details"] = get_monitor_tags()
-    info["Disks"] = get_disks_physical()
-    info["OS Name"] = get_os_name()
-    info["OS Status"] = get_status()
-    return info
+        result_queue.put(("error", e, None))
+
+def start_collection(on_done=None):
+    if collection["worker"] is not None:
+        collection["on_done"] = on_done or collection["on_done"]
+        return
+    cancel_event = threading.Event()
+    collection.update(cancel=cancel_event, on_done=on_done, received=set())
+    progress.config(value=0, maximum=len(FIELD_ORDER))
+    status_label.config(text="Collecting system information...")
+    btn_info.config(state='disabled')
+    btn_pdf.config(state='disabled')
+    btn_cancel.config(state='normal')
+    worker = threading.Thread(target=collect_worker, args=(cancel_event,), daemon=True)
+    collection["worker"] = worker
+    worker.start()
+    root.after(POLL_INTERVAL_MS, poll_results)
+
+def poll_results():
+    while True:
+        try:
+            kind, payload, value = result_queue.get_nowait()
+        except queue.Empty:
+            break
+        if kind == "field":
+            if viewing["info"] is None:
+                show_field(payload, value)
+            collection["received"].add(payload)
+            progress.config(value=len(collection["received"]))
+        else:
+            finish_collection(kind, payload)
+            return
+    root.after(POLL_INTERVAL_MS, poll_results)
+
+def finish_collection(kind, payload):
+    on_done = collection["on_done"]
+    cancelled = collection["cancel"].is_set()
+    collection.update(worker=None, cancel=None, on_done=None)
+    btn_info.config(state='normal')
+    btn_pdf.config(state='normal')
+    btn_cancel.config(state='disabled')
+    refresh_diagnostics()
+    if kind == "error":
+        status_label.config(text="")
+        messagebox.showerror("Error", f"An error occurred:\n{payload}")
+    elif cancelled:
+        status_label.config(text="Cancelled")
+    else:
+        progress.config(value=len(FIELD_ORDER))
+        status_label.config(text="Done")
+        if viewing["info"] is None:
+            # Fields that arrived while a browsed host was shown
+            for key in FIELD_ORDER:
+                show_field(key, payload[key])
+        if on_done:
+            on_done(payload)
+
+def cancel_collection():
+    if collection["cancel"] is not None:
+        collection["cancel"].set()
+        status_label.config(text="Cancelling...")
 
 def show_info():
-    try:
-        info = gather_info()
-        # Main fields
-        for key in field_labels:
-            entry = field_labels[key]["value"]
-            entry.config(state='normal')
-            entry.delete(0, tk.END)
-            entry.insert(0, info.get(key, ""))
-            entry.config(state='readonly')
-        # Disk info (showing model, size, type) as copyable text
-        disk_text.config(state='normal')
-        disk_text.delete(1.0, tk.END)
-        disk_lines = []
-        for model, size, dtype in info["Disks"]:
-            disk_lines.append(f"Model: {model}    Size: {size}    Type: {dtype}")
-        disk_text.insert(tk.END, "\n".join(disk_lines))
-        disk_text.config(state='disabled')
-        # Monitor info as copyable text
-        monitor_text.config(state='normal')
-        monitor_text.delete(1.0, tk.END)
-        monitor_text.insert(tk.END, info["Monitor Details"])
-        monitor_text.config(state='disabled')
-        # Serial Number
-        serial_entry.config(state='normal')
-        serial_entry.delete(0, tk.END)
-        serial_entry.insert(0, info["Serial Number"])
-        serial_entry.config(state='readonly')
-        # Product Key
-        product_key_entry.config(state='normal')
-        product_key_entry.delete(0, tk.END)
-        product_key_entry.insert(0, info["Product Key"])
-        product_key_entry.config(state='readonly')
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred:\n{e}")
+    if viewing["info"] is not None:
+        # Back to this machine from a browsed host
+        viewing["info"] = None
+        clear_fields()
+    start_collection()
+
+def refresh_info(event=None):
+    if collection["worker"] is not None:
+        return
+    if snapshot_cache is not None:
+        snapshot_cache.invalidate()
+    clear_fields()
+    show_info()
 
 def export_to_pdf():
-    info = gather_info()
-    export_fields = [
-        ("System Name", info["System Name"]),
-        ("IP Address", info["IP Address"]),
-        ("RAM Size", info["RAM"]),
-        ("CPU Model Name", info["CPU Model Name"]),
-        ("CPU Details", info["CPU Details"]),
-        ("Serial Number", info["Serial Number"]),
-        ("Product Key", info["Product Key"]),
-        ("OS Name", info["OS Name"]),
-        ("OS Status", info["OS Status"]),
-    ]
+    # A browsed host is exported as shown; this machine is collected (or the
+    # cached snapshot reused) in the background, then saved
+    if viewing["info"] is not None:
+        save_pdf(viewing["info"])
+    else:
+        start_collection(lambda info: save_pdf(info, monitor_capture()))
+
+def save_pdf(info, capture=None):
     default_filename = f"{info['System Name']}-Asset-Info.pdf"
     file_path = filedialog.asksaveasfilename(
         defaultextension=".pdf",
@@ -213,102 +213,468 @@ def export_to_pdf():
     )
     if not file_path:
         return
+    metrics = RunMetrics("PDF Export")
+    diagnostics["PDF Export"] = metrics
     try:
-        doc = SimpleDocTemplate(file_path, pagesize=A4, rightMargin=36, leftMargin=36, topMargin=36, bottomMargin=36)
-        styles = getSampleStyleSheet()
-        # Custom styles
-        title_style = styles['Title']
-        title_style.fontSize = 22
-        title_style.alignment = 1  # Center
-        section_heading = ParagraphStyle(
-            name='SectionHeading',
-            parent=styles['Heading3'],
-            fontSize=13,
-            leading=16,
-            spaceBefore=14,
-            spaceAfter=6,
-            textColor=colors.HexColor("#1a237e"),
-        )
-        monitor_heading = ParagraphStyle(
-            name='MonitorHeading',
-            parent=styles['Heading4'],
-            fontSize=11,
-            leading=13,
-            spaceBefore=10,
-            italic=True,
-            textColor=colors.HexColor("#222")
-        )
-        footer_style = ParagraphStyle(
-            name='Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.HexColor("#888"),
-            alignment=0,
-            spaceBefore=24
-        )
-        elements = []
-        # Title
-        elements.append(Paragraph("System Asset Information Report", title_style))
-        elements.append(Spacer(1, 20))
-        # Info Table
-        table_data = []
-        for key, value in export_fields:
-            table_data.append([
-                Paragraph(f"<b>{key}</b>", styles['Normal']), Paragraph(str(value), styles['Normal'])
-            ])
-        info_table = Table(table_data, colWidths=[175, 305])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,-1), colors.HexColor("#f8faff")),
-            ('BOX', (0,0), (-1,-1), 1, colors.HexColor("#1a237e")),
-            ('INNERGRID', (0,0), (-1,-1), 0.5, colors.HexColor("#b0b6d6")),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('FONTSIZE', (0,0), (-1,-1), 10),
-            ('LEFTPADDING', (0,0), (-1,-1), 10),
-            ('RIGHTPADDING', (0,0), (-1,-1), 8),
-            ('TOPPADDING', (0,0), (-1,-1), 5),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 5),
-        ]))
-        elements.append(KeepTogether([info_table, Spacer(1, 12)]))
-        # Disk Info
-        elements.append(Paragraph("SSD & HDD Info (Physical Drives)", section_heading))
-        disk_data = [[Paragraph("<b>Model</b>", styles['Normal']), Paragraph("<b>Size</b>", styles['Normal']), Paragraph("<b>Type</b>", styles['Normal'])]]
-        for model, size, dtype in info["Disks"]:
-            disk_data.append([Paragraph(model, styles['Normal']), Paragraph(size, styles['Normal']), Paragraph(dtype, styles['Normal'])])
-        disk_table = Table(disk_data, colWidths=[220, 90, 100])
-        disk_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#e3e6f3")),
-            ('BOX', (0,0), (-1,-1), 1, colors.HexColor("#1a237e")),
-            ('INNERGRID', (0,0), (-1,-1), 0.5, colors.HexColor("#b0b6d6")),
-            ('FONTSIZE', (0,0), (-1,-1), 10),
-            ('LEFTPADDING', (0,0), (-1,-1), 10),
-            ('RIGHTPADDING', (0,0), (-1,-1), 8),
-            ('TOPPADDING', (0,0), (-1,-1), 4),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 4),
-            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.HexColor("#f5f7fa")]),
-        ]))
-        elements.append(KeepTogether([disk_table, Spacer(1, 16)]))
-        # Monitor Details
-        elements.append(Paragraph("Monitor Details", monitor_heading))
-        monitor_details = info["Monitor Details"].replace('\n', '<br/>')
-        elements.append(Paragraph(monitor_details, styles['Normal']))
-        elements.append(Spacer(1, 18))
-        # Footer
-        elements.append(Paragraph("© 2025 System Asset Info | IT Department", footer_style))
-        doc.build(elements)
+        with metrics.probe("Load reportlab"):
+            # reportlab is only needed here, so it is not loaded at startup
+            from report import get_template
+            template = get_template()
+        with metrics.probe("Render PDF") as stats:
+            template.render(info, file_path, capture=capture)
+            stats.bytes = os.path.getsize(file_path)
         messagebox.showinfo("Exported", f"PDF exported successfully:\n{file_path}")
     except Exception as e:
         messagebox.showerror("Export Error", f"Failed to export PDF:\n{e}")
+    finally:
+        metrics.finish()
+        refresh_diagnostics()
+
+# --------- Diagnostics ---------
+DIAGNOSTIC_COLUMNS = ("Probe", "Status", "Wall Time (ms)", "Spawns", "Bytes", "Failures")
+diagnostics_window = {"window": None, "tree": None}
+
+def show_diagnostics():
+    window = diagnostics_window["window"]
+    if window is not None and window.winfo_exists():
+        window.lift()
+        refresh_diagnostics()
+        return
+    window = tk.Toplevel(root)
+    window.title("Diagnostics")
+    window.geometry("640x360")
+    tree = ttk.Treeview(window, columns=DIAGNOSTIC_COLUMNS[1:], show='tree headings')
+    tree.heading('#0', text=DIAGNOSTIC_COLUMNS[0])
+    tree.column('#0', width=220)
+    for column in DIAGNOSTIC_COLUMNS[1:]:
+        tree.heading(column, text=column)
+        tree.column(column, width=80, anchor='e')
+    tree.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+    diagnostics_window.update(window=window, tree=tree)
+    refresh_diagnostics()
+
+def refresh_diagnostics():
+    window, tree = diagnostics_window["window"], diagnostics_window["tree"]
+    if window is None or not window.winfo_exists():
+        return
+    tree.delete(*tree.get_children())
+    for label, metrics in diagnostics.items():
+        if metrics is None:
+            continue
+        data = metrics.to_dict()
+        run = tree.insert('', tk.END, text=label, open=True,
+                          values=("", data["Wall Time (ms)"], data["Spawns"], data["Bytes"], data["Failures"]))
+        parents = {}
+        for probe in data["Probes"]:
+            values = [probe[column] for column in DIAGNOSTIC_COLUMNS[1:]]
+            parent = parents.get(probe["Parent"], run)
+            parents[probe["Probe"]] = tree.insert(parent, tk.END, text=probe["Probe"], values=values, open=True)
+
+# --------- Live monitor ---------
+# Sparklines over the monitor.Sampler ring buffers. Each sparkline is one canvas
+# line whose coordinates are replaced on redraw (no items are created or
+# deleted), and a redraw with no new sample since the last one does nothing,
+# so the main loop stays smooth at any sampling rate. Closing the window stops
+# sampling; the captured window is kept and goes into Export as PDF.
+REDRAW_MS = 250
+SPARKLINE_SIZE = (340, 34)
+monitor_view = {"window": None, "sampler": None, "rate": None, "status": None, "rows": None,
+                "lines": {}, "bars": None, "drawn": -1, "after": None}
+
+def show_monitor():
+    window = monitor_view["window"]
+    if window is not None and window.winfo_exists():
+        window.lift()
+        return
+    window = tk.Toplevel(root)
+    window.title("Live Monitor")
+    window.protocol("WM_DELETE_WINDOW", close_monitor)
+    controls = ttk.Frame(window, padding=(8, 8, 8, 0))
+    controls.pack(fill=tk.X)
+    ttk.Label(controls, text="Rate (Hz):").pack(side=tk.LEFT)
+    sampler = monitor_view["sampler"]
+    rate = tk.StringVar(value=str(round(1 / sampler.interval) if sampler else DEFAULT_RATE_HZ))
+    rate_box = ttk.Combobox(controls, textvariable=rate, values=RATES_HZ, width=4, state='readonly')
+    rate_box.pack(side=tk.LEFT, padx=(6, 0))
+    rate_box.bind('<<ComboboxSelected>>', lambda event: start_monitor())
+    status = ttk.Label(controls, text="", font=('Segoe UI', 9), foreground="#555")
+    status.pack(side=tk.LEFT, padx=(12, 0))
+    monitor_view.update(window=window, rate=rate, status=status, rows=None)
+    start_monitor()
+
+def build_monitor_rows(sampler):
+    rows = ttk.Frame(monitor_view["window"], padding=8)
+    rows.pack(fill=tk.BOTH, expand=True)
+    width, height = SPARKLINE_SIZE
+    lines = {}
+    for row, series in enumerate([sampler.cpu, sampler.memory] + sampler.rates):
+        ttk.Label(rows, text=series.name, width=13).grid(row=row, column=0, sticky='w')
+        canvas = tk.Canvas(rows, width=width, height=height, bg="#f8fafc", highlightthickness=0)
+        canvas.grid(row=row, column=1, pady=2)
+        line = canvas.create_line(0, height - 1, width, height - 1, fill="#1a237e")
+        value = ttk.Label(rows, text="", width=12, anchor='e', font=('Consolas', 10))
+        value.grid(row=row, column=2, sticky='e', padx=(8, 0))
+        lines[series.name] = (series, canvas, line, value)
+    # Per-core load as one bar per core, latest sample only
+    ttk.Label(rows, text=f"Cores ({len(sampler.cores)})", width=13).grid(row=len(lines), column=0, sticky='w')
+    canvas = tk.Canvas(rows, width=width, height=height, bg="#f8fafc", highlightthickness=0)
+    canvas.grid(row=len(lines), column=1, pady=2)
+    bar = width / max(len(sampler.cores), 1)
+    bars = [canvas.create_rectangle(n * bar + 1, height, (n + 1) * bar - 1, height, fill="#3949ab", outline="")
+            for n in range(len(sampler.cores))]
+    monitor_view.update(rows=rows, lines=lines, bars=(canvas, bars, bar))
+
+def start_monitor():
+    sampler = monitor_view["sampler"]
+    rate_hz = int(monitor_view["rate"].get())
+    if sampler is None or rate_hz != round(1 / sampler.interval):
+        # Another rate starts a new capture
+        if sampler is not None:
+            sampler.stop()
+            monitor_view["rows"].destroy()
+        try:
+            sampler = Sampler(rate_hz)
+        except Exception as e:
+            messagebox.showerror("Live Monitor", f"Cannot read system counters:\n{e}")
+            return
+        monitor_view.update(sampler=sampler, rows=None)
+    if monitor_view["rows"] is None:
+        build_monitor_rows(sampler)
+    sampler.start()
+    monitor_view["drawn"] = -1
+    if monitor_view["after"] is None:
+        monitor_view["after"] = root.after(REDRAW_MS, redraw_monitor)
+
+def redraw_monitor():
+    monitor_view["after"] = None
+    window, sampler = monitor_view["window"], monitor_view["sampler"]
+    if window is None or not window.winfo_exists() or sampler is None or not sampler.running:
+        return
+    if sampler.samples != monitor_view["drawn"]:
+        monitor_view["drawn"] = sampler.samples
+        width, height = SPARKLINE_SIZE
+        for series, canvas, line, value in monitor_view["lines"].values():
+            values = sampler.values(series)
+            if len(values) < 2:
+                continue
+            points = sparkline_points(values, width, height - 2, series.unit)
+            canvas.coords(line, *[c for x, y in points for c in (x, height - 1 - y)])
+            value.config(text=format_value(values[-1], series.unit))
+        canvas, bars, bar = monitor_view["bars"]
+        for n, (item, load) in enumerate(zip(bars, sampler.latest(sampler.cores))):
+            canvas.coords(item, n * bar + 1, height - (load or 0) * height / 100, (n + 1) * bar - 1, height)
+        monitor_view["status"].config(text=f"{sampler.samples} samples | sampler CPU {sampler.overhead:.2f} % "
+                                           f"| included in Export as PDF")
+    monitor_view["after"] = root.after(REDRAW_MS, redraw_monitor)
+
+def close_monitor():
+    # Sampling stops; the capture stays for the next PDF export
+    if monitor_view["sampler"] is not None:
+        monitor_view["sampler"].stop()
+    if monitor_view["after"] is not None:
+        root.after_cancel(monitor_view["after"])
+    monitor_view["window"].destroy()
+    monitor_view.update(window=None, rows=None, after=None)
+
+def monitor_capture():
+    sampler = monitor_view["sampler"]
+    return sampler.capture() if sampler is not None and sampler.samples else None
+
+# --------- Fleet browser ---------
+# Browses a snapshot archive (.snaparc), or a folder of snapshot files packed
+# into a temporary archive on a worker thread. The Treeview holds only as many
+# items as fit on screen: scrolling rewrites their values from the FleetTable,
+# which sorts and filters on the data side. Selecting a host shows it in the
+# main window, where Export as PDF exports it.
+FILTER_DELAY_MS = 150
+ROW_HEIGHT = 24
+WHEEL_ROWS = 3
+browser = {"window": None, "table": None, "tree": None, "scrollbar": None, "items": [], "top": 0,
+           "selected": None, "query": None, "latest": None, "status": None, "save": None,
+           "loading": None, "filter_after": None}
+browser_queue = queue.Queue()
+# The browsed host shown in the main window instead of this machine, if any
+viewing = {"info": None}
+
+def show_browser():
+    window = browser["window"]
+    if window is not None and window.winfo_exists():
+        window.lift()
+        return
+    from fleet_table import COLUMNS
+    window = tk.Toplevel(root)
+    window.title("Fleet Browser")
+    window.geometry("1100x640")
+    window.protocol("WM_DELETE_WINDOW", close_browser)
+    controls = ttk.Frame(window, padding=(8, 8, 8, 0))
+    controls.pack(fill=tk.X)
+    ttk.Button(controls, text="Open Archive...", command=lambda: choose_fleet(False)).pack(side=tk.LEFT)
+    ttk.Button(controls, text="Open Folder...", command=lambda: choose_fleet(True)).pack(side=tk.LEFT, padx=(6, 0))
+    save = ttk.Button(controls, text="Save Archive...", command=save_archive, state='disabled')
+    save.pack(side=tk.LEFT, padx=(6, 0))
+    ttk.Label(controls, text="Filter:").pack(side=tk.LEFT, padx=(16, 4))
+    query = tk.StringVar()
+    query.trace_add('write', lambda *args: schedule_filter())
+    ttk.Entry(controls, textvariable=query, width=24, font=('Segoe UI', 11)).pack(side=tk.LEFT)
+    latest = tk.BooleanVar(value=True)
+    ttk.Checkbutton(controls, text="Latest per host", variable=latest,
+                    command=apply_latest).pack(side=tk.LEFT, padx=(12, 0))
+    status = ttk.Label(window, text="Open a .snaparc archive or a folder of JSON/NDJSON snapshots.",
+                       font=('Segoe UI', 9), foreground="#555", padding=(8, 4))
+    status.pack(fill=tk.X)
+    frame = ttk.Frame(window, padding=(8, 0, 8, 8))
+    frame.pack(fill=tk.BOTH, expand=True)
+    tree = ttk.Treeview(frame, columns=[heading for heading, _, _ in COLUMNS], show='headings', selectmode='browse')
+    for heading, name, width in COLUMNS:
+        tree.heading(heading, text=heading, command=lambda name=name: sort_browser(name))
+        tree.column(heading, width=width, stretch=heading in ("Model", "CPU"))
+    scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=scroll_browser)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    tree.bind('<Configure>', resize_browser)
+    tree.bind('<<TreeviewSelect>>', select_row)
+    tree.bind('<Double-1>', lambda event: root.lift())
+    tree.bind('<Return>', lambda event: root.lift())
+    tree.bind('<MouseWheel>', lambda event: scroll_rows(-WHEEL_ROWS if event.delta > 0 else WHEEL_ROWS))
+    tree.bind('<Button-4>', lambda event: scroll_rows(-WHEEL_ROWS))
+    tree.bind('<Button-5>', lambda event: scroll_rows(WHEEL_ROWS))
+    for key, step in (('<Up>', -1), ('<Down>', 1), ('<Prior>', "-page"), ('<Next>', "page"),
+                      ('<Home>', "home"), ('<End>', "end")):
+        tree.bind(key, lambda event, step=step: move_selection(step))
+    browser.update(window=window, tree=tree, scrollbar=scrollbar, items=[], top=0, selected=None,
+                   query=query, latest=latest, status=status, save=save)
+
+def choose_fleet(folder):
+    if folder:
+        path = filedialog.askdirectory(parent=browser["window"], title="Open Folder of Snapshots")
+    else:
+        path = filedialog.askopenfilename(parent=browser["window"], title="Open Snapshot Archive",
+                                          filetypes=[("Snapshot archives", "*.snaparc"), ("All files", "*.*")])
+    if path:
+        load_fleet(path)
+
+def load_fleet(path):
+    # Opening an archive is instant; a folder is parsed and packed first, off
+    # the main loop
+    if browser["loading"] is not None:
+        return
+    from ingest import IngestStats
+    stats = IngestStats()
+    worker = threading.Thread(target=load_fleet_worker, args=(path, stats), daemon=True)
+    browser["loading"] = (path, stats)
+    browser["status"].config(text=f"Opening {path}...")
+    worker.start()
+    root.after(POLL_INTERVAL_MS, poll_browser)
+
+def load_fleet_worker(path, stats):
+    try:
+        from fleet_table import FleetTable, open_fleet
+        archive, temp = open_fleet(path, stats)
+        browser_queue.put(("done", FleetTable(archive, temp)))
+    except Exception as e:
+        browser_queue.put(("error", e))
+
+def poll_browser():
+    try:
+        kind, payload = browser_queue.get_nowait()
+    except queue.Empty:
+        path, stats = browser["loading"]
+        if stats.records and browser["status"].winfo_exists():
+            browser["status"].config(text=f"Reading {path}: {stats.records} snapshot(s)...")
+        root.after(POLL_INTERVAL_MS, poll_browser)
+        return
+    path, stats = browser["loading"]
+    browser["loading"] = None
+    if browser["window"] is None or not browser["window"].winfo_exists():
+        # Closed while loading
+        if kind == "done":
+            payload.close()
+        return
+    if kind == "error":
+        browser["status"].config(text="")
+        messagebox.showerror("Fleet Browser", f"Cannot open {path}:\n{payload}", parent=browser["window"])
+        return
+    if browser["table"] is not None:
+        browser["table"].close()
+    payload.latest_only = browser["latest"].get()
+    payload.set_query(browser["query"].get())
+    browser.update(table=payload, top=0, selected=None)
+    browser["save"].config(state='normal' if payload.temp else 'disabled')
+    browser["window"].title(f"Fleet Browser - {path}")
+    if stats.invalid:
+        messagebox.showwarning("Fleet Browser", f"{stats.invalid} invalid record(s) were skipped.",
+                               parent=browser["window"])
+    redraw_browser()
+
+def save_archive():
+    # A folder opened as a temporary archive, kept for instant opening next time
+    table = browser["table"]
+    path = filedialog.asksaveasfilename(parent=browser["window"], defaultextension=".snaparc",
+                                        filetypes=[("Snapshot archives", "*.snaparc")], title="Save Archive")
+    if table is None or not path:
+        return
+    try:
+        shutil.copyfile(table.temp, path)
+    except OSError as e:
+        messagebox.showerror("Fleet Browser", f"Cannot save the archive:\n{e}", parent=browser["window"])
+
+def visible_rows():
+    return len(browser["items"])
+
+def resize_browser(event):
+    # As many items as fit; the heading takes about one row
+    tree, items = browser["tree"], browser["items"]
+    rows = max(1, event.height // ROW_HEIGHT - 1)
+    while len(items) < rows:
+        items.append(tree.insert('', tk.END, values=()))
+    while len(items) > rows:
+        tree.delete(items.pop())
+    redraw_browser()
+
+def clamp_top(top):
+    table = browser["table"]
+    return max(0, min(top, len(table) - visible_rows())) if table is not None else 0
+
+def redraw_browser():
+    table, tree = browser["table"], browser["tree"]
+    if table is None:
+        return
+    top = browser["top"] = clamp_top(browser["top"])
+    selected = None
+    for n, item in enumerate(browser["items"]):
+        if top + n < len(table):
+            tree.item(item, values=table.row(top + n))
+            if table.record(top + n) == browser["selected"]:
+                selected = item
+        else:
+            tree.item(item, values=())
+    if selected is not None:
+        tree.selection_set(selected)
+        tree.focus(selected)
+    elif tree.selection():
+        tree.selection_remove(*tree.selection())
+    total = len(table)
+    if total:
+        browser["scrollbar"].set(top / total, min(top + visible_rows(), total) / total)
+    else:
+        browser["scrollbar"].set(0, 1)
+    shown = f"{top + 1}-{min(top + visible_rows(), total)} of " if total else ""
+    browser["status"].config(text=f"{shown}{total} host(s) ({len(table.archive)} snapshot(s) in the archive) "
+                                  f"| {table.elapsed * 1000:.0f} ms to filter and sort")
+
+def scroll_rows(rows):
+    browser["top"] += rows
+    redraw_browser()
+    return "break"
+
+def scroll_browser(*args):
+    # Scrollbar commands: moveto FRACTION, or scroll N units|pages
+    table = browser["table"]
+    if table is None:
+        return
+    if args[0] == "moveto":
+        browser["top"] = int(float(args[1]) * len(table))
+    elif args[0] == "scroll":
+        browser["top"] += int(args[1]) * (visible_rows() if args[2] == "pages" else 1)
+    redraw_browser()
+
+def move_selection(step):
+    # Keyboard navigation in data positions, scrolling past the drawn items
+    table = browser["table"]
+    if table is None or not len(table):
+        return "break"
+    position = table.position(browser["selected"]) if browser["selected"] is not None else None
+    page = visible_rows()
+    if position is None:
+        position = browser["top"]
+    elif step in ("page", "-page"):
+        position += page if step == "page" else -page
+    elif step in ("home", "end"):
+        position = 0 if step == "home" else len(table) - 1
+    else:
+        position += step
+    position = max(0, min(position, len(table) - 1))
+    if position < browser["top"]:
+        browser["top"] = position
+    elif position >= browser["top"] + page:
+        browser["top"] = position - page + 1
+    show_row(position)
+    return "break"
+
+def select_row(event):
+    table, tree = browser["table"], browser["tree"]
+    if table is None or not tree.selection():
+        return
+    position = browser["top"] + browser["items"].index(tree.selection()[0])
+    # Selections made by redraw_browser come back here for the row already shown
+    if position < len(table) and table.record(position) != browser["selected"]:
+        show_row(position)
+
+def show_row(position):
+    table = browser["table"]
+    browser["selected"] = table.record(position)
+    redraw_browser()
+    show_host(table.snapshot(position))
+
+def sort_browser(name):
+    table = browser["table"]
+    if table is None:
+        return
+    from fleet_table import COLUMNS
+    table.sort(name)
+    for heading, column, _ in COLUMNS:
+        arrow = (" \u25bc" if table.descending else " \u25b2") if column == name else ""
+        browser["tree"].heading(heading, text=heading + arrow)
+    browser["top"] = 0
+    redraw_browser()
+
+def schedule_filter():
+    # Filtering runs once typing pauses, not on every key
+    if browser["filter_after"] is not None:
+        root.after_cancel(browser["filter_after"])
+    browser["filter_after"] = root.after(FILTER_DELAY_MS, apply_filter)
+
+def apply_filter():
+    browser["filter_after"] = None
+    if browser["table"] is not None:
+        browser["table"].set_query(browser["query"].get())
+        browser["top"] = 0
+        redraw_browser()
+
+def apply_latest():
+    if browser["table"] is not None:
+        browser["table"].set_latest_only(browser["latest"].get())
+        browser["top"] = 0
+        redraw_browser()
+
+def close_browser():
+    if browser["filter_after"] is not None:
+        root.after_cancel(browser["filter_after"])
+    if browser["table"] is not None:
+        browser["table"].close()
+    browser["window"].destroy()
+    browser.update(window=None, table=None, items=[], selected=None, filter_after=None)
+
+def show_host(snapshot):
+    # A browsed host in the single-host layout; Export as PDF exports it until
+    # Get System Info shows this machine again
+    info = render_info(snapshot)
+    for key in FIELD_ORDER:
+        show_field(key, info[key])
+    viewing["info"] = info
+    progress.config(value=0)
+    status_label.config(text=f"Fleet: {info['System Name']}")
 
 # --------- UI Layout ---------
 root = tk.Tk()
 root.title("Professional System Asset Info")
-root.geometry("800x940")
+root.geometry("800x1050")
 root.configure(bg="#f5f7fa")
 
 style = ttk.Style()
 style.configure('TLabel', font=('Segoe UI', 11), background="#f5f7fa")
 style.configure('TButton', font=('Segoe UI', 11, 'bold'), padding=6)
-style.configure('Treeview', font=('Consolas', 10), rowheight=24)
+style.configure('Treeview', font=('Consolas', 10), rowheight=ROW_HEIGHT)
 style.configure('Treeview.Heading', font=('Segoe UI', 11, 'bold'))
 
 main_frame = ttk.Frame(root, padding=18, style='TFrame')
@@ -354,6 +720,20 @@ product_key_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
 product_key_entry.config(state='readonly')
 product_key_frame.pack(anchor='w', fill=tk.X, pady=10)
 
+# Network Adapters - one row per interface
+adapter_label = ttk.Label(main_frame, text="Network Adapters:", font=('Segoe UI', 12, 'bold'))
+adapter_label.pack(anchor='w', pady=(5,3))
+adapter_frame = ttk.Frame(main_frame)
+adapter_frame.pack(fill=tk.X)
+adapter_columns = TABLE_FIELDS["Network Adapters"]
+adapter_tree = ttk.Treeview(adapter_frame, columns=adapter_columns, show='headings', height=4)
+for column, width in zip(adapter_columns, (110, 110, 200, 140, 70, 50)):
+    adapter_tree.heading(column, text=column)
+    adapter_tree.column(column, width=width, stretch=column == "IPv6")
+adapter_tree.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0,2))
+btn_copy_adapters = ttk.Button(adapter_frame, text="Copy", command=lambda: copy_rows(adapter_tree))
+btn_copy_adapters.pack(side=tk.LEFT, padx=(6,0), pady=(0,3), anchor='n')
+
 # Disk Info - now as copyable text
 disk_label = ttk.Label(main_frame, text="SSD & HDD Info (Physical Drives):", font=('Segoe UI', 12, 'bold'))
 disk_label.pack(anchor='w', pady=(15,3))
@@ -390,7 +770,24 @@ btn_frame.pack(pady=22)
 btn_info = ttk.Button(btn_frame, text="Get System Info", command=show_info)
 btn_info.pack(side=tk.LEFT, padx=(0,10))
 btn_pdf = ttk.Button(btn_frame, text="Export as PDF", command=export_to_pdf)
-btn_pdf.pack(side=tk.LEFT)
+btn_pdf.pack(side=tk.LEFT, padx=(0,10))
+btn_cancel = ttk.Button(btn_frame, text="Cancel", command=cancel_collection, state='disabled')
+btn_cancel.pack(side=tk.LEFT)
+btn_diagnostics = ttk.Button(btn_frame, text="Diagnostics", command=show_diagnostics)
+btn_diagnostics.pack(side=tk.LEFT, padx=(10,0))
+btn_monitor = ttk.Button(btn_frame, text="Live Monitor", command=show_monitor)
+btn_monitor.pack(side=tk.LEFT, padx=(10,0))
+btn_browser = ttk.Button(btn_frame, text="Fleet", command=show_browser)
+btn_browser.pack(side=tk.LEFT, padx=(10,0))
+root.bind('<F5>', refresh_info)
+
+# Progress
+progress_frame = ttk.Frame(main_frame)
+progress_frame.pack(fill=tk.X)
+progress = ttk.Progressbar(progress_frame, mode='determinate', maximum=len(FIELD_ORDER))
+progress.pack(side=tk.LEFT, fill=tk.X, expand=True)
+status_label = ttk.Label(progress_frame, text="", width=28, font=('Segoe UI', 9), foreground="#555")
+status_label.pack(side=tk.LEFT, padx=(10,0))
 
 # Footer
 footer = ttk.Label(
@@ -402,4 +799,12 @@ footer = ttk.Label(
 )
 footer.pack(side=tk.BOTTOM, pady=(18,0))
 
-root.mainloop()
\ No newline at end of file
+# Used by benchmarks/bench_startup.py: close as soon as the window is drawn
+if "--startup-benchmark" in sys.argv:
+    root.bind('<Map>', lambda event: root.after_idle(root.destroy))
+
+# --profile PATH: profile the whole session (see instrumentation.profile_call)
+if profile_path(sys.argv):
+    profile_call(root.mainloop, profile_path(sys.argv))
+else:
+    root.mainloop()
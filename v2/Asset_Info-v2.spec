@@ -1,5 +1,15 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# Start-up tuned build:
+# - onedir: nothing is unpacked to a temp folder on every launch (onefile did that)
+# - no UPX: the bootloader does not have to decompress every DLL before the window appears
+# - excludes: modules nothing in the app imports, so the PYZ archive stays small
+# - optimize=1: byte-compiled with asserts stripped, so nothing is compiled at run time
+EXCLUDES = [
+    'numpy', 'matplotlib', 'IPython', 'pytest',
+    'unittest', 'doctest', 'pydoc', 'pydoc_data', 'lib2to3', 'test',
+    'tkinter.test', 'idlelib', 'turtle', 'turtledemo',
+]
 
 a = Analysis(
     ['Asset_Info-v2.py'],
@@ -10,25 +20,22 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
-    optimize=0,
+    optimize=1,
 )
 pyz = PYZ(a.pure)
 
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='Asset_Info-v2',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -37,3 +44,35 @@ exe = EXE(
     entitlements_file=None,
     icon=['file.ico'],
 )
+
+# Same program as a console EXE for --headless (and --agent): a windowed EXE
+# has no stdout, so its output could only go to a file
+cli = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='Asset_Info-v2-cli',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=True,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=['file.ico'],
+)
+
+coll = COLLECT(
+    exe,
+    cli,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='Asset_Info-v2',
+)
@@ -0,0 +1,201 @@
+import os
+import sys
+import json
+import time
+import hmac
+import asyncio
+import hashlib
+import argparse
+import datetime
+from urllib.parse import urlsplit
+from headless import snapshot_record
+from snapshot_cache import SnapshotCache, default_cache_path
+import backends
+
+# Inventory agent: serves this machine's snapshot (typed, as headless.py writes
+# it) as JSON over HTTP, for a central collector to poll.
+#
+#   python agent.py --port 8765        # GET http://127.0.0.1:8765/snapshot
+#
+# One asyncio loop answers every poller, over keep-alive connections. Requests
+# never start probes: they get the last published snapshot, and once that is
+# older than --max-age a single background collection (through SnapshotCache,
+# which re-runs only stale probes) publishes the next one while pollers keep
+# getting the current one. The ETag hashes the snapshot without its
+# timestamp, so a poller sending If-None-Match gets a bodiless 304 for as long
+# as nothing has changed.
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_AGE = 30
+IDLE_TIMEOUT = 60
+MAX_HEADERS = 100
+BACKLOG = 1024
+TOKEN_ENV = "ASSET_INFO_AGENT_TOKEN"
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+           405: "Method Not Allowed", 503: "Service Unavailable"}
+
+def snapshot_etag(record):
+    content = json.dumps({k: v for k, v in record.items() if k != "Collected At"}, sort_keys=True, ensure_ascii=False)
+    # Weak: the body also carries the collection time, which the tag ignores
+    return f'W/"{hashlib.blake2b(content.encode("utf-8"), digest_size=12).hexdigest()}"'
+
+def etag_matches(header, etag):
+    # If-None-Match uses weak comparison (RFC 9110 13.1.2)
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag[2:] in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+class SnapshotPublisher:
+    def __init__(self, cache, max_age=DEFAULT_MAX_AGE):
+        self.cache = cache
+        self.max_age = max_age
+        self.body = None
+        self.etag = None
+        self.checked = None
+        self.refreshing = None
+        self.collections = 0
+        self.error = None
+
+    def publish(self, snapshot, collected_at):
+        record = snapshot_record(snapshot, collected_at)
+        self.etag = snapshot_etag(record)
+        self.body = json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+    async def refresh(self):
+        collected_at = datetime.datetime.now(datetime.timezone.utc)
+        try:
+            snapshot = await asyncio.get_running_loop().run_in_executor(None, self.cache.get)
+            self.publish(snapshot, collected_at)
+            self.collections += 1
+            self.error = None
+        except Exception as e:
+            # Pollers keep the previous snapshot; the next stale request retries
+            self.error = str(e) or e.__class__.__name__
+            print(f"collection failed: {self.error}", file=sys.stderr)
+        finally:
+            self.checked = time.monotonic()
+            self.refreshing = None
+
+    async def current(self):
+        # (body, etag) to serve; only the very first request waits for a collection
+        if self.refreshing is None and (self.checked is None or time.monotonic() - self.checked >= self.max_age):
+            self.refreshing = asyncio.ensure_future(self.refresh())
+        if self.body is None and self.refreshing is not None:
+            await asyncio.shield(self.refreshing)
+        return self.body, self.etag
+
+class Agent:
+    def __init__(self, publisher, token=None):
+        self.publisher = publisher
+        self.token = token
+        self.requests = 0
+
+    def authorized(self, headers):
+        if not self.token:
+            return True
+        return hmac.compare_digest(headers.get("authorization", ""), f"Bearer {self.token}")
+
+    async def respond(self, method, path, headers):
+        # (status, extra headers, body)
+        if path not in ("/snapshot", "/health"):
+            return 404, {}, b""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        if not self.authorized(headers):
+            return 401, {"WWW-Authenticate": "Bearer"}, b""
+        publisher = self.publisher
+        if path == "/health":
+            body = {"status": "ok" if publisher.error is None else "degraded", "collections": publisher.collections,
+                    "requests": self.requests, "error": publisher.error}
+            return 200, {"Content-Type": "application/json"}, json.dumps(body).encode("utf-8")
+        body, etag = await publisher.current()
+        if body is None:
+            return 503, {"Retry-After": "5"}, b""
+        cache_headers = {"ETag": etag, "Cache-Control": f"max-age={int(publisher.max_age)}"}
+        if etag_matches(headers.get("if-none-match", ""), etag):
+            return 304, cache_headers, b""
+        return 200, dict(cache_headers, **{"Content-Type": "application/json; charset=utf-8"}), body
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                if not request_line.strip():
+                    return
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, sep, value = line.decode("latin-1").partition(":")
+                    if not sep or len(headers) >= MAX_HEADERS:
+                        await self.send(writer, 400, {}, b"", "HTTP/1.1", False)
+                        return
+                    headers[name.strip().lower()] = value.strip()
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3 or "content-length" in headers or "transfer-encoding" in headers:
+                    # Only bodiless GET/HEAD requests are served
+                    await self.send(writer, 400, {}, b"", "HTTP/1.1", False)
+                    return
+                method, target, version = parts
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              if version == "HTTP/1.1" else headers.get("connection", "").lower() == "keep-alive")
+                self.requests += 1
+                status, extra, body = await self.respond(method, urlsplit(target).path, headers)
+                await self.send(writer, status, extra, b"" if method == "HEAD" else body, version, keep_alive,
+                                len(body))
+                if not keep_alive:
+                    return
+        except (asyncio.TimeoutError, ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def send(self, writer, status, extra, body, version, keep_alive, length=None):
+        lines = [f"{version if version in ('HTTP/1.0', 'HTTP/1.1') else 'HTTP/1.1'} {status} {REASONS[status]}"]
+        lines += [f"{name}: {value}" for name, value in extra.items()]
+        if status != 304:
+            lines.append(f"Content-Length: {len(body) if length is None else length}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+async def serve(agent, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = await asyncio.start_server(agent.handle, host, port, backlog=BACKLOG)
+    address = server.sockets[0].getsockname()
+    print(f"serving http://{address[0]}:{address[1]}/snapshot", file=sys.stderr, flush=True)
+    # Collect before the first poller arrives
+    await agent.publisher.current()
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve this machine's snapshot as JSON over HTTP "
+                                                 "(GET /snapshot, with ETag / If-None-Match).")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help=f"address to listen on (default: {DEFAULT_HOST}; 0.0.0.0 for every interface)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"default: {DEFAULT_PORT}")
+    parser.add_argument("--max-age", type=float, default=DEFAULT_MAX_AGE,
+                        help=f"seconds a published snapshot is served before it is refreshed (default: {DEFAULT_MAX_AGE})")
+    parser.add_argument("--token", default=os.environ.get(TOKEN_ENV),
+                        help=f"require 'Authorization: Bearer TOKEN' (default: ${TOKEN_ENV})")
+    parser.add_argument("--no-persist", action="store_true", help="do not read or write the on-disk snapshot cache")
+    parser.add_argument("--backend", choices=("auto",) + tuple(backends.BACKENDS), default=None,
+                        help=f"where WMI facts come from (default: ${backends.BACKEND_ENV} or auto)")
+    args = parser.parse_args(argv)
+    if args.backend:
+        try:
+            backends.set_backend(backends.select_backend(args.backend))
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 2
+    cache = SnapshotCache(persist_path=None if args.no_persist else default_cache_path())
+    agent = Agent(SnapshotPublisher(cache, args.max_age), args.token)
+    try:
+        asyncio.run(serve(agent, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
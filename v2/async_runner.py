@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import subprocess
+from concurrent.futures import TimeoutError as FutureTimeout
+import scheduler
+
+# One asyncio event loop, on its own thread, runs every child process the app
+# starts (PowerShell probes for the GUI, headless mode and fleet runs). Probe
+# threads hand it a command and wait; the loop reads all children's output as
+# it arrives, line by line, and kills any child that outlives its deadline or
+# whose probe is cancelled, then reaps it, so no straggler is left behind.
+LINE_LIMIT = 16 << 20
+
+async def kill(proc):
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+    await proc.wait()
+
+async def run_command(args, timeout=None, on_line=None):
+    # Output of args (stderr folded into stdout), like check_output.
+    # on_line(bytes) is called on the loop thread for each line as it is
+    # written, so keep it short.
+    proc = await asyncio.create_subprocess_exec(
+        *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT, limit=LINE_LIMIT
+    )
+    lines = []
+
+    async def read():
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                return await proc.wait()
+            lines.append(line)
+            if on_line:
+                on_line(line)
+
+    try:
+        returncode = await asyncio.wait_for(read(), timeout)
+    except asyncio.TimeoutError:
+        await kill(proc)
+        raise subprocess.TimeoutExpired(args, timeout, b"".join(lines))
+    except BaseException:
+        # Cancelled, or on_line raised
+        await kill(proc)
+        raise
+    output = b"".join(lines)
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, args, output)
+    return output
+
+class AsyncRunner:
+    def __init__(self):
+        self.loop = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def start(self):
+        with self.lock:
+            if self.loop is None:
+                # Proactor loop on Windows (the default since 3.8), which can run subprocesses
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self.loop.run_forever, name="async-runner", daemon=True)
+                self.thread.start()
+        return self.loop
+
+    def submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.start())
+
+    def run(self, args, timeout=None, on_line=None):
+        # Blocking call for probe threads; honours the probe's cancel flag
+        future = self.submit(run_command(args, timeout, on_line))
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except FutureTimeout:
+                if scheduler.is_cancelled():
+                    # The task kills its child when the cancellation reaches it
+                    future.cancel()
+                    raise RuntimeError("Cancelled")
+
+    def close(self):
+        with self.lock:
+            if self.loop is not None:
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.thread.join(timeout=5)
+                self.loop = self.thread = None
+
+_runner = AsyncRunner()
+
+def get_runner():
+    return _runner
+
+def command_runner(args, timeout=None, on_line=None):
+    return _runner.run(args, timeout, on_line)
+
+# Calls on_line as output arrives (runners without this get it afterwards)
+command_runner.streams_lines = True
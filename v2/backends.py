@@ -0,0 +1,377 @@
+import os
+import sys
+import glob
+import time
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import scheduler
+import edid
+from collectors import run_powershell, build_batch_script, batch_line, load_batch, BATCH_PROBES
+
+# Where the WMI facts (model, CPU, serial, product key, disks, monitors) come from.
+# Every backend answers query(keys) with the same document the PowerShell batch
+# returns, {key: {"ok": True, "value": ..., "ms": ...} or {"ok": False, "error": ...}},
+# so collectors.parse_batch maps all of them to records the same way.
+# on_probe(key, probe), if given, is called as each key's result is ready.
+class Backend:
+    name = "backend"
+    # In-process backends: {key: function(backend) -> raw value}, run by run_queries
+    QUERIES = {}
+
+    def available(self):
+        return True
+
+    def query(self, keys, on_probe=None):
+        raise NotImplementedError
+
+    def run_queries(self, keys, on_probe=None):
+        result = {}
+        for key in keys:
+            start = time.perf_counter()
+            try:
+                result[key] = {"ok": True, "value": self.QUERIES[key](self)}
+            except Exception as e:
+                result[key] = {"ok": False, "error": str(e).strip() or e.__class__.__name__}
+            result[key]["ms"] = round((time.perf_counter() - start) * 1000, 3)
+            if on_probe:
+                on_probe(key, result[key])
+        return result
+
+    def close(self):
+        pass
+
+class PowerShellBackend(Backend):
+    # One powershell.exe per query, running the batched script
+    name = "powershell"
+
+    def available(self):
+        return os.name == "nt"
+
+    def query(self, keys, on_probe=None):
+        on_line = None
+        if on_probe is not None:
+            def on_line(line):
+                probe = batch_line(line)
+                if probe is not None:
+                    on_probe(*probe)
+        return load_batch(run_powershell(build_batch_script(keys), on_line=on_line))
+
+# --------- In-process WMI (COM) ---------
+CIMV2 = r"root\cimv2"
+STORAGE = r"root\Microsoft\Windows\Storage"
+WMI = r"root\wmi"
+
+def com_connect(namespace, computer="."):
+    import win32com.client
+    return win32com.client.Dispatch("WbemScripting.SWbemLocator").ConnectServer(computer, namespace)
+
+def com_initialize():
+    # COM objects belong to the thread that created them, so every WMI call
+    # runs on the backend's own thread
+    import pythoncom
+    pythoncom.CoInitialize()
+
+def decode_id(data):
+    # WmiMonitorID strings are arrays of character codes padded with zeros
+    if isinstance(data, (list, tuple)):
+        return "".join(chr(c) for c in data if c).strip()
+    return "Not Found"
+
+class WmiComBackend(Backend):
+    # Keeps one SWbemServices connection per namespace open for the life of the
+    # process and runs every query on a single worker thread. connect/initialize
+    # can be replaced (e.g. by objects imitating SWbemServices) to test the
+    # result mapping without Windows.
+    name = "wmi"
+
+    def __init__(self, connect=None, initialize=None):
+        self.connect = connect or com_connect
+        self.initialize = initialize or (com_initialize if connect is None else None)
+        self.services = {}
+        self.executor = None
+        self.lock = threading.Lock()
+        # A query that outlived its deadline: until it returns, the worker thread
+        # is stuck in COM and later queries go to the fallback instead of
+        # queueing behind it
+        self.stuck = None
+
+    @property
+    def wedged(self):
+        return self.stuck is not None and not self.stuck.done()
+
+    def available(self):
+        if self.connect is not com_connect:
+            return True
+        if os.name != "nt":
+            return False
+        try:
+            import win32com.client
+            import pythoncom
+            return True
+        except ImportError:
+            return False
+
+    def service(self, namespace):
+        if namespace not in self.services:
+            self.services[namespace] = self.connect(namespace)
+        return self.services[namespace]
+
+    def rows(self, namespace, wql, properties):
+        return [{name: getattr(item, name) for name in properties} for item in self.service(namespace).ExecQuery(wql)]
+
+    def first(self, namespace, wql, properties):
+        rows = self.rows(namespace, wql, properties)
+        return rows[0] if rows else None
+
+    def value(self, namespace, wql, prop):
+        row = self.first(namespace, wql, [prop])
+        return row[prop] if row else None
+
+    def disks(self):
+        try:
+            disks = self.rows(STORAGE, "SELECT FriendlyName, MediaType, Size FROM MSFT_PhysicalDisk",
+                              ["FriendlyName", "MediaType", "Size"])
+        except Exception:
+            disks = []
+        if not disks:
+            disks = [dict(d, MediaType="Unknown")
+                     for d in self.rows(CIMV2, "SELECT Model, Size FROM Win32_DiskDrive", ["Model", "Size"])]
+        return disks
+
+    def monitors(self):
+        # Some display drivers do not implement WmiMonitorID; the EDIDs the
+        # registry keeps for attached monitors carry the same identifiers
+        try:
+            ids = self.rows(WMI, "SELECT ManufacturerName, UserFriendlyName, ProductCodeID, SerialNumberID FROM WmiMonitorID",
+                            ["ManufacturerName", "UserFriendlyName", "ProductCodeID", "SerialNumberID"])
+        except Exception:
+            ids = []
+        if not ids:
+            return edid.parse_edids(edid.registry_edids()) if self.connect is com_connect else []
+        return [{"Manufacturer": decode_id(m["ManufacturerName"]), "Name": decode_id(m["UserFriendlyName"]),
+                 "ProductCode": decode_id(m["ProductCodeID"]), "Serial": decode_id(m["SerialNumberID"])} for m in ids]
+
+    QUERIES = {
+        "model": lambda self: self.value(CIMV2, "SELECT Model FROM Win32_ComputerSystem", "Model"),
+        "cpu": lambda self: self.first(
+            CIMV2, "SELECT Name, MaxClockSpeed, NumberOfCores, NumberOfLogicalProcessors FROM Win32_Processor",
+            ["Name", "MaxClockSpeed", "NumberOfCores", "NumberOfLogicalProcessors"]),
+        "serial": lambda self: self.value(CIMV2, "SELECT SerialNumber FROM Win32_BIOS", "SerialNumber"),
+        "product_key": lambda self: self.value(
+            CIMV2, "SELECT OA3xOriginalProductKey FROM SoftwareLicensingService", "OA3xOriginalProductKey"),
+        "disks": disks,
+        "monitors": monitors,
+    }
+
+    def query(self, keys, on_probe=None):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wmi", initializer=self.initialize)
+        future = self.executor.submit(self.run_queries, list(keys), on_probe)
+        timeout = scheduler.remaining_time()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return future.result(timeout=0.1)
+            except FutureTimeout:
+                if scheduler.is_cancelled():
+                    raise RuntimeError("Cancelled")
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.stuck = future
+                    raise subprocess.TimeoutExpired("wmi", timeout)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        self.services.clear()
+
+# --------- Linux (sysfs/procfs) ---------
+class LinuxBackend(Backend):
+    # Reads the kernel's own tables (DMI, block devices, DRM connectors), so a
+    # whole query is a few dozen small file reads and no child processes.
+    # root: prefix for /sys and /proc, e.g. a copied tree from another machine.
+    name = "linux"
+
+    def __init__(self, root="/"):
+        self.root = root
+
+    def available(self):
+        return sys.platform.startswith("linux")
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def read(self, *parts):
+        with open(self.path(*parts), encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+
+    def dmi(self, name):
+        try:
+            return self.read("sys/class/dmi/id", name) or None
+        except FileNotFoundError:
+            return None
+        except PermissionError:
+            raise PermissionError(f"{name} is readable by root only")
+
+    def model(self):
+        return self.dmi("product_name")
+
+    def serial(self):
+        return self.dmi("product_serial")
+
+    def product_key(self):
+        # Windows licensing has no Linux counterpart
+        return None
+
+    def cpu(self):
+        name, mhz, logical, cores, package = None, None, 0, set(), None
+        for line in self.read("proc/cpuinfo").splitlines():
+            key, _, value = line.partition(":")
+            key, value = key.strip(), value.strip()
+            if key == "processor":
+                logical += 1
+            elif key == "model name" and name is None:
+                name = value
+            elif key == "cpu MHz" and mhz is None:
+                mhz = int(float(value))
+            elif key == "physical id":
+                package = value
+            elif key == "core id":
+                cores.add((package, value))
+        try:
+            mhz = int(self.read("sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq")) // 1000
+        except (OSError, ValueError):
+            pass
+        if not cores:
+            # No topology in cpuinfo (e.g. many ARM kernels)
+            import psutil
+            cores = range(psutil.cpu_count(logical=False) or logical)
+        return {"Name": name, "MaxClockSpeed": mhz, "NumberOfCores": len(cores), "NumberOfLogicalProcessors": logical}
+
+    def disks(self):
+        disks = []
+        for block in sorted(glob.glob(self.path("sys/block/*"))):
+            # Only devices backed by hardware: loop, ram, dm- and md have no device link
+            if not os.path.exists(os.path.join(block, "device")):
+                continue
+            read = lambda *parts: self.read(block, *parts)
+            sectors = int(read("size"))
+            if not sectors:
+                continue
+            model = None
+            for attr in ("model", "name"):
+                try:
+                    model = read("device", attr) or None
+                except OSError:
+                    continue
+                if model:
+                    break
+            try:
+                media = {"0": "SSD", "1": "HDD"}.get(read("queue", "rotational"), "Unknown")
+            except OSError:
+                media = "Unknown"
+            # sysfs counts 512-byte sectors whatever the device's block size
+            disks.append({"Model": model or os.path.basename(block), "Size": sectors * 512, "MediaType": media})
+        return disks
+
+    def monitors(self):
+        return edid.parse_edids(edid.drm_edids(self.root))
+
+    QUERIES = {
+        "model": model,
+        "cpu": cpu,
+        "serial": serial,
+        "product_key": product_key,
+        "disks": disks,
+        "monitors": monitors,
+    }
+
+    def query(self, keys, on_probe=None):
+        return self.run_queries(keys, on_probe)
+
+# --------- Fake ---------
+class FakeBackend(Backend):
+    # Canned values per batch key, for exercising selection and mapping off Windows
+    name = "fake"
+
+    def __init__(self, values=None, available=True, error=None):
+        self.values = dict(values or {})
+        self.is_available = available
+        self.error = error
+        self.calls = []
+
+    @classmethod
+    def from_document(cls, document, **kwargs):
+        # Values from a recorded batch document (see benchmarks/fixtures)
+        data = load_batch(document)
+        return cls({key: probe.get("value") for key, probe in data.items() if probe.get("ok")}, **kwargs)
+
+    def available(self):
+        return self.is_available
+
+    def query(self, keys, on_probe=None):
+        self.calls.append(list(keys))
+        if self.error is not None:
+            raise self.error
+        result = {key: {"ok": True, "value": self.values[key]} if key in self.values
+                  else {"ok": False, "error": f"no fake value for {key}"} for key in keys}
+        for key, probe in result.items():
+            if on_probe:
+                on_probe(key, probe)
+        return result
+
+# --------- Selection ---------
+BACKENDS = {"wmi": WmiComBackend, "linux": LinuxBackend, "powershell": PowerShellBackend}
+AUTO_ORDER = ("wmi", "linux", "powershell")
+BACKEND_ENV = "ASSET_INFO_BACKEND"
+
+def select_backend(name="auto", backends=BACKENDS):
+    # "auto": the first available in AUTO_ORDER; a named backend must be available
+    if name != "auto":
+        if name not in backends:
+            raise ValueError(f"unknown backend {name!r} (choose from auto, {', '.join(backends)})")
+        backend = backends[name]()
+        if not backend.available():
+            raise RuntimeError(f"backend {name!r} is not available on this machine")
+        return backend
+    for candidate in AUTO_ORDER:
+        backend = backends[candidate]()
+        if backend.available():
+            return backend
+    return PowerShellBackend()
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = select_backend(os.environ.get(BACKEND_ENV, "auto"))
+        return _backend
+
+def set_backend(backend):
+    global _backend
+    with _backend_lock:
+        previous = _backend
+        _backend = backend
+    return previous
+
+def query(keys, on_probe=None, fallback=PowerShellBackend):
+    # The selected backend, or the subprocess one (where there is one) when it
+    # fails or is stuck. A timeout is not retried: the probe's deadline is
+    # already used up.
+    keys = [key for key in BATCH_PROBES if key in keys]
+    backend = get_backend()
+    if getattr(backend, "wedged", False):
+        backend = fallback()
+    try:
+        return backend.query(keys, on_probe)
+    except subprocess.TimeoutExpired:
+        raise
+    except Exception:
+        if isinstance(backend, fallback) or scheduler.is_cancelled() or not fallback().available():
+            raise
+        return fallback().query(keys, on_probe)
@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+from collections import Counter
+from urllib.parse import urlsplit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+V2_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, V2_DIR)
+from harness import fixed
+
+# Load generator for the HTTP agent (agent.py): many keep-alive connections
+# poll GET /snapshot for a fixed time; reports requests per second, latency
+# percentiles and the status codes seen. Conditional polling (If-None-Match
+# with the last ETag, as a central collector would) is the default.
+#
+#   python benchmarks/bench_agent.py --spawn                       # starts an agent on a free port
+#   python benchmarks/bench_agent.py --url http://pc-0042:8765/snapshot --token ...
+DEFAULT_CONCURRENCY = 100
+DEFAULT_DURATION = 5.0
+
+async def poll(host, port, path, deadline, latencies, statuses, conditional=True, token=None):
+    reader, writer = await asyncio.open_connection(host, port)
+    etag = None
+    try:
+        while time.perf_counter() < deadline:
+            lines = [f"GET {path} HTTP/1.1", f"Host: {host}"]
+            if token:
+                lines.append(f"Authorization: Bearer {token}")
+            if conditional and etag:
+                lines.append(f"If-None-Match: {etag}")
+            start = time.perf_counter()
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            status = int((await reader.readline()).split()[1])
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers.get("content-length", 0)))
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+            etag = headers.get("etag", etag)
+            if headers.get("connection", "").lower() == "close":
+                break
+    finally:
+        writer.close()
+
+def percentile(ordered, q):
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)] if ordered else 0.0
+
+async def load(url, concurrency=DEFAULT_CONCURRENCY, duration=DEFAULT_DURATION, conditional=True, token=None):
+    parts = urlsplit(url)
+    latencies, statuses = [], Counter()
+    start = time.perf_counter()
+    deadline = start + duration
+    results = await asyncio.gather(*[poll(parts.hostname, parts.port or 80, parts.path or "/", deadline,
+                                          latencies, statuses, conditional, token) for _ in range(concurrency)],
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50": percentile(latencies, 0.50),
+        "p90": percentile(latencies, 0.90),
+        "p99": percentile(latencies, 0.99),
+        "max": latencies[-1] if latencies else 0.0,
+        "statuses": dict(statuses),
+        "errors": sum(isinstance(result, Exception) for result in results),
+    }
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def spawn_agent(port):
+    # A real agent process (its own interpreter, as in production), without the on-disk cache
+    args = [sys.executable, os.path.join(V2_DIR, "agent.py"), "--port", str(port), "--no-persist"]
+    agent = subprocess.Popen(args, cwd=V2_DIR, stderr=subprocess.PIPE, text=True)
+    line = agent.stderr.readline()
+    if not line.startswith("serving"):
+        agent.kill()
+        raise RuntimeError(f"agent did not start: {line.strip() or agent.wait()}")
+    return agent
+
+def report(stats):
+    ms = lambda seconds: f"{seconds * 1000:.2f} ms"
+    return (f"{stats['requests']} requests, {stats['rps']:.0f}/s; latency p50 {ms(stats['p50'])}, "
+            f"p90 {ms(stats['p90'])}, p99 {ms(stats['p99'])}, max {ms(stats['max'])}; "
+            f"statuses {stats['statuses']}, {stats['errors']} connection error(s)")
+
+def run(results, concurrency=50, duration=3.0):
+    port = free_port()
+    agent = spawn_agent(port)
+    try:
+        url = f"http://127.0.0.1:{port}/snapshot"
+        for label, conditional in [("conditional (304)", True), ("full (200)", False)]:
+            stats = asyncio.run(load(url, concurrency, duration, conditional))
+            results.add(f"agent {concurrency} pollers, {label} p50", fixed(stats["p50"], stats["requests"]),
+                        per_s=stats["rps"], p99_ms=round(stats["p99"] * 1000, 2))
+    finally:
+        agent.kill()
+        agent.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll an asset agent with many concurrent connections.")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="snapshot URL, e.g. http://127.0.0.1:8765/snapshot")
+    target.add_argument("--spawn", action="store_true", help="start a local agent on a free port and poll it")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="connections polling at once")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds to poll for")
+    parser.add_argument("--unconditional", action="store_true", help="never send If-None-Match (every answer is a 200)")
+    parser.add_argument("--token", help="bearer token, if the agent requires one")
+    args = parser.parse_args()
+    agent = None
+    url = args.url
+    if args.spawn:
+        port = free_port()
+        agent = spawn_agent(port)
+        url = f"http://127.0.0.1:{port}/snapshot"
+    try:
+        stats = asyncio.run(load(url, args.concurrency, args.duration, not args.unconditional, args.token))
+        print(report(stats))
+    finally:
+        if agent is not None:
+            agent.kill()
+            agent.wait()
+    return 0 if stats["requests"] and not stats["errors"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import Results
+from records import render_info
+from bench_summary import synthetic_fleet
+
+# snapshot_archive.py against NDJSON for the same synthetic fleet: size on
+# disk, time to open, random access to single records and lookups by name;
+# then the fleet browser's table (fleet_table.py) over the archive.
+DEFAULT_HOSTS = 100_000
+LOOKUPS = 1000
+SCREEN_ROWS = 25
+
+def run(results, hosts=DEFAULT_HOSTS, samples=3):
+    import snapshot_archive
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"fleet{snapshot_archive.ARCHIVE_EXTENSION}")
+        ndjson = os.path.join(tmp, "fleet.ndjson")
+        snapshots = list(synthetic_fleet(hosts))
+        results.run(f"archive write {hosts} hosts", lambda: snapshot_archive.write_archive(path, snapshots),
+                    samples=samples, loops=1, items=hosts)
+        with open(ndjson, "w", encoding="utf-8") as out:
+            for snapshot in snapshots:
+                record = dict(render_info(snapshot), **{"Collected At": snapshot.collected_at})
+                out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        size, ndjson_size = os.path.getsize(path), os.path.getsize(ndjson)
+        print(f"archive size {hosts} hosts: {size / (1 << 20):.1f} MiB; NDJSON {ndjson_size / (1 << 20):.1f} MiB "
+              f"({ndjson_size / size:.1f}x)")
+        del snapshots
+
+        results.run(f"archive open {hosts} hosts", lambda: snapshot_archive.SnapshotArchive(path).close(),
+                    samples=samples)
+        with snapshot_archive.SnapshotArchive(path) as archive:
+            rng = random.Random(1)
+            indexes = [rng.randrange(hosts) for _ in range(LOOKUPS)]
+            names = [f"PC-{index:06d}" for index in indexes]
+            results.run(f"archive random record ({LOOKUPS} reads)", lambda: [archive[i] for i in indexes],
+                        samples=samples, items=LOOKUPS)
+            results.run(f"archive find by name ({LOOKUPS} lookups)", lambda: [archive.find(n) for n in names],
+                        samples=samples, items=LOOKUPS)
+
+        # The GUI's fleet browser over the same archive
+        from fleet_table import FleetTable
+        results.run(f"archive browser open {hosts} hosts",
+                    lambda: FleetTable(snapshot_archive.SnapshotArchive(path)).close(), samples=samples, loops=1)
+        table = FleetTable(snapshot_archive.SnapshotArchive(path))
+        try:
+            results.run("archive browser filter", lambda: table.set_query("pc-0001"), samples=samples, loops=1)
+            table.set_query("")
+            results.run("archive browser sort by model", lambda: table.sort("model"), samples=samples, loops=1)
+            results.run(f"archive browser screenful ({SCREEN_ROWS} rows)",
+                        lambda: [table.row(position) for position in range(hosts // 2, hosts // 2 + SCREEN_ROWS)],
+                        samples=samples)
+        finally:
+            table.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the snapshot archive (snapshot_archive.py) against NDJSON.")
+    parser.add_argument("--hosts", type=int, default=DEFAULT_HOSTS)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+    run(Results(), args.hosts, args.samples)
+
+if __name__ == "__main__":
+    main()
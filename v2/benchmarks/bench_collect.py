@@ -0,0 +1,45 @@
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import collectors
+import backends
+from fake_powershell import make_replay_runner, DEFAULT_RECORDINGS
+
+def time_call(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), sorted(timings)[len(timings) // 2]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare batched vs. per-field PowerShell collection against a fake PowerShell.")
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS)
+    parser.add_argument("--startup-cost", type=float, default=0.0, help="seconds of emulated powershell.exe cold start per spawn")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    runner = make_replay_runner(args.recordings, startup_cost=args.startup_cost)
+    previous = collectors.set_command_runner(runner)
+    previous_backend = backends.set_backend(backends.PowerShellBackend())
+    try:
+        batched = collectors.get_wmi_details_batched()
+        separate = collectors.get_wmi_details_separately()
+        if batched != separate:
+            print("WARNING: batched and per-field results differ")
+        for label, fn in [("per-field", collectors.get_wmi_details_separately),
+                          ("batched", collectors.get_wmi_details_batched)]:
+            del runner.calls[:]
+            best, median = time_call(fn, args.repeat)
+            spawns = len(runner.calls) // args.repeat
+            print(f"{label:<10} spawns/run={spawns}  best={best * 1000:8.1f} ms  median={median * 1000:8.1f} ms")
+    finally:
+        collectors.set_command_runner(previous)
+        backends.set_backend(previous_backend)
+
+if __name__ == "__main__":
+    main()
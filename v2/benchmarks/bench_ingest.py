@@ -0,0 +1,38 @@
+import os
+import sys
+import json
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import Results
+from bench_store import synthetic_snapshots
+
+# ingest.py reading, validating and normalizing NDJSON, with and without
+# stages behind the bounded queues.
+DEFAULT_COUNT = 20_000
+
+def write_ndjson(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for snapshot in synthetic_snapshots(count, max(count // 10, 1)):
+            f.write(json.dumps(snapshot.to_dict()) + "\n")
+
+def run(results, count=DEFAULT_COUNT, samples=3):
+    import ingest
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fleet.ndjson")
+        write_ndjson(path, count)
+        validate = lambda: sum(1 for _ in ingest.ingest([path]))
+        tally = lambda: ingest.fan_out(ingest.ingest([path]), {"tally": ingest.tally_stage(["OS Name", "RAM"])})
+        results.run(f"ingest {count} NDJSON records (validate)", validate, samples=samples, loops=1, items=count)
+        results.run(f"ingest {count} NDJSON records (tally stage)", tally, samples=samples, loops=1, items=count)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time streaming NDJSON ingestion.")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+    run(Results(), args.count, args.samples)
+
+if __name__ == "__main__":
+    main()
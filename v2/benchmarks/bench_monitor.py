@@ -0,0 +1,37 @@
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import Results
+
+# Cost of the live monitor (monitor.py) on the machine running the benchmark:
+# one sample (psutil counter reads into the ring buffers), the time that adds up
+# to per second at 10 Hz (10 ms per second is 1% of a core), and the sparkline
+# points for one full redraw.
+RATE_HZ = 10
+
+def run(results, samples=7):
+    import monitor
+    sampler = monitor.Sampler(RATE_HZ)
+    stats = results.run("monitor one sample", sampler.sample, samples=samples)
+    results.add("monitor sampling at 10 Hz (per second)", dict(stats, median=stats["median"] * RATE_HZ,
+                                                               min=stats["min"] * RATE_HZ, iqr=stats["iqr"] * RATE_HZ))
+    for _ in range(sampler.size):
+        sampler.sample()
+    width, height = 340, 32
+    series = [sampler.cpu, sampler.memory] + sampler.rates
+
+    def redraw():
+        for s in series:
+            monitor.sparkline_points(sampler.values(s), width, height, s.unit)
+    results.run(f"monitor sparkline points ({len(series)} x {sampler.size} samples)", redraw, samples=samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the live monitor's sampling and sparkline preparation.")
+    parser.add_argument("--samples", type=int, default=7)
+    args = parser.parse_args()
+    run(Results(), args.samples)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, os.path.dirname(os.path.dirname(BENCH_DIR)))
+import collectors
+import edid
+from records import render_field, render_info, Snapshot
+from harness import Results
+from fake_powershell import load_recordings, DEFAULT_RECORDINGS, FIXTURES_DIR
+
+# Recorded probe output replayed through the parsers of both versions:
+# version 1 parses `wmic ... /format:csv` text, version 2 parses PowerShell
+# ConvertTo-Json documents and renders the typed records for display.
+WMIC_RECORDINGS = os.path.join(FIXTURES_DIR, "wmic_recordings.json")
+
+def load_wmic(path=WMIC_RECORDINGS):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def v2_batch(document):
+    snapshot = Snapshot()
+    for name, value in collectors.parse_batch(document).items():
+        snapshot.set(name, value)
+    return render_info(snapshot, collectors.BATCH_FIELDS)
+
+def sample_edid(product, serial, code=0xA0F3, manufacturer="DEL", year=2021):
+    # A well-formed EDID base block with name and serial descriptors
+    data = bytearray(128)
+    data[:8] = edid.EDID_HEADER
+    data[8:10] = sum((ord(c) - 64) << shift for c, shift in zip(manufacturer, (10, 5, 0))).to_bytes(2, "big")
+    data[10:12] = code.to_bytes(2, "little")
+    data[16:18] = bytes([23, year - 1990])
+    data[18:23] = bytes([1, 4, 0xB5, 53, 30])
+    for offset, tag, text in ((54, edid.NAME_TAG, product), (72, edid.SERIAL_TAG, serial)):
+        data[offset + 3] = tag
+        data[offset + 5:offset + 18] = (text + "\n").ljust(13)[:13].encode("ascii")
+    data[127] = -sum(data[:127]) & 0xFF
+    return bytes(data)
+
+EDID_BATCH = 1000
+
+def cases():
+    import Asset_Info as v1
+    wmic = load_wmic()
+    ps = load_recordings(DEFAULT_RECORDINGS)
+    edids = [sample_edid("DELL P2419H", f"CN0{n:06d}") for n in range(EDID_BATCH)]
+    return [
+        ("parse v1 get_disks_physical (wmic csv)", lambda: v1.parse_disks_csv(wmic["diskdrive"])),
+        ("parse v1 get_cpu_details (wmic csv)", lambda: v1.parse_cpu_csv(wmic["cpu"])),
+        ("parse v1 get_system_model (wmic)", lambda: v1.parse_first_value(wmic["computersystem_model"])),
+        ("parse v1 get_cpu_tag (wmic)", lambda: v1.parse_first_value(wmic["bios_serialnumber"])),
+        ("parse v1 get_monitor_tags (text)", lambda: wmic["monitors_text"].strip()),
+        ("parse v2 get_disks_physical (json)",
+         lambda: render_field("Disks", collectors.parse_disks(json.loads(ps["disks"])))),
+        ("parse v2 get_cpu_details (json)",
+         lambda: render_field("CPU Details", collectors.parse_cpu(json.loads(ps["cpu"])))),
+        ("parse v2 get_monitor_tags (json)",
+         lambda: render_field("Monitor Details", collectors.parse_monitors(json.loads(ps["monitors"])))),
+        ("parse v2 batch document (json)", lambda: v2_batch(ps["batch"])),
+        (f"parse {EDID_BATCH} EDID blocks", lambda: edid.parse_edids(edids)),
+    ]
+
+def check():
+    # Both versions must agree on what they show, or the timings compare nothing
+    import Asset_Info as v1
+    wmic, ps = load_wmic(), load_recordings(DEFAULT_RECORDINGS)
+    batch = v2_batch(ps["batch"])
+    problems = []
+    if v1.parse_cpu_csv(wmic["cpu"]) != batch["CPU Details"]:
+        problems.append("CPU Details differ between v1 and v2")
+    if [row[:2] for row in batch["Disks"]] != v1.parse_disks_csv(wmic["diskdrive"]):
+        problems.append("Disks differ between v1 and v2")
+    if wmic["monitors_text"].strip() != batch["Monitor Details"]:
+        problems.append("Monitor Details differ between v1 and v2")
+    for problem in problems:
+        print(f"WARNING: {problem}")
+    return not problems
+
+def run(results, samples=7):
+    check()
+    for name, fn in cases():
+        results.run(name, fn, samples=samples, items=EDID_BATCH if "EDID" in name else None)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the probe output parsers against recorded wmic and PowerShell output.")
+    parser.add_argument("--samples", type=int, default=7)
+    args = parser.parse_args()
+    run(Results(), args.samples)
+
+if __name__ == "__main__":
+    main()
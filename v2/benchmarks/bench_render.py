@@ -0,0 +1,39 @@
+import io
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import Results
+from bench_store import synthetic_snapshots
+from records import render_info
+
+# export_to_pdf without the dialog: one PDF per snapshot, rendered to memory
+# one after another with the shared ReportTemplate, as the GUI does.
+DEFAULT_SIZES = (1, 100, 10_000)
+
+def samples_for(count):
+    # Big batches are slow and already average over many documents
+    return 7 if count <= 1 else 3 if count <= 100 else 1
+
+def render_all(template, infos):
+    for info in infos:
+        template.render(info, io.BytesIO())
+
+def run(results, sizes=DEFAULT_SIZES):
+    from report import ReportTemplate
+    results.run("render build ReportTemplate", ReportTemplate, samples=5)
+    template = ReportTemplate()
+    for count in sizes:
+        infos = [render_info(snapshot) for snapshot in synthetic_snapshots(count, max(count // 2, 1))]
+        results.run(f"render {count} snapshot(s) to PDF", lambda infos=infos: render_all(template, infos),
+                    samples=samples_for(count), loops=1, warmup=int(count <= 1), items=count)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time PDF rendering (export_to_pdf equivalent) for batches of snapshots.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated batch sizes")
+    args = parser.parse_args()
+    run(Results(), [int(size) for size in args.sizes.split(",")])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+V2_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(V2_DIR)
+SCRIPTS = {
+    "v1": os.path.join(REPO_DIR, "Asset_Info.py"),
+    "v2": os.path.join(V2_DIR, "Asset_Info-v2.py"),
+}
+# Modules whose import cost matters for start-up (and which should stay lazy)
+MODULES = ["collectors", "snapshot_cache", "headless", "tkinter", "psutil", "reportlab.platypus"]
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def time_process(args, repeat, cwd):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return min(timings), median(timings)
+
+def import_cost(module, repeat):
+    # Cumulative microseconds reported by -X importtime for the module itself
+    costs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=V2_DIR, capture_output=True, text=True, check=True
+        )
+        for line in result.stderr.splitlines():
+            parts = [part.strip() for part in line.split("|")]
+            if len(parts) == 3 and parts[2] == module:
+                costs.append(int(parts[1]))
+    return median(costs) / 1000 if costs else float("nan")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure start-up: time-to-window and import time.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--exe", help="also time a frozen build, e.g. dist/Asset_Info-v2/Asset_Info-v2.exe")
+    parser.add_argument("--no-window", action="store_true", help="skip time-to-window (no display available)")
+    args = parser.parse_args()
+
+    best, med = time_process([sys.executable, "-c", "pass"], args.repeat, V2_DIR)
+    print(f"{'interpreter baseline':<28} best={best * 1000:8.1f} ms  median={med * 1000:8.1f} ms")
+
+    print("\nImport time (-X importtime, cumulative):")
+    for module in MODULES:
+        print(f"  {module:<26} {import_cost(module, args.repeat):8.1f} ms")
+
+    print("\nHeadless start-up (process wall time, one full collection):")
+    for label, script in SCRIPTS.items():
+        cwd = os.path.dirname(script)
+        best, med = time_process([sys.executable, script, "--headless", "--format", "json"], args.repeat, cwd)
+        print(f"  {label:<26} best={best * 1000:8.1f} ms  median={med * 1000:8.1f} ms")
+
+    if not args.no_window:
+        print("\nTime-to-window (launch until the main window is mapped):")
+        for label, script in SCRIPTS.items():
+            cwd = os.path.dirname(script)
+            best, med = time_process([sys.executable, script, "--startup-benchmark"], args.repeat, cwd)
+            print(f"  {label:<26} best={best * 1000:8.1f} ms  median={med * 1000:8.1f} ms")
+        if args.exe:
+            best, med = time_process([args.exe, "--startup-benchmark"], args.repeat, os.path.dirname(args.exe))
+            print(f"  {os.path.basename(args.exe):<26} best={best * 1000:8.1f} ms  median={med * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
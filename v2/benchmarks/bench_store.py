@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import random
+import argparse
+import datetime
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from snapshot_store import SnapshotStore
+from records import Snapshot, Cpu, Disk, Monitor
+
+def synthetic_snapshots(count, hosts, seed=1):
+    rng = random.Random(seed)
+    start = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+    for i in range(count):
+        host = i % hosts
+        yield Snapshot(
+            collected_at=(start + datetime.timedelta(minutes=i)).isoformat(),
+            system_name=f"PC-{host:05d}",
+            ip_address=f"10.{host // 65536 % 256}.{host // 256 % 256}.{host % 256}",
+            ram_bytes=rng.choice([8, 16, 32]) * 1024 ** 3 - rng.choice([0, 167772160]),
+            model="HP EliteDesk 800 G6 Desktop Mini PC",
+            cpu=Cpu("Intel(R) Core(TM) i7-10700T CPU @ 2.00GHz", 1992, 8, 16),
+            serial_number=f"8CG{host:07d}",
+            monitors=[Monitor("HPN", "HP E24 G4", "3344", f"CNC{host:07d}")],
+            disks=[Disk("SAMSUNG MZVLB512HBJQ-000H1", 512110190592, "SSD")],
+            adapters=[],
+            os_name="Windows 10",
+            os_status="Active",
+        )
+
+def timed(label, fn, repeat=5):
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    print(f"{label:<34} best={timings[0] * 1000:9.2f} ms  median={timings[len(timings) // 2] * 1000:9.2f} ms")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Insert and look up synthetic snapshots in the SQLite store.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--hosts", type=int, default=5_000)
+    parser.add_argument("--db", help="database file (default: a temporary file)")
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "bench.db")
+    with SnapshotStore(path) as store:
+        start = time.perf_counter()
+        store.add_many(synthetic_snapshots(args.rows, args.hosts))
+        seconds = time.perf_counter() - start
+        print(f"{'insert ' + str(args.rows) + ' rows':<34} {seconds:9.2f} s  ({args.rows / seconds:,.0f} rows/s)")
+        serial = f"8CG{args.hosts // 2:07d}"
+        timed("find_by_serial", lambda: store.find_by_serial(serial))
+        timed("find_by_serial (latest only)", lambda: store.find_by_serial(serial, limit=1))
+        timed("latest(host)", lambda: store.latest(f"PC-{args.hosts // 3:05d}"))
+        rows = timed("latest_per_host", store.latest_per_host)
+        print(f"{'':<34} {len(rows)} hosts")
+    if not args.db:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
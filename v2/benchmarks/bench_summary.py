@@ -0,0 +1,45 @@
+import os
+import sys
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from harness import Results
+from records import Snapshot, Disk, Monitor, GIB
+
+# fleet_summary.py rollups over a mixed synthetic fleet (several models, OS
+# versions, disk types, some monitors without a serial).
+DEFAULT_HOSTS = 100_000
+MODELS = ["HP EliteDesk 800 G6", "Dell OptiPlex 7090", "Lenovo ThinkCentre M70q", "Dell Latitude 7420", "HP ProBook 450 G8"]
+OS_NAMES = ["Windows 10", "Windows 11", "Linux 6.8.0-45-generic"]
+MEDIA = ["SSD", "SSD", "SSD", "HDD", "Unspecified"]
+
+def synthetic_fleet(hosts, seed=1):
+    rng = random.Random(seed)
+    for host in range(hosts):
+        disks = [Disk(f"Disk {n}", rng.choice([256, 512, 1024]) * 10 ** 9, rng.choice(MEDIA))
+                 for n in range(rng.choice([1, 1, 2]))]
+        monitors = [Monitor(product="E24 G4", serial=f"CNC{host:07d}" if rng.random() > 0.05 else "")
+                    for _ in range(rng.choice([0, 1, 2]))]
+        yield Snapshot(system_name=f"PC-{host:06d}", ram_bytes=rng.choice([8, 16, 32]) * GIB,
+                       model=rng.choice(MODELS), os_name=rng.choice(OS_NAMES), disks=disks, monitors=monitors,
+                       collected_at="2025-06-01T00:00:00+00:00")
+
+def run(results, hosts=DEFAULT_HOSTS, samples=3):
+    import fleet_summary
+    snapshots = list(synthetic_fleet(hosts))
+    results.run(f"summary load {hosts} hosts into columns",
+                lambda: fleet_summary.FleetColumns().add_all(snapshots), samples=samples, loops=1, items=hosts)
+    columns = fleet_summary.FleetColumns().add_all(snapshots)
+    results.run(f"summary rollups over {hosts} hosts", lambda: fleet_summary.summarize(columns),
+                samples=samples, loops=1, items=hosts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time fleet rollups (fleet_summary.py).")
+    parser.add_argument("--hosts", type=int, default=DEFAULT_HOSTS)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+    run(Results(), args.hosts, args.samples)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_RECORDINGS = os.path.join(FIXTURES_DIR, "powershell_recordings.json")
+
+def script_names():
+    # Which recording answers which script. collectors is imported here, not at
+    # the top, so the child process replaying output starts as fast as it can.
+    import collectors
+    return {
+        collectors.PS_SERIAL: "serial",
+        collectors.PS_PRODUCT_KEY: "product_key",
+        collectors.PS_DISKS: "disks",
+        collectors.PS_SYSTEM_MODEL: "system_model",
+        collectors.PS_CPU: "cpu",
+        collectors.PS_MONITORS: "monitors",
+    }
+
+BATCH_MARKER = "# asset-info batch: "
+
+def replay(recordings, name, keys=None):
+    # A batch answers one JSON line per probe, as build_batch_script does, and
+    # a partial batch with just the probes that were asked for
+    if name != "batch":
+        return recordings[name]
+    batch = json.loads(recordings[name])
+    return "".join(json.dumps(dict(probe, key=key), separators=(",", ":")) + "\n"
+                   for key, probe in batch.items() if keys is None or key in keys)
+
+def identify(script):
+    if script.startswith(BATCH_MARKER):
+        return "batch", script.splitlines()[0][len(BATCH_MARKER):]
+    return script_names().get(script), ""
+
+def load_recordings(path=DEFAULT_RECORDINGS):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def make_replay_runner(recordings_path=DEFAULT_RECORDINGS, startup_cost=0.0, spawn=True):
+    # spawn=True starts a real child process per call (this file run as a script),
+    # so process creation is part of what gets measured; startup_cost emulates
+    # powershell.exe cold start on top of that.
+    recordings = load_recordings(recordings_path)
+    calls = []
+
+    def runner(args, timeout=None, on_line=None):
+        name, keys = identify(args[-1])
+        if name is None:
+            raise subprocess.CalledProcessError(1, args, b"fake powershell: unknown script")
+        calls.append(name)
+        if spawn:
+            # Through the app's own runner, as powershell.exe would be
+            import collectors
+            return collectors.default_command_runner(
+                [sys.executable, os.path.abspath(__file__), recordings_path, name, str(startup_cost), keys],
+                timeout=timeout, on_line=on_line
+            )
+        if startup_cost:
+            time.sleep(startup_cost)
+        return replay(recordings, name, keys.split(",") if keys else None).encode()
+
+    runner.calls = calls
+    runner.streams_lines = spawn
+    return runner
+
+if __name__ == "__main__":
+    path, name, startup_cost, keys = sys.argv[1], sys.argv[2], float(sys.argv[3]), sys.argv[4]
+    time.sleep(startup_cost)
+    sys.stdout.write(replay(load_recordings(path), name, keys.split(",") if keys else None))
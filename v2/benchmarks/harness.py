@@ -0,0 +1,144 @@
+import gc
+import sys
+import json
+import time
+import platform
+import subprocess
+
+# Shared measuring and reporting for the benchmark suite (run_benchmarks.py).
+# Every case is warmed up, then timed in several samples with the garbage
+# collector off (as timeit does); each sample loops the case enough times to
+# last at least MIN_SAMPLE_TIME, so fast parsers are not lost in timer noise.
+# Regressions are judged on the fastest sample: noise (other processes, CPU
+# frequency) only ever adds time, so the minimum is the most repeatable figure.
+# The median and spread are reported next to it.
+MIN_SAMPLE_TIME = 0.05
+DEFAULT_SAMPLES = 7
+DEFAULT_THRESHOLD = 0.10
+
+def calibrate(fn, min_time=MIN_SAMPLE_TIME):
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            return loops
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+def measure(fn, samples=DEFAULT_SAMPLES, loops=None, warmup=1):
+    # Seconds per call: {"median", "min", "max", "iqr", "loops", "samples"}
+    for _ in range(warmup):
+        fn()
+    loops = loops or calibrate(fn)
+    timings = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(samples):
+            start = time.perf_counter()
+            for _ in range(loops):
+                fn()
+            timings.append((time.perf_counter() - start) / loops)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    timings.sort()
+    quartile = lambda q: timings[min(int(q * len(timings)), len(timings) - 1)]
+    return {
+        "median": timings[len(timings) // 2],
+        "min": timings[0],
+        "max": timings[-1],
+        "iqr": quartile(0.75) - quartile(0.25),
+        "loops": loops,
+        "samples": samples,
+    }
+
+STAT_KEYS = ("median", "min", "max", "iqr", "loops", "samples")
+
+def fixed(seconds, samples=1):
+    # Stats for a figure measured elsewhere (e.g. -X importtime)
+    return {"median": seconds, "min": seconds, "max": seconds, "iqr": 0.0, "loops": 1, "samples": samples}
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:9.2f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:9.2f} ms"
+    return f"{seconds:9.2f} s "
+
+class Results:
+    def __init__(self):
+        self.cases = {}
+        self.rerun = {}
+
+    def add(self, name, stats, **extra):
+        stats = dict(stats, **extra)
+        self.cases[name] = stats
+        spread = stats["iqr"] / stats["median"] * 100 if stats["median"] else 0.0
+        line = f"{name:<46} median={format_seconds(stats['median'])}  min={format_seconds(stats['min'])}  iqr={spread:5.1f}%"
+        for key, value in stats.items():
+            if key not in STAT_KEYS:
+                line += f"  {key}={value}"
+        print(line, flush=True)
+        return stats
+
+    def run(self, name, fn, samples=DEFAULT_SAMPLES, loops=None, warmup=1, items=None):
+        # items: units of work per call, reported as a rate (e.g. documents per second)
+        def timed():
+            stats = measure(fn, samples, loops, warmup)
+            return dict(stats, per_s=round(items / stats["median"], 1)) if items else stats
+        self.rerun[name] = timed
+        return self.add(name, timed())
+
+    def confirm(self, baseline, threshold=DEFAULT_THRESHOLD, attempts=2):
+        # Measure suspected regressions again and keep the fastest result, so a
+        # burst of background load is not reported as a slow-down
+        for name, stats in self.cases.items():
+            base = baseline.get("cases", {}).get(name)
+            for _ in range(attempts):
+                if not base or name not in self.rerun or stats["min"] <= base["min"] * (1 + threshold):
+                    break
+                again = self.rerun[name]()
+                if again["min"] < stats["min"]:
+                    stats.update(again)
+
+    def to_dict(self):
+        return {"environment": environment(), "cases": self.cases}
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    # Cases whose fastest sample got slower than baseline by more than threshold
+    regressions = []
+    print(f"\n{'case (fastest sample)':<46} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, stats in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            print(f"{name:<46} {'-':>12} {format_seconds(stats['min'])} {'new':>8}")
+            continue
+        change = stats["min"] / base["min"] - 1 if base["min"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append((name, change))
+        print(f"{name:<46} {format_seconds(base['min'])} {format_seconds(stats['min'])} {change * 100:+7.1f}%{flag}")
+    return regressions
@@ -0,0 +1,110 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+V2_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, V2_DIR)
+import collectors
+import backends
+import bench_parsers
+import bench_render
+import bench_ingest
+import bench_summary
+import bench_archive
+import bench_monitor
+import bench_agent
+from harness import Results, fixed, compare, DEFAULT_THRESHOLD
+from bench_startup import import_cost, MODULES
+from fake_powershell import make_replay_runner, DEFAULT_RECORDINGS
+
+# The whole suite in one run, with results saved as JSON and compared against a
+# baseline from the previous release:
+#   python benchmarks/run_benchmarks.py --save baseline.json
+#   python benchmarks/run_benchmarks.py --baseline baseline.json   # exit code 1 on a regression
+SUITES = ("parsers", "collect", "render", "ingest", "summary", "archive", "monitor", "agent", "startup")
+
+def run_collect(results, samples):
+    # Per-field vs. batched collection against a fake PowerShell (a real child
+    # process per call, so process creation is part of the cost). The
+    # in-process backends are timed too: they read the machine running the
+    # benchmark.
+    runner = make_replay_runner(DEFAULT_RECORDINGS)
+    previous = collectors.set_command_runner(runner)
+    previous_backend = backends.set_backend(backends.PowerShellBackend())
+    try:
+        for label, fn in [("collect per-field (6 spawns)", collectors.get_wmi_details_separately),
+                          ("collect batched (1 spawn)", collectors.get_wmi_details_batched)]:
+            results.run(label, fn, samples=samples, loops=1)
+        for name, backend in backends.BACKENDS.items():
+            backend = backend()
+            if name != "powershell" and backend.available():
+                backends.set_backend(backend)
+                results.run(f"collect {name} backend (in-process)", collectors.get_wmi_details_batched, samples=samples)
+    finally:
+        collectors.set_command_runner(previous)
+        backends.set_backend(previous_backend)
+
+def run_startup(results, samples):
+    for module in MODULES:
+        results.add(f"startup import {module}", fixed(import_cost(module, samples) / 1000, samples))
+    # Interpreter start plus every import the headless entry point needs
+    args = [sys.executable, os.path.join(V2_DIR, "headless.py"), "--help"]
+    run = lambda: subprocess.run(args, cwd=V2_DIR, check=True, stdout=subprocess.DEVNULL)
+    results.run("startup headless.py to argparse", run, samples=samples, loops=1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite; save results and compare them with a baseline.")
+    parser.add_argument("--suite", default=",".join(SUITES), help=f"comma-separated subset of {', '.join(SUITES)}")
+    parser.add_argument("--samples", type=int, default=7)
+    parser.add_argument("--sizes", default=",".join(map(str, bench_render.DEFAULT_SIZES)),
+                        help="snapshot counts for the render suite")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare with results saved by an earlier run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slow-down that counts as a regression (default: 0.10 = 10%%)")
+    args = parser.parse_args()
+    suites = [suite.strip() for suite in args.suite.split(",") if suite.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    results = Results()
+    if "parsers" in suites:
+        bench_parsers.run(results, args.samples)
+    if "collect" in suites:
+        run_collect(results, args.samples)
+    if "render" in suites:
+        bench_render.run(results, [int(size) for size in args.sizes.split(",")])
+    if "ingest" in suites:
+        bench_ingest.run(results, samples=min(args.samples, 3))
+    if "summary" in suites:
+        bench_summary.run(results, samples=min(args.samples, 3))
+    if "archive" in suites:
+        bench_archive.run(results, samples=min(args.samples, 3))
+    if "monitor" in suites:
+        bench_monitor.run(results, args.samples)
+    if "agent" in suites:
+        bench_agent.run(results)
+    if "startup" in suites:
+        run_startup(results, args.samples)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        results.confirm(baseline, args.threshold)
+    if args.save:
+        results.save(args.save)
+    if baseline:
+        print(f"\nbaseline: {baseline['environment'].get('commit') or '?'} on {baseline['environment'].get('platform')}")
+        regressions = compare(results.to_dict(), baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold * 100:.0f}%")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
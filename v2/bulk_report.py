@@ -0,0 +1,101 @@
+import os
+import re
+import sys
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from snapshot_files import iter_snapshots
+
+# Bulk PDF rendering from stored snapshots. Per-host PDFs are laid out in a
+# process pool (reportlab layout is CPU-bound); the combined PDF is a single
+# document, so it is laid out in one process.
+
+def safe_filename(name):
+    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", str(name)).strip(" .")
+    return name or "unnamed"
+
+def assign_paths(infos, out_dir):
+    # <System Name>-Asset-Info.pdf, with a numeric suffix for repeated names
+    seen = {}
+    for info in infos:
+        base = safe_filename(info.get("System Name"))
+        seen[base] = seen.get(base, 0) + 1
+        suffix = f"-{seen[base]}" if seen[base] > 1 else ""
+        yield info, os.path.join(out_dir, f"{base}{suffix}-Asset-Info.pdf")
+
+def render_job(job):
+    # Runs in a worker process; each worker builds its template once
+    from report import get_template
+    info, path = job
+    try:
+        get_template().render(info, path)
+        return path, ""
+    except Exception as e:
+        return path, str(e)
+
+def bounded_map(executor, fn, items, limit):
+    # executor.map submits every item up front; this keeps at most `limit`
+    # in flight, so a stream of any length is rendered in bounded memory
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def iter_render_per_host(infos, out_dir, workers=None, chunksize=8):
+    # (path, error) per host, in input order; error is "" on success
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = assign_paths(infos, out_dir)
+    if workers == 1:
+        yield from map(render_job, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        limit = (workers or os.cpu_count() or 1) * chunksize
+        yield from bounded_map(executor, render_job, jobs, limit)
+
+def render_per_host(infos, out_dir, workers=None, chunksize=8):
+    return list(iter_render_per_host(infos, out_dir, workers, chunksize))
+
+def render_combined(infos, path):
+    from report import get_template
+    return get_template().render_combined(infos, path)
+
+def throughput_line(label, count, seconds, unit="document(s)", rate_unit="docs/s"):
+    rate = count / seconds if seconds else 0.0
+    return f"{label:<10} {count:7d} {unit} in {seconds:8.2f} s = {rate:9.1f} {rate_unit}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render stored snapshots (JSON/NDJSON) to PDF in bulk.")
+    parser.add_argument("inputs", nargs="+", help="snapshot files or directories of them")
+    parser.add_argument("--out-dir", help="write one PDF per host into this directory")
+    parser.add_argument("--combined", help="write one PDF with a table of contents for all hosts")
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: one per CPU)")
+    parser.add_argument("--chunksize", type=int, default=8, help="documents queued per render process (default: 8)")
+    args = parser.parse_args(argv)
+    if not args.out_dir and not args.combined:
+        parser.error("give --out-dir, --combined or both")
+
+    # Snapshots are streamed from disk; only the combined document, which
+    # reportlab lays out as a whole, holds every host at once
+    failures = []
+    if args.out_dir:
+        start = time.perf_counter()
+        count = 0
+        for count, (path, error) in enumerate(iter_render_per_host(iter_snapshots(args.inputs), args.out_dir,
+                                                                     args.workers, args.chunksize), 1):
+            if error:
+                failures.append((path, error))
+        print(throughput_line("per-host", count - len(failures), time.perf_counter() - start))
+    if args.combined:
+        start = time.perf_counter()
+        count = render_combined(iter_snapshots(args.inputs), args.combined)
+        print(throughput_line("combined", count, time.perf_counter() - start, "host section(s)", "hosts/s"))
+    for path, error in failures:
+        print(f"FAILED {path}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
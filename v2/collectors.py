@@ -0,0 +1,577 @@
+import platform
+import socket
+import subprocess
+import json
+import time
+import scheduler
+import instrumentation
+from scheduler import run_probes, TIMED_OUT, CANCELLED
+from records import (
+    Disk, Monitor, Cpu, Adapter, FieldError, Snapshot, FIELD_ATTRS, STATUS_ERROR, STATUS_TIMED_OUT, STATUS_CANCELLED,
+    probe_status, render_field, render_info,
+)
+
+POWERSHELL_PATH = r"C:\Windows\System32\WindowsPowerShell\v1.0\powershell.exe"
+
+# --------- Command runner ---------
+# Every PowerShell invocation goes through one runner so it can be swapped
+# (e.g. for a fake PowerShell replaying recorded output on Linux). The default
+# is the shared asyncio runner (async_runner.py), which streams output line by
+# line; runner(args, timeout=None, on_line=None) -> bytes.
+def default_command_runner(args, timeout=None, on_line=None):
+    # asyncio is imported on first use, not at start-up
+    import async_runner
+    return async_runner.command_runner(args, timeout, on_line)
+
+default_command_runner.streams_lines = True
+
+def popen_command_runner(args, timeout=None):
+    # Like check_output, but the child is killed as soon as the deadline passes
+    # or the probe running it is cancelled. Output arrives all at once.
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT) as proc:
+        while True:
+            try:
+                output, _ = proc.communicate(timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                if scheduler.is_cancelled():
+                    proc.kill()
+                    proc.communicate()
+                    raise RuntimeError("Cancelled")
+                if deadline is not None and time.monotonic() >= deadline:
+                    proc.kill()
+                    proc.communicate()
+                    raise subprocess.TimeoutExpired(args, timeout)
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, args, output)
+    return output
+
+_command_runner = default_command_runner
+
+def set_command_runner(runner):
+    global _command_runner
+    previous = _command_runner
+    _command_runner = runner or default_command_runner
+    return previous
+
+def get_command_runner():
+    return _command_runner
+
+def run_powershell(script, timeout=None, on_line=None):
+    # on_line(bytes) sees each line of output; with a runner that cannot
+    # stream, only once the command has finished
+    if timeout is None:
+        timeout = scheduler.remaining_time()
+    instrumentation.count_spawn()
+    args = [POWERSHELL_PATH, "-NoProfile", "-NonInteractive", "-Command", script]
+    runner = _command_runner
+    if on_line is not None and getattr(runner, "streams_lines", False):
+        result = runner(args, timeout=timeout, on_line=on_line)
+    else:
+        result = runner(args, timeout=timeout)
+        if on_line is not None:
+            for line in result.splitlines(keepends=True):
+                on_line(line)
+    instrumentation.count_bytes(len(result))
+    return result.decode(errors="ignore")
+
+# --------- PowerShell scripts ---------
+PS_SERIAL = "(Get-CimInstance Win32_BIOS).SerialNumber"
+
+PS_PRODUCT_KEY = "(Get-WmiObject -query 'select * from SoftwareLicensingService').OA3xOriginalProductKey"
+
+PS_DISKS = """
+$disks = Get-PhysicalDisk | Select-Object FriendlyName, MediaType, Size
+if (-not $disks) {
+    $disks = Get-CimInstance Win32_DiskDrive | Select-Object Model, Size
+    foreach ($disk in $disks) { $disk | Add-Member -NotePropertyName MediaType -NotePropertyValue "Unknown" }
+}
+$disks | ConvertTo-Json
+"""
+
+PS_SYSTEM_MODEL = "(Get-CimInstance Win32_ComputerSystem).Model"
+
+PS_CPU = """
+$cpu = Get-CimInstance Win32_Processor | Select-Object -First 1 Name, MaxClockSpeed, NumberOfCores, NumberOfLogicalProcessors
+$cpu | ConvertTo-Json
+"""
+
+PS_MONITORS = r"""
+function Decode {
+    param($data)
+    if ($data -is [System.Array]) {
+        return [System.Text.Encoding]::ASCII.GetString($data).Trim([char]0)
+    }
+    else {
+        return "Not Found"
+    }
+}
+$monitors = Get-WmiObject WmiMonitorID -Namespace root\wmi
+$result = @()
+foreach ($monitor in $monitors) {
+    $result += [ordered]@{
+        Manufacturer = (Decode $monitor.ManufacturerName).Trim(); Name = (Decode $monitor.UserFriendlyName).Trim()
+        ProductCode = (Decode $monitor.ProductCodeID).Trim(); Serial = (Decode $monitor.SerialNumberID).Trim()
+    }
+}
+ConvertTo-Json @($result)
+"""
+
+# All of the above in one interpreter: each probe is wrapped so one failure
+# does not lose the others. Each probe's result is written as one JSON line
+# ({"key": ..., "ok": ..., "value"/"error": ..., "ms": ...}) as soon as it is
+# done, so callers see fields arrive one by one and keep the finished ones if
+# the batch runs out of time. The first line names the probes included, so a
+# partial batch can be requested.
+PS_BATCH_PRELUDE = r"""
+$ErrorActionPreference = 'Stop'
+function Probe([scriptblock]$block) {
+    $watch = [Diagnostics.Stopwatch]::StartNew()
+    try { @{ ok = $true; value = (& $block); ms = $watch.ElapsedMilliseconds } }
+    catch { @{ ok = $false; error = $_.Exception.Message; ms = $watch.ElapsedMilliseconds } }
+}
+function Decode($data) {
+    if ($data -is [System.Array]) {
+        return [System.Text.Encoding]::ASCII.GetString($data).Trim([char]0).Trim()
+    }
+    return "Not Found"
+}
+function Emit([string]$key, $probe) {
+    $probe.key = $key
+    [Console]::Out.WriteLine(($probe | ConvertTo-Json -Depth 4 -Compress))
+}
+"""
+
+BATCH_PROBES = {
+    "model": r"Probe { (Get-CimInstance Win32_ComputerSystem).Model }",
+    "cpu": r"Probe { Get-CimInstance Win32_Processor | Select-Object -First 1 Name, MaxClockSpeed, NumberOfCores, NumberOfLogicalProcessors }",
+    "serial": r"Probe { (Get-CimInstance Win32_BIOS).SerialNumber }",
+    "product_key": r"Probe { (Get-CimInstance -Query 'select OA3xOriginalProductKey from SoftwareLicensingService').OA3xOriginalProductKey }",
+    "disks": r"""Probe {
+        $disks = Get-PhysicalDisk | Select-Object FriendlyName, @{ n = 'MediaType'; e = { [string]$_.MediaType } }, Size
+        if (-not $disks) {
+            $disks = Get-CimInstance Win32_DiskDrive | Select-Object Model, Size, @{ n = 'MediaType'; e = { 'Unknown' } }
+        }
+        @($disks)
+    }""",
+    "monitors": r"""Probe {
+        @(Get-CimInstance -Namespace root\wmi -ClassName WmiMonitorID | ForEach-Object {
+            [ordered]@{
+                Manufacturer = Decode $_.ManufacturerName; Name = Decode $_.UserFriendlyName
+                ProductCode = Decode $_.ProductCodeID; Serial = Decode $_.SerialNumberID
+            }
+        })
+    }""",
+}
+
+BATCH_FIELDS = {
+    "CPU Model Name": "model",
+    "CPU Details": "cpu",
+    "Serial Number": "serial",
+    "Product Key": "product_key",
+    "Monitor Details": "monitors",
+    "Disks": "disks",
+}
+
+def build_batch_script(keys=None):
+    keys = [key for key in BATCH_PROBES if keys is None or key in keys]
+    lines = [f"# asset-info batch: {','.join(keys)}", PS_BATCH_PRELUDE]
+    for key in keys:
+        lines.append(f"Emit '{key}' ({BATCH_PROBES[key]})")
+    return "\n".join(lines)
+
+PS_BATCH = build_batch_script()
+
+# --------- Parsers ---------
+# Raw PowerShell/CIM output -> typed values (records.py); no display text here.
+MEDIA_TYPES = {0: "Unspecified", 3: "HDD", 4: "SSD", 5: "SCM"}
+
+def as_list(value):
+    # ConvertTo-Json collapses single-element arrays into a bare object
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+def as_int(value):
+    return int(value) if value is not None and str(value).isdigit() else None
+
+def clean_text(value):
+    value = str(value).strip() if value is not None else ""
+    return value or None
+
+def parse_disks(disks):
+    output = []
+    for d in as_list(disks):
+        dtype = d.get("MediaType", "Unknown")
+        if isinstance(dtype, int):
+            dtype = MEDIA_TYPES.get(dtype, "Unknown")
+        output.append(Disk(d.get("FriendlyName") or d.get("Model") or "Unknown", as_int(d.get("Size")), dtype or "Unknown"))
+    return output
+
+def parse_cpu(cpu):
+    if isinstance(cpu, list):
+        cpu = cpu[0] if cpu else None
+    if not cpu:
+        return None
+    return Cpu(cpu.get("Name"), cpu.get("MaxClockSpeed"), cpu.get("NumberOfCores"), cpu.get("NumberOfLogicalProcessors"))
+
+def parse_monitors(monitors):
+    # In-process backends may hand over Monitor records (parsed from EDID) as they are
+    return [
+        m if isinstance(m, Monitor) else
+        Monitor(clean_text(m.get("Manufacturer")), clean_text(m.get("Name")),
+                clean_text(m.get("ProductCode")), clean_text(m.get("Serial")))
+        for m in as_list(monitors)
+    ]
+
+def is_failure(value):
+    # Probe results that carry no data: errors, timeouts and cancellations
+    if isinstance(value, FieldError):
+        return True
+    if isinstance(value, list):
+        return any(isinstance(row, (tuple, list)) and row and row[0] in ("Error", TIMED_OUT, CANCELLED) for row in value)
+    return value in (TIMED_OUT, CANCELLED) or str(value).startswith("Error:")
+
+# --------- Readers ---------
+# Each reader returns a typed value and raises on failure
+def read_system_name():
+    return platform.node()
+
+# A TEST-NET address (RFC 5737): connecting a UDP socket to it only picks the
+# outgoing route, no packet is sent and no name is resolved
+ROUTE_PROBE_ADDRESS = ("192.0.2.1", 9)
+
+def read_network_adapters():
+    # Every interface from the OS's own tables; no DNS, no PowerShell
+    import psutil
+    stats = psutil.net_if_stats()
+    adapters = []
+    for name, addresses in psutil.net_if_addrs().items():
+        ipv4 = [a.address for a in addresses if a.family == socket.AF_INET]
+        # Link-local IPv6 addresses carry a "%zone" suffix on some platforms
+        ipv6 = [a.address.split("%", 1)[0] for a in addresses if a.family == socket.AF_INET6]
+        mac = next((a.address.replace("-", ":").upper() for a in addresses if a.family == psutil.AF_LINK), None)
+        if mac and not mac.strip("0:"):
+            mac = None
+        stat = stats.get(name)
+        adapters.append(Adapter(name, ipv4, ipv6, mac, stat.speed or None if stat else None,
+                                bool(stat and stat.isup)))
+    # Connected adapters first, loopback last
+    adapters.sort(key=lambda a: (not a.is_up, all(ip.startswith("127.") for ip in a.ipv4) and bool(a.ipv4)))
+    return adapters
+
+def read_ip_address(adapters=None):
+    # IPv4 address of the adapter on the default route: the one other
+    # machines see. Without a route, the first address of a connected adapter.
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(ROUTE_PROBE_ADDRESS)
+            address = s.getsockname()[0]
+        if address != "0.0.0.0":
+            return address
+    except OSError:
+        pass
+    for adapter in adapters if adapters is not None else read_network_adapters():
+        for address in adapter.ipv4 if adapter.is_up else []:
+            if not address.startswith("127."):
+                return address
+    return "127.0.0.1"
+
+def read_ram():
+    import psutil
+    return psutil.virtual_memory().total
+
+def read_serial_number():
+    return clean_text(run_powershell(PS_SERIAL))
+
+def read_product_key():
+    return clean_text(run_powershell(PS_PRODUCT_KEY))
+
+def read_disks():
+    return parse_disks(json.loads(run_powershell(PS_DISKS)))
+
+def read_system_model():
+    return clean_text(run_powershell(PS_SYSTEM_MODEL))
+
+def read_cpu():
+    return parse_cpu(json.loads(run_powershell(PS_CPU)))
+
+def read_os_name():
+    return f"{platform.system()} {platform.release()}"
+
+def read_status():
+    return "Active"
+
+def read_monitors():
+    return parse_monitors(json.loads(run_powershell(PS_MONITORS)))
+
+def capture(read):
+    # Reader result, or its failure as a FieldError
+    def probe():
+        try:
+            return read()
+        except Exception as e:
+            if scheduler.is_cancelled():
+                return FieldError(STATUS_CANCELLED, CANCELLED)
+            return FieldError.from_exception(e)
+    return probe
+
+# --------- Probes (display values) ---------
+def backend_field(name):
+    # One WMI field through the selected backend (so it also works off Windows)
+    return get_wmi_details(fields=[name])[name]
+
+def get_system_name():
+    return render_field("System Name", capture(read_system_name)())
+
+def get_ip_address():
+    return render_field("IP Address", capture(read_ip_address)())
+
+def get_network_adapters():
+    return render_field("Network Adapters", capture(read_network_adapters)())
+
+def get_ram():
+    return render_field("RAM", read_ram())
+
+def get_serial_number():
+    return render_field("Serial Number", backend_field("Serial Number"))
+
+def get_product_key():
+    return render_field("Product Key", backend_field("Product Key"))
+
+def get_disks_physical():
+    return render_field("Disks", backend_field("Disks"))
+
+def get_system_model():
+    return render_field("CPU Model Name", backend_field("CPU Model Name"))
+
+def get_cpu_details():
+    return render_field("CPU Details", backend_field("CPU Details"))
+
+def get_os_name():
+    return read_os_name()
+
+def get_status():
+    return read_status()
+
+def get_monitor_tags():
+    return render_field("Monitor Details", backend_field("Monitor Details"))
+
+# --------- Batched collection ---------
+BATCH_PARSERS = {
+    "System Name": clean_text,
+    "IP Address": clean_text,
+    "RAM": as_int,
+    "OS Name": clean_text,
+    "CPU Model Name": clean_text,
+    "CPU Details": parse_cpu,
+    "Serial Number": clean_text,
+    "Product Key": clean_text,
+    "Monitor Details": parse_monitors,
+    "Disks": parse_disks,
+}
+
+def batch_line(line):
+    # (key, probe) from one line of a streamed batch, or None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(record, dict) and "key" in record and "ok" in record:
+        return record.pop("key"), record
+    return None
+
+def load_batch(document):
+    # {key: probe} from a batch: one JSON line per probe (build_batch_script),
+    # one ConvertTo-Json document (fleet's remote script, older recordings) or
+    # the same structure already decoded by an in-process backend
+    if not isinstance(document, (str, bytes)):
+        return document
+    try:
+        data = json.loads(document)
+    except ValueError:
+        data = None
+    # A one-probe batch is a single line, which is also a whole JSON document
+    if isinstance(data, dict) and not ("key" in data and "ok" in data):
+        return data
+    data = {}
+    for line in document.splitlines():
+        probe = batch_line(line) if line.strip() else None
+        if probe is not None:
+            data[probe[0]] = probe[1]
+    if not data:
+        raise ValueError("no probe results in batch output")
+    return data
+
+def parse_probe(name, probe):
+    # Typed value or FieldError of one field from its probe result
+    if not probe.get("ok"):
+        return FieldError(STATUS_ERROR, str(probe.get("error", "no result")))
+    try:
+        return BATCH_PARSERS[name](probe.get("value"))
+    except Exception as e:
+        return FieldError.from_exception(e)
+
+def parse_batch(document, keys=BATCH_FIELDS):
+    # {field: typed value or FieldError} for the probes present in the document
+    data = load_batch(document)
+    run = instrumentation.current_run()
+    values = {}
+    for name, key in keys.items():
+        if key not in data:
+            continue
+        probe = data.get(key) or {}
+        if run and "ms" in probe:
+            # Time each query took inside the batch, as measured by PowerShell
+            run.add(f"WMI: {name}", probe["ms"] / 1000, failed=not probe.get("ok"), parent="WMI")
+        values[name] = parse_probe(name, probe)
+    return values
+
+def get_wmi_details_batched(fields=None, on_field=None):
+    # One query through the selected backend (backends.py): in-process WMI when
+    # available, otherwise the batched PowerShell script.
+    # on_field(name, value) is called for each field as its probe finishes.
+    import backends
+    keys = set(BATCH_PROBES) if fields is None else {BATCH_FIELDS[name] for name in fields}
+    on_probe = None
+    if on_field is not None:
+        names = {key: name for name, key in BATCH_FIELDS.items()}
+        on_probe = lambda key, probe: on_field(names[key], parse_probe(names[key], dict(probe)))
+    return parse_batch(backends.query(keys, on_probe))
+
+# Seconds each probe may take before it is reported as TIMED_OUT
+PROBE_TIMEOUTS = {
+    "System Name": 5,
+    "IP Address": 5,
+    "Network Adapters": 5,
+    "RAM": 5,
+    "CPU Model Name": 30,
+    "CPU Details": 30,
+    "Serial Number": 30,
+    "Product Key": 45,
+    "Monitor Details": 45,
+    "Disks": 45,
+    "OS Name": 5,
+    "OS Status": 5,
+    "WMI": 60,
+}
+
+WMI_PROBES = [
+    ("CPU Model Name", read_system_model),
+    ("CPU Details", read_cpu),
+    ("Serial Number", read_serial_number),
+    ("Product Key", read_product_key),
+    ("Monitor Details", read_monitors),
+    ("Disks", read_disks),
+]
+
+LOCAL_PROBES = [
+    ("System Name", read_system_name),
+    ("IP Address", read_ip_address),
+    ("Network Adapters", read_network_adapters),
+    ("RAM", read_ram),
+    ("OS Name", read_os_name),
+    ("OS Status", read_status),
+]
+
+FIELD_ORDER = list(FIELD_ATTRS)
+
+def count_failures(value):
+    if isinstance(value, dict):
+        return sum(isinstance(v, FieldError) for v in value.values())
+    return int(isinstance(value, FieldError))
+
+def measured(metrics, name, fn, parent=None):
+    return metrics.wrap(name, fn, count_failures, parent) if metrics else fn
+
+def mark_unfinished(metrics, results, prefix=""):
+    # Probes the scheduler gave up on never returned to their wrapper in time
+    for name, value in results.items():
+        if metrics and value in (TIMED_OUT, CANCELLED):
+            metrics.mark(prefix + name, value.lower())
+
+def get_wmi_details_separately(cancel_event=None, fields=None, metrics=None):
+    results = run_probes(
+        [(name, measured(metrics, f"WMI: {name}", capture(fn), "WMI"), PROBE_TIMEOUTS[name])
+         for name, fn in WMI_PROBES if fields is None or name in fields],
+        cancel_event=cancel_event
+    )
+    mark_unfinished(metrics, results, "WMI: ")
+    return {name: probe_status(value) for name, value in results.items()}
+
+def get_wmi_details(cancel_event=None, fields=None, metrics=None, on_result=None):
+    # on_result(name, value) as each field arrives; fields that arrived before
+    # a timeout, cancellation or failure of the batch are kept
+    names = [name for name, _ in WMI_PROBES if fields is None or name in fields]
+    received = {}
+
+    def arrived(name, value):
+        received[name] = value
+        if on_result:
+            on_result(name, value)
+
+    try:
+        return get_wmi_details_batched(names, arrived)
+    except subprocess.TimeoutExpired:
+        return {name: received.get(name, FieldError(STATUS_TIMED_OUT, TIMED_OUT)) for name in names}
+    except Exception:
+        if scheduler.is_cancelled():
+            return {name: received.get(name, FieldError(STATUS_CANCELLED, CANCELLED)) for name in names}
+        # PowerShell itself failed or returned garbage: fall back to one call per
+        # field for the ones still missing
+        missing = [name for name in names if name not in received]
+        return dict(received, **get_wmi_details_separately(cancel_event, missing, metrics))
+
+def collect_snapshot(cancel_event=None, fields=None, on_result=None, metrics=None):
+    # Typed snapshot of this machine. fields: subset of FIELD_ORDER to collect
+    # (None collects everything); the others stay None.
+    # on_result(name, value) is called from worker threads as each field arrives.
+    # metrics: an instrumentation.RunMetrics to record per-probe timings in.
+    fields = FIELD_ORDER if fields is None else [name for name in FIELD_ORDER if name in fields]
+    probes = [(name, measured(metrics, name, capture(fn)), PROBE_TIMEOUTS[name])
+              for name, fn in LOCAL_PROBES if name in fields]
+    wmi_fields = [name for name, _ in WMI_PROBES if name in fields]
+    reported = set()
+
+    def report_field(name, value):
+        if on_result and name not in reported:
+            reported.add(name)
+            on_result(name, value)
+
+    if wmi_fields:
+        # WMI fields are reported one by one as the batch streams them in
+        wmi = lambda: get_wmi_details(cancel_event, wmi_fields, metrics, report_field)
+        probes.append(("WMI", measured(metrics, "WMI", wmi), PROBE_TIMEOUTS["WMI"]))
+
+    def expand(name, value):
+        if name != "WMI":
+            return {name: probe_status(value)}
+        if isinstance(value, dict):
+            return value
+        return {wmi_name: probe_status(value) for wmi_name in wmi_fields}
+
+    def report(name, value):
+        for field_name, field_value in expand(name, value).items():
+            report_field(field_name, field_value)
+
+    results = run_probes(probes, cancel_event=cancel_event, on_result=report)
+    mark_unfinished(metrics, results)
+    values = {}
+    for name, value in results.items():
+        values.update(expand(name, value))
+    snapshot = Snapshot()
+    for name in fields:
+        snapshot.set(name, values.get(name, FieldError(STATUS_TIMED_OUT, TIMED_OUT)))
+    return snapshot
+
+def gather_info(cancel_event=None, fields=None, on_result=None, metrics=None):
+    # Display form of collect_snapshot(): {field: text}, Disks and Network
+    # Adapters as rows of text (records.TABLE_FIELDS)
+    fields = FIELD_ORDER if fields is None else [name for name in FIELD_ORDER if name in fields]
+    report = None
+    if on_result:
+        report = lambda name, value: on_result(name, render_field(name, value))
+    return render_info(collect_snapshot(cancel_event, fields, report, metrics), fields)
@@ -0,0 +1,102 @@
+import os
+import glob
+from records import Monitor
+
+# EDID base block (VESA E-EDID 1.3/1.4, the first 128 bytes) -> records.Monitor.
+# The parser reads a memoryview over the caller's buffer: nothing is copied
+# except the few descriptor strings it decodes, so fleet-sized batches (many
+# thousands of blobs) parse in milliseconds. Works the same on blobs from
+# /sys/class/drm, the Windows registry or WMI (WmiGetMonitorRawEEdidV1Block).
+EDID_HEADER = b"\x00\xff\xff\xff\xff\xff\xff\x00"
+BLOCK_SIZE = 128
+DESCRIPTORS = (54, 72, 90, 108)
+NAME_TAG = 0xFC
+SERIAL_TAG = 0xFF
+
+def descriptor_text(view, offset):
+    # 13 bytes of text, ended by a line feed and padded with spaces
+    text = str(view[offset + 5:offset + 18], "cp437")
+    return text.split("\n", 1)[0].strip() or None
+
+def parse_edid(data, verify_checksum=False):
+    # A Monitor, or None if data does not hold an EDID base block.
+    # verify_checksum: also reject blocks whose bytes do not sum to 0 mod 256
+    # (some WMI providers and KVM switches hand out blocks with a bad sum but
+    # otherwise good data, so this is off by default).
+    view = memoryview(data).cast("B")
+    if view.nbytes < BLOCK_SIZE or view[:8] != EDID_HEADER:
+        return None
+    if verify_checksum and sum(view[:BLOCK_SIZE]) & 0xFF:
+        return None
+    packed = view[8] << 8 | view[9]
+    manufacturer = chr(64 + (packed >> 10 & 0x1F)) + chr(64 + (packed >> 5 & 0x1F)) + chr(64 + (packed & 0x1F))
+    name = serial = None
+    for offset in DESCRIPTORS:
+        # Display descriptors start with three zero bytes; detailed timings never do
+        if view[offset] or view[offset + 1] or view[offset + 2]:
+            continue
+        tag = view[offset + 3]
+        if tag == NAME_TAG:
+            name = descriptor_text(view, offset)
+        elif tag == SERIAL_TAG:
+            serial = descriptor_text(view, offset)
+    if serial is None:
+        number = view[12] | view[13] << 8 | view[14] << 16 | view[15] << 24
+        serial = str(number) if number else None
+    # Week 0xFF: the year is a model year, not a manufacture date
+    week = view[16] if 0 < view[16] <= 54 else None
+    return Monitor(
+        manufacturer=manufacturer,
+        product=name,
+        product_code=f"{view[10] | view[11] << 8:04X}",
+        serial=serial,
+        week=week,
+        year=1990 + view[17] if view[17] else None,
+        width_cm=view[21] or None,
+        height_cm=view[22] or None,
+    )
+
+def parse_edids(blobs, verify_checksum=False):
+    # Monitors for every blob that parses; the rest are skipped
+    monitors = []
+    for blob in blobs:
+        monitor = parse_edid(blob, verify_checksum)
+        if monitor is not None:
+            monitors.append(monitor)
+    return monitors
+
+# --------- Sources ---------
+def drm_edids(root="/"):
+    # Connected outputs on Linux (disconnected connectors have an empty file)
+    for path in sorted(glob.glob(os.path.join(root, "sys/class/drm/card*-*/edid"))):
+        with open(path, "rb") as f:
+            data = f.read()
+        if data:
+            yield data
+
+REGISTRY_DISPLAYS = r"SYSTEM\CurrentControlSet\Enum\DISPLAY"
+
+def registry_edids():
+    # Windows keeps an EDID for every monitor ever attached; only devices that
+    # are present now have a Control subkey
+    import winreg
+    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, REGISTRY_DISPLAYS) as displays:
+        for model in subkeys(winreg, displays):
+            with winreg.OpenKey(displays, model) as model_key:
+                for instance in subkeys(winreg, model_key):
+                    try:
+                        with winreg.OpenKey(model_key, instance + r"\Control"):
+                            pass
+                        with winreg.OpenKey(model_key, instance + r"\Device Parameters") as params:
+                            yield winreg.QueryValueEx(params, "EDID")[0]
+                    except OSError:
+                        continue
+
+def subkeys(winreg, key):
+    index = 0
+    while True:
+        try:
+            yield winreg.EnumKey(key, index)
+        except OSError:
+            return
+        index += 1
@@ -0,0 +1,378 @@
+import sys
+import json
+import time
+import queue
+import base64
+import argparse
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import scheduler
+import collectors
+import instrumentation
+from collectors import parse_batch, PS_BATCH_PRELUDE, POWERSHELL_PATH
+from records import Snapshot
+from scheduler import run_with_deadline, CANCELLED
+from headless import snapshot_record, display_record, WRITERS, FORMATS, COLUMNS
+
+# Fleet mode: run the same probes against many hosts at once, each host with its
+# own deadline and retries, and gather the answers into one result set.
+FLEET_COLUMNS = ["Host", "Status", "Attempts", "Elapsed", "Error"] + COLUMNS
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_TIMED_OUT = "timed out"
+STATUS_CANCELLED = "cancelled"
+
+# --------- Transports ---------
+class Transport:
+    # How one host is asked for its snapshot. collect() returns a
+    # records.Snapshot, or raises; it should give up after `timeout` seconds.
+    name = "transport"
+
+    def collect(self, host, timeout):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+class LocalTransport(Transport):
+    # Answers for every host by collecting on this machine; a stand-in for a
+    # real remote transport when exercising the fleet engine. collect(host), if
+    # given, answers instead (e.g. scripted per-host results in tests).
+    name = "local"
+
+    def __init__(self, collect=None):
+        self.collect_local = collect or (lambda host: collectors.collect_snapshot())
+
+    def collect(self, host, timeout):
+        return self.collect_local(host)
+
+REMOTE_PROBES = {
+    "name": r"Probe { (Get-CimInstance -CimSession $s Win32_ComputerSystem).Name }",
+    "ip": r"""Probe {
+        @(Get-CimInstance -CimSession $s Win32_NetworkAdapterConfiguration -Filter 'IPEnabled = True' |
+            ForEach-Object { $_.IPAddress } | Where-Object { $_ -match '^\d+\.\d+\.\d+\.\d+$' })[0]
+    }""",
+    "ram": r"Probe { (Get-CimInstance -CimSession $s Win32_ComputerSystem).TotalPhysicalMemory }",
+    "os": r"Probe { (Get-CimInstance -CimSession $s Win32_OperatingSystem).Caption }",
+    "model": r"Probe { (Get-CimInstance -CimSession $s Win32_ComputerSystem).Model }",
+    "cpu": r"Probe { Get-CimInstance -CimSession $s Win32_Processor | Select-Object -First 1 Name, MaxClockSpeed, NumberOfCores, NumberOfLogicalProcessors }",
+    "serial": r"Probe { (Get-CimInstance -CimSession $s Win32_BIOS).SerialNumber }",
+    "product_key": r"Probe { (Get-CimInstance -CimSession $s -Query 'select OA3xOriginalProductKey from SoftwareLicensingService').OA3xOriginalProductKey }",
+    "disks": r"""Probe {
+        $disks = Get-PhysicalDisk -CimSession $s | Select-Object FriendlyName, @{ n = 'MediaType'; e = { [string]$_.MediaType } }, Size
+        if (-not $disks) {
+            $disks = Get-CimInstance -CimSession $s Win32_DiskDrive | Select-Object Model, Size, @{ n = 'MediaType'; e = { 'Unknown' } }
+        }
+        @($disks)
+    }""",
+    "monitors": r"""Probe {
+        @(Get-CimInstance -CimSession $s -Namespace root\wmi -ClassName WmiMonitorID | ForEach-Object {
+            [ordered]@{
+                Manufacturer = Decode $_.ManufacturerName; Name = Decode $_.UserFriendlyName
+                ProductCode = Decode $_.ProductCodeID; Serial = Decode $_.SerialNumberID
+            }
+        })
+    }""",
+}
+
+def build_remote_script(host, operation_timeout):
+    host = host.replace("'", "''")
+    lines = [PS_BATCH_PRELUDE,
+             f"$s = New-CimSession -ComputerName '{host}' -OperationTimeoutSec {int(operation_timeout)}",
+             "try {",
+             "$result = [ordered]@{"]
+    for key, probe in REMOTE_PROBES.items():
+        lines.append(f"    {key} = {probe}")
+    lines += ["}",
+              "$result | ConvertTo-Json -Depth 4 -Compress",
+              "} finally { Remove-CimSession $s }"]
+    return "\n".join(lines)
+
+REMOTE_FIELDS = dict(collectors.BATCH_FIELDS, **{
+    "System Name": "name", "IP Address": "ip", "RAM": "ram", "OS Name": "os",
+})
+
+def parse_remote_snapshot(document):
+    snapshot = Snapshot()
+    for name, value in parse_batch(document, REMOTE_FIELDS).items():
+        snapshot.set(name, value)
+    snapshot.set("OS Status", collectors.read_status())
+    return snapshot
+
+# --------- PowerShell workers ---------
+# Starting powershell.exe (loading .NET and the CIM modules) costs far more
+# than opening a CIM session, so remote scripts run in long-lived workers
+# instead of one process per host. A worker reads one script per line on stdin
+# (base64 UTF-8), runs it and ends its output with a DONE_MARKER line carrying
+# "ok" or the error message. A worker that misses a deadline or is cancelled is
+# in the middle of a script, so it is killed rather than reused.
+DONE_MARKER = "#asset-info-done#"
+WORKER_SCRIPT = r"""
+while ($null -ne ($line = [Console]::In.ReadLine())) {
+    $status = 'ok'
+    try {
+        $script = [Text.Encoding]::UTF8.GetString([Convert]::FromBase64String($line))
+        & ([scriptblock]::Create($script)) | ForEach-Object { [Console]::Out.WriteLine([string]$_) }
+    } catch {
+        $status = 'error ' + ($_.Exception.Message -replace '\s+', ' ')
+    }
+    [Console]::Out.WriteLine('%s ' + $status)
+    [Console]::Out.Flush()
+}
+""" % DONE_MARKER
+WORKER_ARGS = [POWERSHELL_PATH, "-NoProfile", "-NonInteractive", "-Command", WORKER_SCRIPT]
+# Scripts one worker runs before it is replaced, so a leak in a provider cannot
+# grow a worker for the whole run
+MAX_WORKER_SCRIPTS = 500
+
+class PowerShellWorker:
+    def __init__(self, args=WORKER_ARGS):
+        self.proc = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        self.lines = queue.Queue()
+        self.scripts = 0
+        instrumentation.count_spawn()
+        threading.Thread(target=self.read, name="powershell-worker", daemon=True).start()
+
+    def read(self):
+        for line in iter(self.proc.stdout.readline, b""):
+            self.lines.put(line)
+        self.lines.put(None)
+
+    def run(self, script, timeout):
+        # (output, error or None); raises when the worker itself can no longer be used
+        deadline = time.monotonic() + timeout
+        self.scripts += 1
+        self.proc.stdin.write(base64.b64encode(script.encode("utf-8")) + b"\n")
+        self.proc.stdin.flush()
+        output = []
+        while True:
+            if scheduler.is_cancelled():
+                raise RuntimeError("Cancelled")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired("powershell", timeout)
+            try:
+                line = self.lines.get(timeout=min(remaining, 0.1))
+            except queue.Empty:
+                continue
+            if line is None:
+                raise RuntimeError(f"PowerShell worker exited: {b''.join(output[-5:]).decode(errors='ignore').strip()}")
+            text = line.decode("utf-8", errors="ignore").rstrip("\r\n")
+            if text.startswith(DONE_MARKER):
+                status = text[len(DONE_MARKER):].strip()
+                instrumentation.count_bytes(sum(map(len, output)))
+                return b"".join(output).decode("utf-8", errors="ignore"), None if status == "ok" else status[6:]
+            output.append(line)
+
+    def close(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+        self.proc.stdin.close()
+        self.proc.stdout.close()
+
+class PowerShellPool:
+    # Idle workers are handed to whichever host thread asks next; the pool grows
+    # to as many workers as scripts run at once (the fleet's --workers)
+    def __init__(self, args=WORKER_ARGS, max_scripts=MAX_WORKER_SCRIPTS):
+        self.args = args
+        self.max_scripts = max_scripts
+        self.idle = []
+        self.workers = set()
+        self.spawned = 0
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def run(self, script, timeout=None):
+        if timeout is None:
+            timeout = scheduler.remaining_time(120)
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("PowerShell pool is closed")
+            worker = self.idle.pop() if self.idle else None
+        if worker is None:
+            worker = PowerShellWorker(self.args)
+            with self.lock:
+                self.workers.add(worker)
+                self.spawned += 1
+        try:
+            output, error = worker.run(script, timeout)
+        except BaseException:
+            self.discard(worker)
+            raise
+        with self.lock:
+            reuse = not self.closed and worker.scripts < self.max_scripts
+            if reuse:
+                self.idle.append(worker)
+        if not reuse:
+            self.discard(worker)
+        if error is not None:
+            raise RuntimeError(error)
+        return output
+
+    def discard(self, worker):
+        with self.lock:
+            self.workers.discard(worker)
+        worker.close()
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            workers, self.workers, self.idle = list(self.workers), set(), []
+        for worker in workers:
+            worker.close()
+
+class CimSessionTransport(Transport):
+    # A WinRM CIM session per host, opened from a pool of long-lived local
+    # PowerShell workers (one per concurrent host, not one per host)
+    name = "cim"
+
+    def __init__(self, pool=None):
+        self.pool = pool or PowerShellPool()
+
+    def collect(self, host, timeout):
+        return parse_remote_snapshot(self.pool.run(build_remote_script(host, max(timeout - 5, 5))))
+
+    def close(self):
+        self.pool.close()
+
+TRANSPORTS = {"cim": CimSessionTransport, "local": LocalTransport}
+
+# --------- Engine ---------
+def collect_host(host, transport, timeout, retries, retry_delay, cancel_event):
+    start = time.monotonic()
+    attempts = 0
+    status, snapshot, error = STATUS_FAILED, None, ""
+    while attempts <= retries and not cancel_event.is_set():
+        attempts += 1
+        try:
+            snapshot = run_with_deadline(lambda: transport.collect(host, timeout), timeout, cancel_event)
+            if snapshot == CANCELLED:
+                status, snapshot, error = STATUS_CANCELLED, None, CANCELLED
+                break
+            status, error = STATUS_OK, ""
+            break
+        except subprocess.TimeoutExpired:
+            status, error = STATUS_TIMED_OUT, f"No answer within {timeout} s"
+        except Exception as e:
+            status, error = STATUS_FAILED, str(e).strip() or e.__class__.__name__
+        if attempts <= retries:
+            cancel_event.wait(retry_delay * attempts)
+    if cancel_event.is_set() and status != STATUS_OK:
+        status, error = STATUS_CANCELLED, CANCELLED
+    return {"host": host, "status": status, "attempts": attempts,
+            "elapsed": time.monotonic() - start, "snapshot": snapshot, "error": error}
+
+class FleetResults:
+    # Aggregates per-host results as they arrive
+    def __init__(self):
+        self.results = []
+        self.counts = {}
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+
+    def add(self, result):
+        with self.lock:
+            self.results.append(result)
+            self.counts[result["status"]] = self.counts.get(result["status"], 0) + 1
+
+    def succeeded(self):
+        return [r for r in self.results if r["status"] == STATUS_OK]
+
+    def failed(self):
+        return [r for r in self.results if r["status"] != STATUS_OK]
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        total = len(self.results)
+        counts = ", ".join(f"{status}: {count}" for status, count in sorted(self.counts.items()))
+        rate = total / elapsed if elapsed else 0.0
+        return f"{total} host(s) in {elapsed:.1f} s ({rate:.1f} hosts/s) - {counts or 'nothing collected'}"
+
+def result_record(result, display=False):
+    # Typed snapshot fields, or their display text (for CSV, or --display)
+    record = {"Host": result["host"], "Status": result["status"], "Attempts": result["attempts"],
+              "Elapsed": round(result["elapsed"], 3), "Error": result["error"]}
+    if result["snapshot"] is not None:
+        record.update(display_record(result["snapshot"]) if display else snapshot_record(result["snapshot"]))
+    return record
+
+def collect_fleet(hosts, transport, workers=32, timeout=120, retries=1, retry_delay=2.0,
+                  on_result=None, cancel_event=None):
+    cancel_event = cancel_event or threading.Event()
+    results = FleetResults()
+    hosts = list(dict.fromkeys(hosts))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(hosts) or 1)), thread_name_prefix="fleet") as executor:
+        futures = [executor.submit(collect_host, host, transport, timeout, retries, retry_delay, cancel_event)
+                   for host in hosts]
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                results.add(result)
+                if on_result:
+                    on_result(result)
+        except KeyboardInterrupt:
+            cancel_event.set()
+            for future in futures:
+                future.cancel()
+            raise
+    return results
+
+def read_hosts(path):
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        hosts = []
+        for line in stream:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                hosts.append(line)
+        return hosts
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect asset information from many hosts at once.")
+    parser.add_argument("--hosts", required=True, help="file with one host name per line ('-' for stdin)")
+    parser.add_argument("--transport", choices=sorted(TRANSPORTS), default="cim")
+    parser.add_argument("--workers", type=int, default=32, help="hosts collected at the same time (default: 32)")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds per host attempt (default: 120)")
+    parser.add_argument("--retries", type=int, default=1, help="extra attempts for a failed host (default: 1)")
+    parser.add_argument("--retry-delay", type=float, default=2.0)
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--output", "-o", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("--display", action="store_true",
+                        help="json/ndjson only: display text instead of typed values; csv always is")
+    args = parser.parse_args(argv)
+    display = args.display or args.format == "csv"
+
+    hosts = read_hosts(args.hosts)
+    writer = WRITERS[args.format]
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="")
+    header = [True]
+
+    def stream(result):
+        # CSV/NDJSON rows are written as each host finishes, so a long run loses nothing
+        if args.format != "json":
+            writer([result_record(result, display)], out, header=header[0], columns=FLEET_COLUMNS)
+            header[0] = False
+            out.flush()
+
+    transport = TRANSPORTS[args.transport]()
+    try:
+        results = collect_fleet(hosts, transport, args.workers, args.timeout,
+                                args.retries, args.retry_delay, on_result=stream)
+        if args.format == "json":
+            json.dump([result_record(r, display) for r in results.results], out, indent=2, ensure_ascii=False)
+            out.write("\n")
+    finally:
+        transport.close()
+        if out is not sys.stdout:
+            out.close()
+    print(results.summary(), file=sys.stderr)
+    return 0 if not results.failed() else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import os
+import time
+import tempfile
+from array import array
+from records import format_size
+from snapshot_archive import SnapshotArchive, ArchiveWriter, ARCHIVE_EXTENSION, HOST_COLUMNS, STRING, NULLS
+
+# Data side of the GUI's fleet browser. The browser shows a screenful of rows
+# over a snapshot archive; this keeps the display order (record numbers, after
+# filtering and sorting) and makes the text of only the rows on screen.
+# Sorting and filtering work on the archive's dictionary codes, so each
+# distinct string (a model, an OS name) is compared or matched once, not once
+# per host.
+
+# (heading, archive column, width in pixels)
+COLUMNS = [
+    ("System Name", "system_name", 150),
+    ("Model", "model", 170),
+    ("OS Name", "os_name", 150),
+    ("RAM", "ram_bytes", 80),
+    ("CPU", "cpu_name", 230),
+    ("IP Address", "ip_address", 110),
+    ("Collected At", "collected_at", 170),
+]
+TYPES = {name: typecode for name, typecode, _ in HOST_COLUMNS}
+FORMATS = {"ram_bytes": format_size}
+
+def open_fleet(path, stats=None):
+    # (archive, temporary path or None). A directory or snapshot file is packed
+    # into a temporary archive first, so every fleet is browsed the same way.
+    if os.path.isfile(path) and path.lower().endswith(ARCHIVE_EXTENSION):
+        return SnapshotArchive(path), None
+    from ingest import ingest
+    fd, temp = tempfile.mkstemp(suffix=ARCHIVE_EXTENSION)
+    os.close(fd)
+    try:
+        ArchiveWriter().add_all(ingest([path], stats)).write(temp)
+        return SnapshotArchive(temp), temp
+    except BaseException:
+        os.remove(temp)
+        raise
+
+class FleetTable:
+    def __init__(self, archive, temp=None, latest_only=True):
+        self.archive = archive
+        self.temp = temp
+        self.latest_only = latest_only
+        self.query = ""
+        self.sort_column = None
+        self.descending = False
+        self.texts = {}
+        self.ranks = {}
+        self.latest = None
+        self.order = array("I")
+        # Time the last refresh took, for the status line
+        self.elapsed = 0.0
+        self.refresh()
+
+    def __len__(self):
+        return len(self.order)
+
+    def column(self, name):
+        return self.archive.columns[f"hosts.{name}"]
+
+    def distinct(self, name):
+        # {code: case-folded text} of the distinct strings of a column, decoded once
+        if name not in self.texts:
+            string = self.archive.string
+            self.texts[name] = {code: (string(code) or "").casefold() for code in set(self.column(name))}
+        return self.texts[name]
+
+    def rank(self, name):
+        # Sort position of each distinct string of a column, by code
+        if name not in self.ranks:
+            texts = self.distinct(name)
+            self.ranks[name] = {code: rank for rank, code in enumerate(sorted(texts, key=texts.get))}
+        return self.ranks[name]
+
+    def records(self):
+        # Every record in name order, or only the latest snapshot of each host:
+        # the last of each run of a name in the name index (equal names have
+        # equal codes)
+        by_name = self.archive.by_name
+        if not self.latest_only:
+            return by_name
+        if self.latest is None:
+            names, last = self.column("system_name"), len(by_name) - 1
+            self.latest = array("I", (record for position, record in enumerate(by_name)
+                                      if position == last or names[by_name[position + 1]] != names[record]))
+        return self.latest
+
+    def refresh(self):
+        start = time.perf_counter()
+        records = self.records()
+        if self.query:
+            query = self.query.casefold()
+            matches = [(self.column(name), {code for code, text in self.distinct(name).items() if query in text})
+                       for _, name, _ in COLUMNS if TYPES[name] == STRING]
+            matches = [(column, codes) for column, codes in matches if codes]
+            records = [record for record in records if any(column[record] in codes for column, codes in matches)]
+        if self.sort_column is not None:
+            column = self.column(self.sort_column)
+            if TYPES[self.sort_column] == STRING:
+                rank = self.rank(self.sort_column)
+                key = lambda record: rank[column[record]]
+            else:
+                key = column.__getitem__
+            records = sorted(records, key=key, reverse=self.descending)
+        self.order = array("I", records)
+        self.elapsed = time.perf_counter() - start
+
+    def set_query(self, query):
+        self.query = query.strip()
+        self.refresh()
+
+    def set_latest_only(self, latest_only):
+        self.latest_only = latest_only
+        self.refresh()
+
+    def sort(self, name):
+        # Sorting again by the same column reverses the order
+        self.descending = not self.descending if name == self.sort_column else False
+        self.sort_column = name
+        self.refresh()
+
+    def record(self, position):
+        return self.order[position]
+
+    def position(self, record):
+        # Display position of a record, or None when it is filtered out
+        try:
+            return self.order.index(record)
+        except ValueError:
+            return None
+
+    def row(self, position):
+        record = self.order[position]
+        values = []
+        for _, name, _ in COLUMNS:
+            value = self.column(name)[record]
+            if TYPES[name] == STRING:
+                values.append(self.archive.string(value) or "")
+            else:
+                value = None if value == NULLS[TYPES[name]] else value
+                values.append(FORMATS[name](value) if name in FORMATS else "" if value is None else value)
+        return values
+
+    def snapshot(self, position):
+        return self.archive[self.order[position]]
+
+    def close(self):
+        self.archive.close()
+        if self.temp:
+            os.remove(self.temp)
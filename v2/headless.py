@@ -0,0 +1,132 @@
+import os
+import sys
+import csv
+import json
+import argparse
+import datetime
+from collectors import collect_snapshot, FIELD_ORDER
+from records import render_info, TABLE_FIELDS
+from instrumentation import RunMetrics, profile_call
+import backends
+
+# Headless entry point: collects a snapshot and writes it as JSON, CSV or NDJSON.
+# Must not import tkinter or reportlab, so it runs from login scripts, scheduled
+# tasks and remote shells. JSON/NDJSON records are typed (Snapshot.to_dict()),
+# the form the store, diffs and fleet rollups read back; CSV is display text.
+FORMATS = ("json", "csv", "ndjson")
+COLUMNS = ["Collected At"] + FIELD_ORDER
+
+def stamp(snapshot, collected_at=None):
+    # Sets the collection time (now, unless given) of a snapshot that has none
+    if snapshot.collected_at is None:
+        collected_at = collected_at or datetime.datetime.now(datetime.timezone.utc)
+        snapshot.collected_at = collected_at.isoformat(timespec="seconds")
+    return snapshot
+
+def snapshot_record(snapshot, collected_at=None):
+    # Typed record, as stored and exchanged
+    return stamp(snapshot, collected_at).to_dict()
+
+def display_record(snapshot, collected_at=None):
+    # Display text, as the GUI shows it
+    record = {"Collected At": stamp(snapshot, collected_at).collected_at}
+    record.update(render_info(snapshot))
+    for name in TABLE_FIELDS:
+        record[name] = [list(row) for row in record[name]]
+    return record
+
+def flatten_record(record):
+    # One spreadsheet-friendly line per machine
+    row = dict(record)
+    for name in TABLE_FIELDS:
+        row[name] = "; ".join(" | ".join(str(part) for part in item) for item in record.get(name, []))
+    row["Monitor Details"] = str(record.get("Monitor Details", "")).replace("\n\n", "; ").replace("\n", ", ")
+    return row
+
+def write_json(records, out, header=True, columns=COLUMNS):
+    json.dump(records[0] if len(records) == 1 else records, out, indent=2, ensure_ascii=False)
+    out.write("\n")
+
+def write_ndjson(records, out, header=True, columns=COLUMNS):
+    for record in records:
+        out.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+def write_csv(records, out, header=True, columns=COLUMNS):
+    writer = csv.DictWriter(out, fieldnames=columns, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    for record in records:
+        writer.writerow(flatten_record(record))
+
+WRITERS = {"json": write_json, "csv": write_csv, "ndjson": write_ndjson}
+
+def write_records(records, fmt, output="-", append=False, columns=COLUMNS):
+    writer = WRITERS[fmt]
+    if output == "-":
+        writer(records, sys.stdout, columns=columns)
+        return
+    # Appending lets many machines add to one shared CSV/NDJSON file
+    header = not (append and os.path.exists(output) and os.path.getsize(output) > 0)
+    with open(output, "a" if append else "w", encoding="utf-8", newline="") as out:
+        writer(records, out, header=header, columns=columns)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Collect system asset information without a window.")
+    parser.add_argument("--format", choices=FORMATS, default="json", help="output format (default: json)")
+    parser.add_argument("--output", "-o", default="-", help="output file, '-' for stdout (default)")
+    parser.add_argument("--append", action="store_true", help="append to the output file instead of replacing it")
+    parser.add_argument("--store", nargs="?", const="", metavar="DB",
+                        help="also record the snapshot in the local history database (default location if DB is omitted)")
+    parser.add_argument("--display", action="store_true",
+                        help="json/ndjson only: display text (\"16.00 GB\") instead of typed values; csv always is")
+    # Typed values used to need --raw; they are the default now
+    parser.add_argument("--raw", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--diagnostics", action="store_true",
+                        help="add per-probe wall time, spawns, bytes parsed and failures (json/ndjson: a Diagnostics key; csv: stderr)")
+    parser.add_argument("--backend", choices=("auto",) + tuple(backends.BACKENDS), default=None,
+                        help=f"where WMI facts come from (default: ${backends.BACKEND_ENV} or auto: in-process WMI, else PowerShell)")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="write a cProfile report to PATH and sampled stacks of all threads to PATH.collapsed")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        return profile_call(lambda: run(args), args.profile)
+    return run(args)
+
+def run(args):
+    if args.output == "-" and sys.stdout is None:
+        # The windowed EXE has no console; the -cli EXE or --output FILE does
+        print("No console to write to: pass --output FILE, or run Asset_Info-v2-cli.exe", file=sys.stderr)
+        return 2
+    if args.append and args.format == "json":
+        print("--append needs --format csv or ndjson", file=sys.stderr)
+        return 2
+    if args.backend:
+        try:
+            backends.set_backend(backends.select_backend(args.backend))
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            return 2
+    metrics = RunMetrics()
+    snapshot = collect_snapshot(metrics=metrics)
+    metrics.finish()
+    if args.display or args.format == "csv":
+        output = display_record(snapshot)
+    else:
+        output = snapshot_record(snapshot)
+    if args.diagnostics:
+        if args.format == "csv":
+            print(metrics.format_table(), file=sys.stderr)
+        else:
+            output = dict(output, Diagnostics=metrics.to_dict())
+    write_records([output], args.format, args.output, args.append)
+    if args.store is not None:
+        from snapshot_store import SnapshotStore
+        with SnapshotStore(args.store or None) as store:
+            store.add(snapshot)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from records import FIELD_ATTRS, TABLE_FIELDS, render_field
+from snapshot_files import iter_snapshot_paths, iter_records, load_snapshot
+from snapshot_store import utc_timestamp
+
+# Streaming ingestion of snapshot files from a whole fleet. Records are read
+# line by line, validated and loaded as typed snapshots (records.Snapshot), then
+# fed to every stage (store, diff, tally, per-host PDFs, NDJSON out) through
+# small bounded queues: a slow stage makes the reader wait instead of letting
+# records pile up, so memory stays flat however large the input is.
+#
+#   python ingest.py fleet/*.ndjson --store --diff changes.ndjson --pdf-dir reports
+MAX_LINE_BYTES = 1 << 20
+MAX_JSON_BYTES = 64 << 20
+QUEUE_SIZE = 2000
+CHUNK_SIZE = 200
+MAX_EXAMPLES = 20
+
+class IngestStats:
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.records = 0
+        self.skipped = 0
+        self.invalid = 0
+        # The first few problems, for the report; the rest are only counted
+        self.examples = []
+        self.started = time.monotonic()
+
+    def reject(self, path, line, reason):
+        self.invalid += 1
+        if len(self.examples) < MAX_EXAMPLES:
+            self.examples.append((path, line, reason))
+
+    def summary(self):
+        elapsed = time.monotonic() - self.started
+        rate = self.records / elapsed if elapsed else 0.0
+        mib = self.bytes / (1 << 20)
+        return (f"{self.records} snapshot(s) from {self.files} file(s), {mib:.1f} MiB in {elapsed:.1f} s "
+                f"({rate:.0f}/s); {self.invalid} invalid, {self.skipped} without a snapshot")
+
+def read_lines(path, max_line_bytes=MAX_LINE_BYTES):
+    # (line number, bytes); a line longer than max_line_bytes comes back as
+    # None and is skipped without ever being held in memory whole
+    with open(path, "rb") as f:
+        number = 0
+        while True:
+            line = f.readline(max_line_bytes + 1)
+            if not line:
+                return
+            number += 1
+            if len(line) > max_line_bytes:
+                while line and not line.endswith(b"\n"):
+                    line = f.readline(max_line_bytes)
+                yield number, None
+                continue
+            yield number, line
+
+def validate_record(record):
+    # Why a record cannot be used, or None
+    if not isinstance(record, dict):
+        return "not a JSON object"
+    name = record.get("System Name")
+    if not isinstance(name, str) or not name.strip():
+        return "System Name is missing or empty"
+    for table in TABLE_FIELDS:
+        rows = record.get(table)
+        if rows is not None and not (isinstance(rows, list) and all(isinstance(r, (list, dict)) for r in rows)):
+            return f"{table} is not a list of rows"
+    if record.get("Collected At"):
+        try:
+            utc_timestamp(record["Collected At"])
+        except (TypeError, ValueError):
+            return f"Collected At is not a timestamp: {record['Collected At']!r}"
+    return None
+
+def read_records(path, stats, max_line_bytes=MAX_LINE_BYTES):
+    # (line number, parsed JSON) for every line that parses
+    if not path.lower().endswith(".json"):
+        for number, line in read_lines(path, max_line_bytes):
+            if line is None:
+                stats.reject(path, number, f"line longer than {max_line_bytes} bytes")
+                continue
+            stats.bytes += len(line)
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                stats.reject(path, number, f"not JSON: {e}")
+        return
+    # A .json file is one document; a big fleet belongs in NDJSON
+    size = os.path.getsize(path)
+    if size > MAX_JSON_BYTES:
+        stats.reject(path, 0, f".json file of {size} bytes is too large to load; write NDJSON instead")
+        return
+    stats.bytes += size
+    try:
+        yield from enumerate(iter_records(path), 1)
+    except ValueError as e:
+        stats.reject(path, 0, f"not JSON: {e}")
+
+def ingest(paths, stats=None, max_line_bytes=MAX_LINE_BYTES, normalize=load_snapshot):
+    # Valid snapshots from files/directories, as records.Snapshot (or whatever
+    # `normalize` makes of each record)
+    stats = stats or IngestStats()
+    for path in iter_snapshot_paths(paths):
+        stats.files += 1
+        for number, record in read_records(path, stats, max_line_bytes):
+            # Fleet records for hosts that could not be reached carry no snapshot
+            if isinstance(record, dict) and "System Name" not in record and "Host" in record:
+                stats.skipped += 1
+                continue
+            reason = validate_record(record)
+            if reason is None:
+                try:
+                    snapshot = normalize(record)
+                except (TypeError, ValueError, KeyError, AttributeError) as e:
+                    reason = f"cannot normalize: {e}"
+            if reason is not None:
+                stats.reject(path, number, reason)
+                continue
+            stats.records += 1
+            yield snapshot
+
+# --------- Fan-out with backpressure ---------
+_DONE = object()
+
+def fan_out(records, stages, queue_size=QUEUE_SIZE, chunk_size=CHUNK_SIZE):
+    # Feed every record to every stage. stages: {name: fn(iterable) -> result},
+    # each run on its own thread. At most about queue_size records wait per
+    # stage; the reader blocks on a full queue. If a stage fails, reading
+    # stops and its exception is raised once the other stages have finished.
+    # Returns {name: result}.
+    queues = {name: queue.Queue(max(1, queue_size // chunk_size)) for name in stages}
+    results, errors = {}, {}
+    failed = threading.Event()
+
+    def run(name, stage):
+        chunks = queues[name]
+        done = []
+
+        def drain():
+            while True:
+                chunk = chunks.get()
+                if chunk is _DONE:
+                    done.append(True)
+                    return
+                yield from chunk
+
+        try:
+            results[name] = stage(drain())
+        except BaseException as e:
+            errors[name] = e
+            failed.set()
+        # Keep the reader from blocking on a stage that stopped reading early
+        while not done and chunks.get() is not _DONE:
+            pass
+
+    threads = [threading.Thread(target=run, args=item, name=f"ingest-{item[0]}", daemon=True)
+               for item in stages.items()]
+    for thread in threads:
+        thread.start()
+    try:
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                if failed.is_set():
+                    break
+                for chunks in queues.values():
+                    chunks.put(chunk)
+                chunk = []
+        if chunk and not failed.is_set():
+            for chunks in queues.values():
+                chunks.put(chunk)
+    finally:
+        for chunks in queues.values():
+            chunks.put(_DONE)
+        for thread in threads:
+            thread.join()
+    for name, error in errors.items():
+        raise RuntimeError(f"stage {name!r} failed: {error}") from error
+    return results
+
+# --------- Stages ---------
+def store_stage(db=None):
+    def stage(snapshots):
+        from snapshot_store import SnapshotStore
+        with SnapshotStore(db) as store:
+            return sum(1 for _ in store.iter_add(snapshots))
+    return stage
+
+def diff_stage(output):
+    # Changes between consecutive snapshots of each host, as NDJSON
+    def stage(snapshots):
+        from snapshot_diff import diff_stream
+        count = 0
+        with open_output(output) as out:
+            for count, delta in enumerate(diff_stream(snapshots), 1):
+                out.write(json.dumps(delta, ensure_ascii=False) + "\n")
+        return count
+    return stage
+
+def tally_stage(fields):
+    # {field: Counter of display values}, e.g. how many hosts run each OS
+    def stage(snapshots):
+        tallies = {name: Counter() for name in fields}
+        for snapshot in snapshots:
+            for name, counter in tallies.items():
+                counter[str(render_field(name, snapshot.get(name)))] += 1
+        return tallies
+    return stage
+
+def pdf_stage(out_dir, workers=None):
+    def stage(snapshots):
+        from bulk_report import iter_render_per_host
+        failures = [(path, error) for path, error in iter_render_per_host(snapshots, out_dir, workers) if error]
+        return failures
+    return stage
+
+def ndjson_stage(output):
+    # The validated snapshots, typed
+    def stage(snapshots):
+        count = 0
+        with open_output(output) as out:
+            for count, snapshot in enumerate(snapshots, 1):
+                out.write(json.dumps(snapshot.to_dict(), ensure_ascii=False) + "\n")
+        return count
+    return stage
+
+@contextmanager
+def open_output(path):
+    if path == "-":
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        yield out
+
+def peak_memory_mib():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream snapshot files (NDJSON/JSON) through validation into "
+                                                 "the store, diffs, tallies and per-host PDFs in bounded memory.")
+    parser.add_argument("inputs", nargs="+", help="snapshot files or directories of them")
+    parser.add_argument("--store", nargs="?", const="", metavar="DB", help="add the snapshots to the history database")
+    parser.add_argument("--diff", metavar="OUT", help="write changes between consecutive snapshots of each host (NDJSON)")
+    parser.add_argument("--tally", action="append", metavar="FIELD", choices=list(FIELD_ATTRS),
+                        help="count hosts per value of FIELD (repeatable)")
+    parser.add_argument("--pdf-dir", help="render one PDF per snapshot into this directory")
+    parser.add_argument("--workers", type=int, default=None, help="PDF render processes (default: one per CPU)")
+    parser.add_argument("--output", "-o", help="write the validated snapshots as NDJSON ('-' for stdout)")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help=f"records buffered per stage (default: {QUEUE_SIZE})")
+    parser.add_argument("--max-line-bytes", type=int, default=MAX_LINE_BYTES,
+                        help=f"skip NDJSON lines longer than this (default: {MAX_LINE_BYTES})")
+    args = parser.parse_args(argv)
+
+    stages = {}
+    if args.store is not None:
+        stages["store"] = store_stage(args.store or None)
+    if args.diff:
+        stages["diff"] = diff_stage(args.diff)
+    if args.tally:
+        stages["tally"] = tally_stage(args.tally)
+    if args.pdf_dir:
+        stages["pdf"] = pdf_stage(args.pdf_dir, args.workers)
+    if args.output:
+        stages["ndjson"] = ndjson_stage(args.output)
+
+    stats = IngestStats()
+    # With no stage, the input is only validated
+    results = fan_out(ingest(args.inputs, stats, args.max_line_bytes), stages, args.queue_size)
+    print(stats.summary(), file=sys.stderr)
+    for path, line, reason in stats.examples:
+        print(f"INVALID {path}:{line}: {reason}", file=sys.stderr)
+    if stats.invalid > len(stats.examples):
+        print(f"... and {stats.invalid - len(stats.examples)} more invalid record(s)", file=sys.stderr)
+    if "store" in results:
+        print(f"stored     {results['store']} snapshot(s)", file=sys.stderr)
+    if "diff" in results:
+        print(f"diff       {results['diff']} change record(s) -> {args.diff}", file=sys.stderr)
+    for name, counter in results.get("tally", {}).items():
+        print(f"\n{name}", file=sys.stderr)
+        for value, count in counter.most_common():
+            print(f"  {count:8d}  {value}", file=sys.stderr)
+    failures = results.get("pdf", [])
+    for path, error in failures:
+        print(f"FAILED {path}: {error}", file=sys.stderr)
+    peak = peak_memory_mib()
+    if peak is not None:
+        print(f"peak memory {peak:.0f} MiB", file=sys.stderr)
+    return 1 if failures or stats.invalid else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
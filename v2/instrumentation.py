@@ -0,0 +1,212 @@
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+
+# Per-run instrumentation: wall time, PowerShell spawns, bytes of output parsed
+# and failures for every probe of a collection (and for PDF exports).
+# The probe being measured on the current thread is kept in a thread-local,
+# so run_powershell() deep inside a probe can charge its spawn to it.
+_local = threading.local()
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+
+class ProbeStats:
+    __slots__ = ("name", "parent", "wall", "spawns", "bytes", "failures", "status")
+
+    def __init__(self, name, parent=None):
+        self.name = name
+        self.parent = parent
+        self.wall = 0.0
+        self.spawns = 0
+        self.bytes = 0
+        self.failures = 0
+        self.status = ""
+
+    def to_dict(self):
+        return {
+            "Probe": self.name,
+            "Parent": self.parent,
+            "Status": self.status,
+            "Wall Time (ms)": round(self.wall * 1000, 1),
+            "Spawns": self.spawns,
+            "Bytes": self.bytes,
+            "Failures": self.failures,
+        }
+
+class RunMetrics:
+    def __init__(self, label="Collection"):
+        self.label = label
+        self.lock = threading.Lock()
+        self.probes = {}
+        self.started = time.perf_counter()
+        self.wall = None
+
+    def stats(self, name, parent=None):
+        with self.lock:
+            if name not in self.probes:
+                self.probes[name] = ProbeStats(name, parent)
+            return self.probes[name]
+
+    @contextmanager
+    def probe(self, name, parent=None):
+        stats = self.stats(name, parent)
+        previous = getattr(_local, "current", None)
+        _local.current = (self, stats)
+        start = time.perf_counter()
+        try:
+            yield stats
+        except Exception:
+            self.mark(name, STATUS_FAILED)
+            raise
+        finally:
+            with self.lock:
+                stats.wall += time.perf_counter() - start
+                stats.status = stats.status or STATUS_OK
+            _local.current = previous
+
+    def wrap(self, name, fn, failures=None, parent=None):
+        # fn run under probe(name); failures(result) counts failed fields in its result
+        def measured():
+            with self.probe(name, parent) as stats:
+                result = fn()
+                failed = failures(result) if failures else 0
+                if failed:
+                    with self.lock:
+                        stats.failures += failed
+                        stats.status = STATUS_FAILED
+                return result
+        return measured
+
+    def mark(self, name, status, failed=True):
+        stats = self.stats(name)
+        with self.lock:
+            stats.status = status
+            stats.failures += 1 if failed else 0
+
+    def add(self, name, seconds, failed=False, parent=None):
+        # A timing measured elsewhere (e.g. inside the PowerShell batch)
+        stats = self.stats(name, parent)
+        with self.lock:
+            stats.wall += seconds
+            stats.failures += 1 if failed else 0
+            stats.status = STATUS_FAILED if failed else stats.status or STATUS_OK
+
+    def finish(self):
+        self.wall = time.perf_counter() - self.started
+        return self
+
+    def totals(self):
+        # Each spawn is charged to exactly one probe, but a failed field shows up
+        # in its top-level probe and again in the nested one it came from
+        with self.lock:
+            probes = list(self.probes.values())
+        return {
+            "Spawns": sum(p.spawns for p in probes),
+            "Bytes": sum(p.bytes for p in probes),
+            "Failures": sum(p.failures for p in probes if p.parent is None),
+        }
+
+    def to_dict(self):
+        wall = self.wall if self.wall is not None else time.perf_counter() - self.started
+        with self.lock:
+            probes = [p.to_dict() for p in self.probes.values()]
+        return dict({"Run": self.label, "Wall Time (ms)": round(wall * 1000, 1)}, **self.totals(), Probes=probes)
+
+    def format_table(self):
+        data = self.to_dict()
+        lines = [f"{data['Run']}: {data['Wall Time (ms)']:.1f} ms, {data['Spawns']} spawn(s), "
+                 f"{data['Bytes']} byte(s), {data['Failures']} failure(s)",
+                 f"  {'Probe':<28} {'Status':<10} {'Wall ms':>9} {'Spawns':>6} {'Bytes':>9} {'Failures':>8}"]
+        for p in data["Probes"]:
+            name = f"  {p['Probe']}" if p["Parent"] else p["Probe"]
+            lines.append(f"  {name:<28} {p['Status']:<10} {p['Wall Time (ms)']:>9.1f} "
+                         f"{p['Spawns']:>6} {p['Bytes']:>9} {p['Failures']:>8}")
+        return "\n".join(lines)
+
+def current_run():
+    current = getattr(_local, "current", None)
+    return current[0] if current else None
+
+def count_spawn():
+    current = getattr(_local, "current", None)
+    if current:
+        with current[0].lock:
+            current[1].spawns += 1
+
+def count_bytes(size):
+    current = getattr(_local, "current", None)
+    if current:
+        with current[0].lock:
+            current[1].bytes += size
+
+# --------- Profiling ---------
+# --profile PATH writes PATH (cProfile stats of the main thread; open with
+# pstats or snakeviz) and PATH.collapsed (sampled stacks of every thread, one
+# "frame;frame;frame count" line each, for flamegraph.pl or speedscope).
+# The sampler is needed because cProfile only sees the thread it was enabled on,
+# and the probes run on worker threads.
+SAMPLE_INTERVAL = 0.005
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class StackSampler(threading.Thread):
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name="stack-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = {}
+        self.stopped = threading.Event()
+
+    def run(self):
+        names = {}
+        while not self.stopped.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for ident, frame in sys._current_frames().items():
+                if ident == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame))
+                    frame = frame.f_back
+                key = ";".join([names.get(ident, str(ident))] + stack[::-1])
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def write_collapsed(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+def profile_call(fn, path, top=25):
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    sampler = StackSampler()
+    sampler.start()
+    profiler.enable()
+    try:
+        return fn()
+    finally:
+        profiler.disable()
+        sampler.stop()
+        profiler.dump_stats(path)
+        sampler.write_collapsed(path + ".collapsed")
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(top)
+        print(f"profile written to {path} and {path}.collapsed", file=sys.stderr)
+
+def profile_path(argv):
+    # Value of --profile PATH / --profile=PATH in argv, or None
+    for i, arg in enumerate(argv):
+        if arg == "--profile" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("--profile="):
+            return arg.split("=", 1)[1]
+    return None
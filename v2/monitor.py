@@ -0,0 +1,203 @@
+import time
+import threading
+from array import array
+from datetime import datetime, timezone
+
+# Live resource monitoring: a background thread samples CPU (per core), memory,
+# disk I/O and network counters through psutil at a fixed rate into ring
+# buffers of a fixed size, so a capture of any length uses the same memory.
+# The GUI draws sparklines from the buffers; a capture (the buffers as plain
+# data) goes into the PDF report. A sample is four counter reads from the OS;
+# the thread measures its own CPU time, so the cost can be checked
+# (Sampler.overhead) rather than assumed.
+RATES_HZ = (1, 2, 5, 10)
+DEFAULT_RATE_HZ = 10
+DEFAULT_WINDOW_S = 60
+PERCENT = "%"
+BYTES_PER_S = "B/s"
+
+class RingBuffer:
+    # The last `size` floats appended, oldest first
+    def __init__(self, size):
+        self.data = array("d", bytes(8 * size))
+        self.size = size
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def last(self):
+        return self.data[self.head - 1] if self.count else None
+
+    def values(self):
+        if self.count < self.size:
+            return self.data[:self.count]
+        return self.data[self.head:] + self.data[:self.head]
+
+class Series:
+    def __init__(self, name, unit, size):
+        self.name = name
+        self.unit = unit
+        self.buffer = RingBuffer(size)
+
+def format_rate(value):
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB/s"
+
+def format_value(value, unit):
+    return f"{value:.1f} %" if unit == PERCENT else format_rate(value)
+
+def sparkline_points(values, width, height, unit=PERCENT):
+    # [(x, y)] for a sparkline of `values` in a width x height box, y measured
+    # up from the bottom. Percentages use a fixed 0-100 scale, rates scale to
+    # the window's peak. More values than pixels are thinned to about one per
+    # pixel, keeping the newest.
+    count = len(values)
+    if count > width:
+        stride = -(-count // int(width))
+        values = values[(count - 1) % stride::stride]
+        count = len(values)
+    top = 100.0 if unit == PERCENT else max(max(values, default=0.0), 1.0)
+    x_step = width / (count - 1) if count > 1 else 0
+    return [(i * x_step, min(value, top) * height / top) for i, value in enumerate(values)]
+
+class Sampler:
+    def __init__(self, rate_hz=DEFAULT_RATE_HZ, window_s=DEFAULT_WINDOW_S, psutil=None):
+        if psutil is None:
+            import psutil
+        self.psutil = psutil
+        self.interval = 1.0 / rate_hz
+        self.size = max(2, int(rate_hz * window_s))
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.started_at = None
+        self.samples = 0
+        self.cpu_seconds = 0.0
+        self.elapsed = 0.0
+        # cpu_percent() reports usage since its previous call; this first call
+        # only sets the starting point
+        cores = psutil.cpu_percent(percpu=True)
+        self.times = RingBuffer(self.size)
+        self.cpu = Series("CPU", PERCENT, self.size)
+        self.cores = [Series(f"CPU {n}", PERCENT, self.size) for n in range(len(cores))]
+        self.memory = Series("Memory", PERCENT, self.size)
+        self.counters = self.read_counters()
+        self.counter_time = time.monotonic()
+        self.rates = [Series(name, BYTES_PER_S, self.size) for name in self.counters]
+
+    def read_counters(self):
+        # {series name: cumulative bytes}; disk counters are missing on some
+        # virtual machines and containers. sample() handles counters that wrap,
+        # so psutil's own wrap tracking (nowrap) is skipped.
+        counters = {}
+        disk = self.psutil.disk_io_counters(nowrap=False)
+        if disk is not None:
+            counters["Disk Read"] = disk.read_bytes
+            counters["Disk Write"] = disk.write_bytes
+        net = self.psutil.net_io_counters(nowrap=False)
+        if net is not None:
+            counters["Net Sent"] = net.bytes_sent
+            counters["Net Received"] = net.bytes_recv
+        return counters
+
+    def series(self):
+        return [self.cpu, self.memory] + self.rates + self.cores
+
+    def sample(self):
+        cores = self.psutil.cpu_percent(percpu=True)
+        memory = self.psutil.virtual_memory().percent
+        counters = self.read_counters()
+        now = time.monotonic()
+        elapsed = now - self.counter_time
+        with self.lock:
+            self.times.append(now)
+            self.cpu.buffer.append(sum(cores) / len(cores) if cores else 0.0)
+            for series, value in zip(self.cores, cores):
+                series.buffer.append(value)
+            self.memory.buffer.append(memory)
+            for series in self.rates:
+                # A counter that went backwards (wrapped or reset) counts as idle
+                delta = counters.get(series.name, 0) - self.counters.get(series.name, 0)
+                series.buffer.append(delta / elapsed if delta > 0 and elapsed > 0 else 0.0)
+            self.samples += 1
+        self.counters = counters
+        self.counter_time = now
+
+    def run(self):
+        # A restart (stop, then start) carries on with the same buffers
+        start = time.monotonic() - self.elapsed
+        cpu_start = time.thread_time() - self.cpu_seconds
+        # ...but the first rates and CPU figures do not span the pause
+        self.psutil.cpu_percent(percpu=True)
+        self.counters = self.read_counters()
+        self.counter_time = time.monotonic()
+        next_time = self.counter_time + self.interval
+        while not self.stop_event.wait(max(next_time - time.monotonic(), 0)):
+            self.sample()
+            self.cpu_seconds = time.thread_time() - cpu_start
+            self.elapsed = time.monotonic() - start
+            # After a stall, carry on from now instead of sampling in a burst
+            next_time = max(next_time + self.interval, time.monotonic())
+
+    def start(self):
+        if self.thread is None:
+            self.started_at = self.started_at or datetime.now(timezone.utc).isoformat(timespec="seconds")
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.run, name="monitor", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join(timeout=2)
+            self.thread = None
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    @property
+    def overhead(self):
+        # CPU time of the sampling thread, as a percentage of one core
+        return self.cpu_seconds * 100 / self.elapsed if self.elapsed else 0.0
+
+    def values(self, series):
+        # One series, oldest first (a copy, taken between samples)
+        with self.lock:
+            return series.buffer.values()
+
+    def latest(self, series):
+        with self.lock:
+            return [s.buffer.last() for s in series]
+
+    def capture(self):
+        # The captured window as plain data (for the report and JSON)
+        with self.lock:
+            times = self.times.values()
+            series = [(s, s.buffer.values()) for s in self.series()]
+        rows = []
+        for s, values in series:
+            row = {"Name": s.name, "Unit": s.unit, "Values": [round(v, 2) for v in values]}
+            if values:
+                row.update(Min=min(values), Average=sum(values) / len(values), Max=max(values))
+            rows.append(row)
+        return {
+            "Started At": self.started_at,
+            "Rate (Hz)": round(1 / self.interval, 2),
+            "Samples": len(times),
+            "Duration (s)": round(times[-1] - times[0], 1) if len(times) > 1 else 0.0,
+            "Sampler CPU (%)": round(self.overhead, 3),
+            "Series": rows,
+        }
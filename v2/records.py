@@ -0,0 +1,307 @@
+from scheduler import TIMED_OUT, CANCELLED
+
+# Typed snapshot model. Probes fill these records with raw values (byte counts,
+# media types, monitor IDs) and failures are kept as FieldError per field;
+# the display strings the UI, CSV and PDF show are made only by the render_*
+# functions below.
+#
+# Records use __slots__ on a small base class rather than
+# dataclass(slots=True), which needs Python 3.10 (we support 3.8).
+
+STATUS_ERROR = "error"
+STATUS_TIMED_OUT = "timed out"
+STATUS_CANCELLED = "cancelled"
+
+GIB = 1024 ** 3
+
+class Record:
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.__slots__)} values")
+        values = dict(zip(self.__slots__, args))
+        for name, value in kwargs.items():
+            if name not in self.__slots__ or name in values:
+                raise TypeError(f"{type(self).__name__}: unexpected or repeated field {name!r}")
+            values[name] = value
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    def astuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.astuple() == other.astuple()
+
+    def __hash__(self):
+        return hash((type(self).__name__,) + self.astuple())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+class Disk(Record):
+    __slots__ = ("model", "size_bytes", "media_type")
+
+class Monitor(Record):
+    # manufacturer: PnP ID (e.g. "HPN"); product: the user-friendly model name.
+    # week/year of manufacture and physical size are known only when the
+    # monitor was read from its EDID (edid.py)
+    __slots__ = ("manufacturer", "product", "product_code", "serial", "week", "year", "width_cm", "height_cm")
+
+class Adapter(Record):
+    # One network interface as the OS reports it. ipv4/ipv6: lists of
+    # addresses; speed_mbps is None when the driver does not report it.
+    __slots__ = ("name", "ipv4", "ipv6", "mac", "speed_mbps", "is_up")
+
+class Cpu(Record):
+    __slots__ = ("name", "max_clock_mhz", "cores", "logical_processors")
+
+class FieldError(Record):
+    __slots__ = ("status", "message")
+
+    @classmethod
+    def from_exception(cls, exc):
+        return cls(STATUS_ERROR, str(exc).strip() or exc.__class__.__name__)
+
+# gather_info() field -> Snapshot attribute
+FIELD_ATTRS = {
+    "System Name": "system_name",
+    "IP Address": "ip_address",
+    "Network Adapters": "adapters",
+    "RAM": "ram_bytes",
+    "CPU Model Name": "model",
+    "CPU Details": "cpu",
+    "Serial Number": "serial_number",
+    "Product Key": "product_key",
+    "Monitor Details": "monitors",
+    "Disks": "disks",
+    "OS Name": "os_name",
+    "OS Status": "os_status",
+}
+# Secrets: kept in memory for the running process, never written to the
+# cache file, the history database or archives
+UNPERSISTED_FIELDS = ("Product Key",)
+
+class Snapshot(Record):
+    # One machine at one point in time. A field that could not be collected is
+    # None here and has its FieldError in `errors`.
+    __slots__ = tuple(FIELD_ATTRS.values()) + ("collected_at", "errors")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.errors is None:
+            self.errors = {}
+
+    def get(self, name):
+        return self.errors.get(name) or getattr(self, FIELD_ATTRS[name])
+
+    def set(self, name, value):
+        if isinstance(value, FieldError):
+            self.errors[name] = value
+            value = None
+        else:
+            self.errors.pop(name, None)
+        setattr(self, FIELD_ATTRS[name], value)
+
+    def to_dict(self):
+        # JSON-ready raw form, keyed like gather_info()
+        record = {"Collected At": self.collected_at} if self.collected_at else {}
+        for name, attr in FIELD_ATTRS.items():
+            value = getattr(self, attr)
+            if isinstance(value, list):
+                value = [item.to_dict() for item in value]
+            elif isinstance(value, Record):
+                value = value.to_dict()
+            record[name] = value
+        if self.errors:
+            record["Errors"] = {name: error.to_dict() for name, error in self.errors.items()}
+        return record
+
+    @classmethod
+    def from_dict(cls, record):
+        snapshot = cls(collected_at=record.get("Collected At"))
+        item_types = {"Monitor Details": Monitor, "Disks": Disk, "CPU Details": Cpu, "Network Adapters": Adapter}
+        for name in FIELD_ATTRS:
+            value = record.get(name)
+            item_type = item_types.get(name)
+            if item_type and isinstance(value, list):
+                value = [item_type(**item) for item in value]
+            elif item_type and isinstance(value, dict):
+                value = item_type(**value)
+            snapshot.set(name, value)
+        for name, error in (record.get("Errors") or {}).items():
+            snapshot.set(name, FieldError(**error))
+        return snapshot
+
+def probe_status(value):
+    # Scheduler results for probes that never produced a value
+    if value == TIMED_OUT:
+        return FieldError(STATUS_TIMED_OUT, TIMED_OUT)
+    if value == CANCELLED:
+        return FieldError(STATUS_CANCELLED, CANCELLED)
+    return value
+
+# --------- Rendering ---------
+# Fields rendered as a list of rows (tuples of text), with their column headers
+TABLE_FIELDS = {
+    "Disks": ("Model", "Size", "Type"),
+    "Network Adapters": ("Adapter", "IPv4", "IPv6", "MAC", "Speed", "State"),
+}
+
+# Fallback text for failed fields that have never shown "Error: ..."
+ERROR_TEXT = {"IP Address": "N/A", "CPU Model Name": "Unknown Model"}
+
+# Plain-value text for a missing (None / empty) value
+EMPTY_TEXT = {
+    "System Name": "Unknown", "IP Address": "N/A", "CPU Model Name": "Unknown Model",
+    "Product Key": "Not Found", "OS Name": "Unknown",
+}
+
+def format_size(size):
+    if size is not None and str(size).isdigit():
+        return f"{int(size) / GIB:.2f} GB"
+    return "Unknown Size"
+
+def format_cpu(cpu):
+    if cpu is None:
+        return "Unknown CPU"
+    return (f"{cpu.name}, {cpu.max_clock_mhz} MHz, {cpu.cores} Core(s), "
+            f"{cpu.logical_processors} Logical Processor(s)")
+
+def format_monitors(monitors):
+    return "\n\n".join(
+        f"Name: {m.product}\nSerial: {m.serial}" for m in monitors or [] if m.product and m.serial
+    )
+
+def disk_row(disk):
+    return (disk.model or "Unknown", format_size(disk.size_bytes), disk.media_type or "Unknown")
+
+def format_speed(mbps):
+    if not mbps:
+        return "Unknown"
+    return f"{mbps / 1000:g} Gbps" if mbps >= 1000 else f"{mbps} Mbps"
+
+def adapter_row(adapter):
+    return (adapter.name or "Unknown", ", ".join(adapter.ipv4 or []), ", ".join(adapter.ipv6 or []),
+            adapter.mac or "", format_speed(adapter.speed_mbps), "Up" if adapter.is_up else "Down")
+
+def error_row(name, text, message=""):
+    # A failed table field shows as one row: status, message, last column "Unknown"
+    return [(text, message) + ("",) * (len(TABLE_FIELDS[name]) - 3) + ("Unknown",)]
+
+def render_error(name, error):
+    if error.status != STATUS_ERROR:
+        text = TIMED_OUT if error.status == STATUS_TIMED_OUT else CANCELLED
+    else:
+        text = ERROR_TEXT.get(name)
+        if name in TABLE_FIELDS:
+            return error_row(name, "Error", error.message)
+        if text is None:
+            text = f"Error: {error.message}"
+    return error_row(name, text) if name in TABLE_FIELDS else text
+
+def render_field(name, value):
+    # Display value of one field, as gather_info() reports it
+    if isinstance(value, FieldError):
+        return render_error(name, value)
+    if name == "Disks":
+        return [disk_row(disk) for disk in value or []]
+    if name == "Network Adapters":
+        return [adapter_row(adapter) for adapter in value or []]
+    if name == "Monitor Details":
+        return format_monitors(value)
+    if name == "CPU Details":
+        return format_cpu(value)
+    if name == "RAM":
+        return format_size(value)
+    if value is None or value == "":
+        return EMPTY_TEXT.get(name, "")
+    return value
+
+def render_info(snapshot, fields=None):
+    info = {}
+    for name in FIELD_ATTRS:
+        if fields is None or name in fields:
+            info[name] = render_field(name, snapshot.get(name))
+    return info
+
+# --------- Reading legacy display snapshots ---------
+# Snapshots are stored and exchanged typed (Snapshot.to_dict()). Files and
+# databases written before that hold the display form; this parses them once
+# into records (sizes come back rounded to the 0.01 GB they were shown at).
+def parse_size(text):
+    number, _, unit = str(text or "").strip().partition(" ")
+    scale = {"KB": 1024, "MB": 1024 ** 2, "GB": GIB, "TB": 1024 ** 4}.get(unit.strip().upper())
+    try:
+        return int(round(float(number) * scale)) if scale else None
+    except ValueError:
+        return None
+
+def parse_error(text):
+    if text == TIMED_OUT:
+        return FieldError(STATUS_TIMED_OUT, TIMED_OUT)
+    if text == CANCELLED:
+        return FieldError(STATUS_CANCELLED, CANCELLED)
+    if isinstance(text, str) and text.startswith("Error:"):
+        return FieldError(STATUS_ERROR, text[len("Error:"):].strip())
+    return None
+
+def parse_monitor_text(details):
+    monitors = []
+    for block in str(details or "").split("\n\n"):
+        entry = {}
+        for line in block.splitlines():
+            key, sep, value = line.partition(":")
+            if sep:
+                entry[key.strip().lower()] = value.strip()
+        if "name" in entry or "serial" in entry:
+            monitors.append(Monitor(product=entry.get("name", ""), serial=entry.get("serial", "")))
+    return monitors
+
+def parse_cpu_text(text):
+    parts = [part.strip() for part in str(text).split(",")]
+    if len(parts) < 4:
+        return Cpu(name=str(text))
+    number = lambda part: int(part.split()[0]) if part.split() and part.split()[0].isdigit() else None
+    return Cpu(", ".join(parts[:-3]), number(parts[-3]), number(parts[-2]), number(parts[-1]))
+
+def parse_speed(text):
+    number, _, unit = str(text or "").partition(" ")
+    try:
+        return int(round(float(number) * (1000 if unit == "Gbps" else 1)))
+    except ValueError:
+        return None
+
+def parse_adapter_row(name, ipv4, ipv6, mac, speed, state):
+    split = lambda text: [part.strip() for part in str(text).split(",") if part.strip()]
+    return Adapter(name, split(ipv4), split(ipv6), mac or None, parse_speed(speed), state == "Up")
+
+TABLE_ROW_PARSERS = {
+    "Disks": lambda model, size, media: Disk(model, parse_size(size), media),
+    "Network Adapters": parse_adapter_row,
+}
+
+def snapshot_from_info(info):
+    snapshot = Snapshot(collected_at=info.get("Collected At"))
+    for name in FIELD_ATTRS:
+        value = info.get(name)
+        if name in TABLE_FIELDS:
+            rows = [tuple(row) for row in value or []]
+            error = rows and (parse_error(rows[0][0]) or (rows[0][0] == "Error" and FieldError(STATUS_ERROR, rows[0][1])))
+            value = error or [TABLE_ROW_PARSERS[name](*row) for row in rows]
+        else:
+            value = parse_error(value) or value
+            if isinstance(value, str):
+                if name == "RAM":
+                    value = parse_size(value)
+                elif name == "Monitor Details":
+                    value = parse_monitor_text(value)
+                elif name == "CPU Details":
+                    value = None if value == "Unknown CPU" else parse_cpu_text(value)
+        snapshot.set(name, value)
+    return snapshot
@@ -0,0 +1,298 @@
+import io
+from xml.sax.saxutils import escape
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, KeepTogether, PageBreak
+from reportlab.platypus.tableofcontents import TableOfContents
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+from records import Snapshot, render_info, TABLE_FIELDS
+from snapshot_diff import value_text
+
+REPORT_TITLE = "System Asset Information Report"
+COMBINED_TITLE = "Fleet Asset Information Report"
+CHANGES_TITLE = "Asset Changes Report"
+SUMMARY_TITLE = "Fleet Hardware Summary"
+REPORT_FOOTER = "© 2025 System Asset Info | IT Department"
+SPARKLINE_WIDTH = 180
+SPARKLINE_HEIGHT = 22
+
+# (label in the report, key in the gather_info() dict)
+EXPORT_FIELDS = [
+    ("System Name", "System Name"),
+    ("IP Address", "IP Address"),
+    ("RAM Size", "RAM"),
+    ("CPU Model Name", "CPU Model Name"),
+    ("CPU Details", "CPU Details"),
+    ("Serial Number", "Serial Number"),
+    ("Product Key", "Product Key"),
+    ("OS Name", "OS Name"),
+    ("OS Status", "OS Status"),
+]
+
+def text(value):
+    return escape(str(value)).replace('\n', '<br/>')
+
+class CombinedDocTemplate(SimpleDocTemplate):
+    # Host headings carry toc_key/toc_text; they feed the table of contents
+    # and the PDF outline (bookmarks)
+    def afterFlowable(self, flowable):
+        key = getattr(flowable, "toc_key", None)
+        if key:
+            self.canv.bookmarkPage(key)
+            self.canv.addOutlineEntry(flowable.toc_text, key, level=0, closed=True)
+            self.notify('TOCEntry', (0, escape(flowable.toc_text), self.page, key))
+
+class ReportTemplate:
+    # Styles and table styles are built once here and shared by every render,
+    # so back-to-back or bulk exports only pay for layout.
+    def __init__(self, pagesize=A4):
+        self.pagesize = pagesize
+        styles = getSampleStyleSheet()
+        self.normal = styles['Normal']
+        # Custom styles (derived, so the sample stylesheet is never modified)
+        self.title_style = ParagraphStyle(
+            name='ReportTitle',
+            parent=styles['Title'],
+            fontSize=22,
+            alignment=1,  # Center
+        )
+        self.section_heading = ParagraphStyle(
+            name='SectionHeading',
+            parent=styles['Heading3'],
+            fontSize=13,
+            leading=16,
+            spaceBefore=14,
+            spaceAfter=6,
+            textColor=colors.HexColor("#1a237e"),
+        )
+        self.monitor_heading = ParagraphStyle(
+            name='MonitorHeading',
+            parent=styles['Heading4'],
+            fontSize=11,
+            leading=13,
+            spaceBefore=10,
+            italic=True,
+            textColor=colors.HexColor("#222")
+        )
+        self.footer_style = ParagraphStyle(
+            name='Footer',
+            parent=styles['Normal'],
+            fontSize=8,
+            textColor=colors.HexColor("#888"),
+            alignment=0,
+            spaceBefore=24
+        )
+        self.host_heading = ParagraphStyle(
+            name='HostHeading',
+            parent=styles['Heading2'],
+            fontSize=16,
+            leading=20,
+            spaceAfter=10,
+            textColor=colors.HexColor("#1a237e"),
+        )
+        self.toc_entry = ParagraphStyle(
+            name='TOCEntry',
+            parent=styles['Normal'],
+            fontSize=10,
+            leading=13,
+            leftIndent=10,
+        )
+        self.info_table_style = TableStyle([
+            ('BACKGROUND', (0,0), (-1,-1), colors.HexColor("#f8faff")),
+            ('BOX', (0,0), (-1,-1), 1, colors.HexColor("#1a237e")),
+            ('INNERGRID', (0,0), (-1,-1), 0.5, colors.HexColor("#b0b6d6")),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('FONTSIZE', (0,0), (-1,-1), 10),
+            ('LEFTPADDING', (0,0), (-1,-1), 10),
+            ('RIGHTPADDING', (0,0), (-1,-1), 8),
+            ('TOPPADDING', (0,0), (-1,-1), 5),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 5),
+        ])
+        self.grid_table_style = TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), colors.HexColor("#e3e6f3")),
+            ('BOX', (0,0), (-1,-1), 1, colors.HexColor("#1a237e")),
+            ('INNERGRID', (0,0), (-1,-1), 0.5, colors.HexColor("#b0b6d6")),
+            ('FONTSIZE', (0,0), (-1,-1), 10),
+            ('LEFTPADDING', (0,0), (-1,-1), 10),
+            ('RIGHTPADDING', (0,0), (-1,-1), 8),
+            ('TOPPADDING', (0,0), (-1,-1), 4),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 4),
+            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, colors.HexColor("#f5f7fa")]),
+        ])
+
+    def header(self, label):
+        return Paragraph(f"<b>{escape(label)}</b>", self.normal)
+
+    def grid_table(self, headers, rows, col_widths):
+        data = [[self.header(label) for label in headers]]
+        for row in rows:
+            data.append([Paragraph(text(cell), self.normal) for cell in row])
+        table = Table(data, colWidths=col_widths)
+        table.setStyle(self.grid_table_style)
+        return table
+
+    def host_elements(self, info, title=True):
+        # info: a gather_info() dict or a records.Snapshot (rendered here)
+        if isinstance(info, Snapshot):
+            info = render_info(info)
+        elements = []
+        # Title
+        if title:
+            elements.append(Paragraph(REPORT_TITLE, self.title_style))
+            elements.append(Spacer(1, 20))
+        # Info Table
+        table_data = []
+        for label, key in EXPORT_FIELDS:
+            table_data.append([self.header(label), Paragraph(text(info.get(key, "")), self.normal)])
+        info_table = Table(table_data, colWidths=[175, 305])
+        info_table.setStyle(self.info_table_style)
+        elements.append(KeepTogether([info_table, Spacer(1, 12)]))
+        # Network Adapters
+        elements.append(Paragraph("Network Adapters", self.section_heading))
+        adapter_table = self.grid_table(TABLE_FIELDS["Network Adapters"], info.get("Network Adapters", []),
+                                        [75, 80, 135, 100, 55, 45])
+        elements.append(KeepTogether([adapter_table, Spacer(1, 16)]))
+        # Disk Info
+        elements.append(Paragraph("SSD &amp; HDD Info (Physical Drives)", self.section_heading))
+        disk_table = self.grid_table(["Model", "Size", "Type"], info.get("Disks", []), [220, 90, 100])
+        elements.append(KeepTogether([disk_table, Spacer(1, 16)]))
+        # Monitor Details
+        elements.append(Paragraph("Monitor Details", self.monitor_heading))
+        elements.append(Paragraph(text(info.get("Monitor Details", "")), self.normal))
+        elements.append(Spacer(1, 18))
+        return elements
+
+    def monitor_elements(self, capture):
+        # A live monitor capture (monitor.Sampler.capture): one row per series
+        # with its sparkline and min/average/max over the captured window
+        from reportlab.graphics.shapes import Drawing, PolyLine
+        from monitor import sparkline_points, format_value
+        elements = [Paragraph("Live Resource Monitor", self.section_heading),
+                    Paragraph(text(f"{capture['Samples']} samples at {capture['Rate (Hz)']} Hz over "
+                                   f"{capture['Duration (s)']} s from {capture['Started At']} "
+                                   f"(sampler CPU {capture['Sampler CPU (%)']:.2f} %)"), self.normal),
+                    Spacer(1, 6)]
+        rows = []
+        for series in capture["Series"]:
+            if not series["Values"]:
+                continue
+            drawing = Drawing(SPARKLINE_WIDTH, SPARKLINE_HEIGHT)
+            points = sparkline_points(series["Values"], SPARKLINE_WIDTH, SPARKLINE_HEIGHT - 2, series["Unit"])
+            drawing.add(PolyLine([coordinate for x, y in points for coordinate in (x, y + 1)],
+                                 strokeColor=colors.HexColor("#1a237e"), strokeWidth=0.8))
+            rows.append([Paragraph(text(series["Name"]), self.normal), drawing]
+                        + [Paragraph(text(format_value(series[key], series["Unit"])), self.normal)
+                           for key in ("Min", "Average", "Max")])
+        data = [[self.header(label) for label in ("Series", "Window", "Min", "Average", "Max")]] + rows
+        table = Table(data, colWidths=[75, SPARKLINE_WIDTH + 12, 65, 65, 65], repeatRows=1)
+        table.setStyle(self.grid_table_style)
+        elements += [table, Spacer(1, 16)]
+        return elements
+
+    def footer(self):
+        return Paragraph(REPORT_FOOTER, self.footer_style)
+
+    def document(self, target, title=REPORT_TITLE):
+        # invariant=1 keeps timestamps and document IDs fixed, so the same
+        # snapshot always renders to the same bytes
+        return SimpleDocTemplate(
+            target, pagesize=self.pagesize, rightMargin=36, leftMargin=36, topMargin=36, bottomMargin=36,
+            title=title, invariant=1
+        )
+
+    def render(self, info, target, capture=None):
+        # target: a file path or a writable binary file object (e.g. BytesIO);
+        # capture: a live monitor capture to append, if any
+        if isinstance(info, Snapshot):
+            info = render_info(info)
+        doc = self.document(target, title=f"{info.get('System Name', '')} - {REPORT_TITLE}")
+        elements = self.host_elements(info)
+        if capture and capture.get("Samples"):
+            elements += self.monitor_elements(capture)
+        doc.build(elements + [self.footer()])
+        return target
+
+    def render_combined(self, infos, target, title=COMBINED_TITLE):
+        # One document for many hosts: contents page, then one section per host
+        toc = TableOfContents()
+        toc.levelStyles = [self.toc_entry]
+        elements = [Paragraph(escape(title), self.title_style), Spacer(1, 20),
+                    Paragraph("Contents", self.section_heading), toc]
+        count = 0
+        for count, info in enumerate(infos, 1):
+            name = str(info.get("System Name") or f"Host {count}")
+            heading = Paragraph(text(name), self.host_heading)
+            heading.toc_key = f"host-{count}"
+            heading.toc_text = name
+            elements += [PageBreak(), heading] + self.host_elements(info, title=False)
+        elements.append(self.footer())
+        doc = CombinedDocTemplate(
+            target, pagesize=self.pagesize, rightMargin=36, leftMargin=36, topMargin=36, bottomMargin=36,
+            title=title, invariant=1
+        )
+        # Two passes (or more) so page numbers in the contents are resolved
+        doc.multiBuild(elements)
+        return count
+
+    def change_rows(self, changes):
+        rows = []
+        for name, change in changes.items():
+            if "new" in change:
+                rows.append([name, value_text(name, change["old"]), value_text(name, change["new"])])
+                continue
+            for item in change["removed"]:
+                rows.append([name, value_text(name, [item]), "(removed)"])
+            for item in change["added"]:
+                rows.append([name, "(added)", value_text(name, [item])])
+        return rows
+
+    def render_changes(self, deltas, target, title=CHANGES_TITLE):
+        # Change-only report: one table of old/new values per changed host
+        elements = [Paragraph(escape(title), self.title_style), Spacer(1, 20)]
+        for delta in deltas:
+            period = f"{delta.get('From') or 'first seen'} to {delta.get('To') or ''}"
+            elements.append(Paragraph(text(delta.get("System Name") or ""), self.host_heading))
+            elements.append(Paragraph(text(period), self.normal))
+            elements.append(Spacer(1, 6))
+            table = self.grid_table(["Field", "Before", "After"], self.change_rows(delta["Changes"]), [110, 185, 185])
+            elements.append(KeepTogether([table, Spacer(1, 16)]))
+        if not deltas:
+            elements.append(Paragraph("No changes.", self.normal))
+        elements.append(self.footer())
+        self.document(target, title=title).build(elements)
+        return len(deltas)
+
+    def render_summary(self, totals, tables, target, title=SUMMARY_TITLE, max_rows=40):
+        # Executive summary: headline figures, then one table per rollup
+        # (fleet_summary.py); long tables are cut at max_rows, the CSV export has all
+        elements = [Paragraph(escape(title), self.title_style), Spacer(1, 20)]
+        overview = Table([[self.header(label), Paragraph(text(value), self.normal)] for label, value in totals],
+                         colWidths=[240, 240])
+        overview.setStyle(self.info_table_style)
+        elements.append(KeepTogether([overview, Spacer(1, 12)]))
+        for name, headers, rows in tables:
+            elements.append(Paragraph(escape(name), self.section_heading))
+            if not rows:
+                elements.append(Paragraph("None.", self.normal))
+                continue
+            first = 480 - 75 * (len(headers) - 1)
+            elements.append(self.grid_table(headers, rows[:max_rows], [first] + [75] * (len(headers) - 1)))
+            if len(rows) > max_rows:
+                elements.append(Paragraph(f"... and {len(rows) - max_rows} more (see the CSV export).", self.normal))
+            elements.append(Spacer(1, 16))
+        elements.append(self.footer())
+        self.document(target, title=title).build(elements)
+        return target
+
+    def render_bytes(self, info):
+        buffer = io.BytesIO()
+        self.render(info, buffer)
+        return buffer.getvalue()
+
+_default_template = None
+
+def get_template():
+    global _default_template
+    if _default_template is None:
+        _default_template = ReportTemplate()
+    return _default_template
@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+TIMED_OUT = "Timed Out"
+CANCELLED = "Cancelled"
+
+# Deadline and cancel flag of the probe running on the current worker thread,
+# so subprocess calls made deep inside a probe can honour them.
+_local = threading.local()
+
+def remaining_time(default=None):
+    deadline = getattr(_local, "deadline", None)
+    if deadline is None:
+        return default
+    return max(deadline - time.monotonic(), 0.001)
+
+def is_cancelled():
+    event = getattr(_local, "cancel_event", None)
+    return event is not None and event.is_set()
+
+def _run_probe(fn, deadline, cancel_event):
+    _local.deadline = deadline
+    _local.cancel_event = cancel_event
+    try:
+        if cancel_event.is_set():
+            return CANCELLED
+        return fn()
+    finally:
+        _local.deadline = None
+        _local.cancel_event = None
+
+def run_with_deadline(fn, timeout, cancel_event=None):
+    # Run fn on the current thread with its own deadline, as a single probe would
+    return _run_probe(fn, time.monotonic() + timeout, cancel_event or threading.Event())
+
+def run_probes(probes, timeout=30, max_workers=None, on_result=None, cancel_event=None):
+    # probes: list of (name, fn, timeout-or-None). Returns {name: result}, where a
+    # probe that missed its deadline yields TIMED_OUT, one that raised yields
+    # "Error: ..." and one stopped through cancel_event yields CANCELLED.
+    results = {}
+    if not probes:
+        return results
+    cancel_event = cancel_event or threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(probes), thread_name_prefix="probe")
+    futures = {}
+    start = time.monotonic()
+
+    def finish(future, value):
+        name = futures[future][0]
+        results[name] = value
+        if on_result:
+            on_result(name, value)
+
+    try:
+        for name, fn, probe_timeout in probes:
+            deadline = start + (probe_timeout or timeout)
+            futures[executor.submit(_run_probe, fn, deadline, cancel_event)] = (name, deadline)
+        pending = set(futures)
+        while pending and not cancel_event.is_set():
+            next_deadline = min(futures[f][1] for f in pending)
+            wait_for = min(max(next_deadline - time.monotonic(), 0), 0.1)
+            done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    finish(future, future.result())
+                except Exception as e:
+                    finish(future, f"Error: {e}")
+            now = time.monotonic()
+            for future in [f for f in pending if futures[f][1] <= now]:
+                pending.discard(future)
+                future.cancel()
+                finish(future, TIMED_OUT)
+        for future in pending:
+            future.cancel()
+            finish(future, CANCELLED)
+    finally:
+        # Stragglers are not waited for; their subprocesses are killed when
+        # their own deadline passes.
+        executor.shutdown(wait=False)
+    return results
@@ -0,0 +1,409 @@
+import os
+import sys
+import json
+import mmap
+import time
+import struct
+import argparse
+from array import array
+from records import Snapshot, Disk, Monitor, Adapter, Cpu, FieldError, render_info, TABLE_FIELDS, UNPERSISTED_FIELDS
+
+# Compact binary archive of typed snapshots (records.Snapshot), opened with
+# mmap. Every string is stored once in a string table and referenced by a
+# 4-byte code (a fleet has a few dozen CPU names, models and OS names, repeated
+# on every host); numbers (RAM, disk sizes, clock speeds) sit in fixed-width
+# arrays, one per field. Disks, monitors, adapters and per-field errors are
+# child tables: `<table>.start[i]:<table>.start[i + 1]` are host i's rows.
+# hosts.uncollected tells a list that was not collected (None) from one that
+# is empty: bit n is set when LISTS[n] is None. The product key is never
+# archived (records.UNPERSISTED_FIELDS).
+# Opening an archive reads only its small JSON header, so a 1M-host file opens
+# at once; record i is a handful of array lookups, and the pages it touches are
+# the only ones read from disk.
+#
+#   python snapshot_archive.py pack audits/ -o fleet.snaparc
+#   python snapshot_archive.py show fleet.snaparc PC-0042
+#
+# File: MAGIC, header length (u32), JSON header naming each section's offset,
+# type code and item count, then the sections, each aligned to 8 bytes.
+MAGIC = b"SNAPARC\x00"
+VERSION = 3
+ARCHIVE_EXTENSION = ".snaparc"
+ALIGN = 8
+
+STRING = "S"
+STRING_CODE = "I"
+NO_STRING = 0xFFFFFFFF
+# Missing value of each integer type code
+NULLS = {"q": -(1 << 63), "i": -(1 << 31), "b": -128}
+BOUNDS = {"q": 1 << 63, "i": 1 << 31, "b": 1 << 7}
+LISTS = ["disks", "monitors", "adapters"]
+
+def uncollected(snapshot):
+    return sum(1 << bit for bit, name in enumerate(LISTS) if getattr(snapshot, name) is None)
+
+# (column, type code, value of a record)
+HOST_COLUMNS = [
+    ("system_name", STRING, lambda s: s.system_name),
+    ("collected_at", STRING, lambda s: s.collected_at),
+    ("ip_address", STRING, lambda s: s.ip_address),
+    ("ram_bytes", "q", lambda s: s.ram_bytes),
+    ("model", STRING, lambda s: s.model),
+    ("cpu_name", STRING, lambda s: s.cpu and s.cpu.name),
+    ("cpu_max_clock_mhz", "i", lambda s: s.cpu and s.cpu.max_clock_mhz),
+    ("cpu_cores", "i", lambda s: s.cpu and s.cpu.cores),
+    ("cpu_logical_processors", "i", lambda s: s.cpu and s.cpu.logical_processors),
+    ("serial_number", STRING, lambda s: s.serial_number),
+    ("os_name", STRING, lambda s: s.os_name),
+    ("os_status", STRING, lambda s: s.os_status),
+    ("uncollected", "b", uncollected),
+]
+
+def join_addresses(addresses):
+    return None if addresses is None else ",".join(addresses)
+
+# Child tables: (table, rows of a record, columns)
+CHILD_TABLES = [
+    ("disks", lambda s: s.disks or [], [
+        ("model", STRING, lambda d: d.model),
+        ("size_bytes", "q", lambda d: d.size_bytes),
+        ("media_type", STRING, lambda d: d.media_type),
+    ]),
+    ("monitors", lambda s: s.monitors or [], [
+        ("manufacturer", STRING, lambda m: m.manufacturer),
+        ("product", STRING, lambda m: m.product),
+        ("product_code", STRING, lambda m: m.product_code),
+        ("serial", STRING, lambda m: m.serial),
+        ("week", "i", lambda m: m.week),
+        ("year", "i", lambda m: m.year),
+        ("width_cm", "i", lambda m: m.width_cm),
+        ("height_cm", "i", lambda m: m.height_cm),
+    ]),
+    ("adapters", lambda s: s.adapters or [], [
+        ("name", STRING, lambda a: a.name),
+        ("ipv4", STRING, lambda a: join_addresses(a.ipv4)),
+        ("ipv6", STRING, lambda a: join_addresses(a.ipv6)),
+        ("mac", STRING, lambda a: a.mac),
+        ("speed_mbps", "q", lambda a: a.speed_mbps),
+        ("is_up", "b", lambda a: a.is_up),
+    ]),
+    ("errors", lambda s: sorted(item for item in s.errors.items() if item[0] not in UNPERSISTED_FIELDS), [
+        ("field", STRING, lambda e: e[0]),
+        ("status", STRING, lambda e: e[1].status),
+        ("message", STRING, lambda e: e[1].message),
+    ]),
+]
+
+CHILD_COLUMNS = {table: columns for table, _, columns in CHILD_TABLES}
+
+def to_int(value, typecode):
+    # Stored integer of a field; None, non-numbers and out-of-range values are
+    # stored as missing
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        value = int(value)
+    if not isinstance(value, int) or not -BOUNDS[typecode] < value < BOUNDS[typecode]:
+        return NULLS[typecode]
+    return int(value)
+
+class ArchiveWriter:
+    def __init__(self):
+        self.strings = {}
+        self.values = []
+        self.string_offsets = array("Q", [0])
+        self.string_data = bytearray()
+        self.columns = {}
+        self.getters = []
+        self.children = []
+        for name, typecode, getter in HOST_COLUMNS:
+            self.getters.append((self.add_column(f"hosts.{name}", typecode), typecode, getter))
+        for table, rows, columns in CHILD_TABLES:
+            start = self.columns[f"{table}.start"] = array("Q", [0])
+            getters = [(self.add_column(f"{table}.{name}", typecode), typecode, getter)
+                       for name, typecode, getter in columns]
+            self.children.append((start, rows, getters))
+        self.count = 0
+
+    def add_column(self, name, typecode):
+        self.columns[name] = array(STRING_CODE if typecode == STRING else typecode)
+        return self.columns[name]
+
+    def code(self, value):
+        if value is None:
+            return NO_STRING
+        value = str(value)
+        code = self.strings.get(value)
+        if code is None:
+            code = self.strings[value] = len(self.values)
+            self.values.append(value)
+            self.string_data += value.encode("utf-8", "surrogatepass")
+            self.string_offsets.append(len(self.string_data))
+        return code
+
+    def append_row(self, getters, item):
+        for column, typecode, getter in getters:
+            value = getter(item)
+            column.append(self.code(value) if typecode == STRING else to_int(value, typecode))
+
+    def add(self, snapshot):
+        self.append_row(self.getters, snapshot)
+        for start, rows, getters in self.children:
+            for item in rows(snapshot):
+                self.append_row(getters, item)
+            start.append(len(getters[0][0]))
+        self.count += 1
+
+    def add_all(self, snapshots):
+        for snapshot in snapshots:
+            self.add(snapshot)
+        return self
+
+    def name_index(self):
+        # Record numbers ordered by (System Name, Collected At), for find()
+        names, times = self.columns["hosts.system_name"], self.columns["hosts.collected_at"]
+        text = lambda code: "" if code == NO_STRING else self.values[code]
+        return array("I", sorted(range(self.count), key=lambda i: (text(names[i]), text(times[i]))))
+
+    def sections(self):
+        sections = {"strings.offsets": self.string_offsets, "strings.data": array("B", self.string_data)}
+        sections.update(self.columns)
+        sections["hosts.by_name"] = self.name_index()
+        return sections
+
+    def write(self, path):
+        sections = self.sections()
+        header = {"version": VERSION, "byteorder": sys.byteorder, "records": self.count, "sections": {}}
+        # Section offsets are in the header, so they depend on its length: lay
+        # out again until the offsets no longer change
+        layout = {name: [0, column.typecode, len(column)] for name, column in sections.items()}
+        while True:
+            header["sections"] = layout
+            encoded = json.dumps(header, separators=(",", ":")).encode("utf-8")
+            offset = align(len(MAGIC) + 4 + len(encoded))
+            settled = True
+            for name, column in sections.items():
+                if layout[name][0] != offset:
+                    layout[name] = [offset, column.typecode, len(column)]
+                    settled = False
+                offset = align(offset + len(column) * column.itemsize)
+            if settled:
+                break
+        temp = f"{path}.tmp"
+        with open(temp, "wb") as out:
+            out.write(MAGIC + struct.pack("<I", len(encoded)) + encoded)
+            for name, column in sections.items():
+                out.write(b"\x00" * (layout[name][0] - out.tell()))
+                column.tofile(out)
+            out.write(b"\x00" * (align(out.tell()) - out.tell()))
+        os.replace(temp, path)
+        return self.count
+
+def align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+def write_archive(path, snapshots):
+    # Writes typed snapshots (records.Snapshot) to path; returns how many
+    return ArchiveWriter().add_all(snapshots).write(path)
+
+class SnapshotArchive:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{path}: not a snapshot archive (empty file)")
+        self.views = []
+        try:
+            self.open_sections()
+        except Exception:
+            self.close()
+            raise
+
+    def open_sections(self):
+        if self.map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{self.path}: not a snapshot archive")
+        start = len(MAGIC) + 4
+        (length,) = struct.unpack("<I", self.map[len(MAGIC):start])
+        header = json.loads(self.map[start:start + length].decode("utf-8"))
+        if header.get("version") != VERSION:
+            raise ValueError(f"{self.path}: archive version {header.get('version')} is not supported")
+        self.count = header["records"]
+        self.columns = {}
+        for name, (offset, typecode, count) in header["sections"].items():
+            size = count * array(typecode).itemsize
+            if offset + size > len(self.map):
+                raise ValueError(f"{self.path}: truncated archive ({name})")
+            if header["byteorder"] == sys.byteorder:
+                column = memoryview(self.map)[offset:offset + size].cast(typecode)
+                self.views.append(column)
+            else:
+                # Written on a machine of the other byte order: this column is copied
+                column = array(typecode, self.map[offset:offset + size])
+                column.byteswap()
+            self.columns[name] = column
+        self.string_offsets = self.columns["strings.offsets"]
+        self.string_data = self.columns["strings.data"]
+        self.by_name = self.columns["hosts.by_name"]
+        # (field, column, type code) of each table, looked up once
+        tables = dict(CHILD_COLUMNS, hosts=HOST_COLUMNS)
+        self.tables = {table: [(name, self.columns[f"{table}.{name}"], typecode) for name, typecode, _ in columns]
+                       for table, columns in tables.items()}
+
+    def close(self):
+        # Views into the map must be released before it can be closed
+        for view in self.views:
+            view.release()
+        self.views = []
+        self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("archive index out of range")
+        return self.read_snapshot(index)
+
+    def string(self, code):
+        if code == NO_STRING:
+            return None
+        return str(self.string_data[self.string_offsets[code]:self.string_offsets[code + 1]], "utf-8", "surrogatepass")
+
+    def row(self, table, row):
+        # One row as {field: str / int / None}
+        values = {}
+        for name, column, typecode in self.tables[table]:
+            value = column[row]
+            if typecode == STRING:
+                values[name] = self.string(value)
+            else:
+                values[name] = None if value == NULLS[typecode] else value
+        return values
+
+    def child_rows(self, table, index):
+        start = self.columns[f"{table}.start"]
+        return [self.row(table, row) for row in range(start[index], start[index + 1])]
+
+    def read_snapshot(self, index):
+        host = self.row("hosts", index)
+        cpu = None
+        if any(host[name] is not None for name in ("cpu_name", "cpu_max_clock_mhz", "cpu_cores")):
+            cpu = Cpu(host["cpu_name"], host["cpu_max_clock_mhz"], host["cpu_cores"], host["cpu_logical_processors"])
+        snapshot = Snapshot(
+            system_name=host["system_name"], ip_address=host["ip_address"], ram_bytes=host["ram_bytes"],
+            model=host["model"], cpu=cpu, serial_number=host["serial_number"],
+            os_name=host["os_name"], os_status=host["os_status"], collected_at=host["collected_at"])
+        snapshot.disks = [Disk(**row) for row in self.child_rows("disks", index)]
+        snapshot.monitors = [Monitor(**row) for row in self.child_rows("monitors", index)]
+        adapters = []
+        for row in self.child_rows("adapters", index):
+            for family in ("ipv4", "ipv6"):
+                row[family] = None if row[family] is None else [a for a in row[family].split(",") if a]
+            row["is_up"] = None if row["is_up"] is None else bool(row["is_up"])
+            adapters.append(Adapter(**row))
+        snapshot.adapters = adapters
+        for bit, name in enumerate(LISTS):
+            if host["uncollected"] & 1 << bit:
+                setattr(snapshot, name, None)
+        for row in self.child_rows("errors", index):
+            snapshot.set(row["field"], FieldError(row["status"], row["message"]))
+        return snapshot
+
+    def find(self, system_name):
+        # Record number of the latest snapshot of a host, or None (binary
+        # search over the name index; only the probed names are decoded)
+        names = self.columns["hosts.system_name"]
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if (self.string(names[self.by_name[middle]]) or "") <= system_name:
+                low = middle + 1
+            else:
+                high = middle
+        if low and self.string(names[self.by_name[low - 1]]) == system_name:
+            return self.by_name[low - 1]
+        return None
+
+def display_record(snapshot):
+    # gather_info() shape, as headless.py writes it
+    record = {"Collected At": snapshot.collected_at}
+    record.update(render_info(snapshot))
+    for name in TABLE_FIELDS:
+        record[name] = [list(row) for row in record[name]]
+    return record
+
+def pack(args):
+    from ingest import ingest, IngestStats
+    stats = IngestStats()
+    start = time.perf_counter()
+    count = write_archive(args.output, ingest(args.inputs, stats))
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(args.output)
+    print(f"{stats.summary()}\nwrote {count} snapshot(s) to {args.output}: {size / (1 << 20):.1f} MiB "
+          f"in {elapsed:.1f} s", file=sys.stderr)
+    return 0 if count else 1
+
+def show(args):
+    with SnapshotArchive(args.archive) as archive:
+        records = []
+        for host in args.hosts:
+            index = int(host[1:]) if host.startswith("#") and host[1:].isdigit() else archive.find(host)
+            if index is None or index >= len(archive):
+                print(f"{host}: not in {args.archive}", file=sys.stderr)
+                return 1
+            snapshot = archive[index]
+            records.append(display_record(snapshot) if args.display else snapshot.to_dict())
+    json.dump(records[0] if len(records) == 1 else records, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0
+
+def info(args):
+    start = time.perf_counter()
+    with SnapshotArchive(args.archive) as archive:
+        opened = time.perf_counter() - start
+        print(f"{args.archive}: {len(archive)} snapshot(s), {len(archive.string_offsets) - 1} distinct string(s), "
+              f"{os.path.getsize(args.archive) / (1 << 20):.1f} MiB; opened in {opened * 1000:.2f} ms")
+        for name, column in archive.columns.items():
+            print(f"  {name:<32} {len(column):>10} x {column.itemsize} bytes")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack snapshots into a compact mmap archive and read them back.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    packer = commands.add_parser("pack", help="write snapshot files (JSON/NDJSON) or directories into an archive")
+    packer.add_argument("inputs", nargs="+")
+    packer.add_argument("--output", "-o", required=True, help=f"archive path (e.g. fleet{ARCHIVE_EXTENSION})")
+    packer.set_defaults(run=pack)
+    shower = commands.add_parser("show", help="print snapshots from an archive as JSON")
+    shower.add_argument("archive")
+    shower.add_argument("hosts", nargs="+", help="System Name (its latest snapshot) or #N for record N")
+    shower.add_argument("--display", action="store_true", help="display text, as headless.py --display writes it")
+    # Typed records are the default now; kept so older scripts still run
+    shower.add_argument("--raw", action="store_true", help=argparse.SUPPRESS)
+    shower.set_defaults(run=show)
+    describer = commands.add_parser("info", help="record count, string table and column sizes")
+    describer.add_argument("archive")
+    describer.set_defaults(run=info)
+    args = parser.parse_args(argv)
+    try:
+        return args.run(args)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
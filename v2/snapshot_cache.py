@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import threading
+from collectors import collect_snapshot, FIELD_ORDER
+from records import Snapshot, FieldError, UNPERSISTED_FIELDS
+
+# Cache file format; files of another version are ignored
+CACHE_VERSION = 3
+
+# Seconds a field stays fresh; None means it is kept for the process lifetime
+# (and across runs, until the next reboot, unless it is in UNPERSISTED_FIELDS).
+FIELD_TTLS = {
+    "System Name": None,
+    "IP Address": 30,
+    "Network Adapters": 30,
+    "RAM": 300,
+    "CPU Model Name": None,
+    "CPU Details": None,
+    "Serial Number": None,
+    "Product Key": None,
+    "Monitor Details": 60,
+    "Disks": 300,
+    "OS Name": None,
+    "OS Status": 30,
+}
+
+def app_data_dir():
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "Asset_Info")
+
+def default_cache_path():
+    return os.path.join(app_data_dir(), "snapshot_cache.json")
+
+class SnapshotCache:
+    # Typed field values (records.py); get() returns a records.Snapshot
+    def __init__(self, collect=collect_snapshot, ttls=FIELD_TTLS, persist_path=None):
+        self.collect = collect
+        self.ttls = dict(ttls)
+        self.persist_path = persist_path
+        self.lock = threading.Lock()
+        self.values = {}
+        self.collected_at = {}
+        import psutil
+        self.boot_time = psutil.boot_time()
+        self.load()
+
+    def is_fresh(self, name, now):
+        if name not in self.values:
+            return False
+        ttl = self.ttls.get(name)
+        return ttl is None or now - self.collected_at[name] < ttl
+
+    def stale_fields(self):
+        now = time.monotonic()
+        with self.lock:
+            return [name for name in FIELD_ORDER if not self.is_fresh(name, now)]
+
+    def get(self, cancel_event=None, on_result=None, metrics=None):
+        # on_result(name, value) sees cached fields first, then each
+        # re-collected field as soon as its probe finishes
+        stale = self.stale_fields()
+        cached = {name: value for name, value in self.peek().items() if name not in stale}
+        for name, value in cached.items():
+            if on_result:
+                on_result(name, value)
+            if metrics:
+                metrics.mark(name, "cached", failed=False)
+        fresh = {}
+        if stale:
+            extra = {"metrics": metrics} if metrics else {}
+            collected = self.collect(cancel_event=cancel_event, fields=stale, on_result=on_result, **extra)
+            fresh = {name: collected.get(name) for name in stale}
+            self.store(fresh)
+        snapshot = Snapshot()
+        with self.lock:
+            for name in FIELD_ORDER:
+                snapshot.set(name, fresh[name] if name in fresh else self.values.get(name))
+        return snapshot
+
+    def peek(self):
+        # Whatever is cached right now, without collecting anything
+        with self.lock:
+            return {name: self.values[name] for name in FIELD_ORDER if name in self.values}
+
+    def store(self, values):
+        now = time.monotonic()
+        with self.lock:
+            for name, value in values.items():
+                if not isinstance(value, FieldError):
+                    self.values[name] = value
+                    self.collected_at[name] = now
+        self.save()
+
+    def invalidate(self, fields=None):
+        with self.lock:
+            for name in list(self.values) if fields is None else fields:
+                self.values.pop(name, None)
+                self.collected_at.pop(name, None)
+        self.save()
+
+    # --------- Persistence (static fields only, no secrets) ---------
+    def load(self):
+        if not self.persist_path:
+            return
+        try:
+            with open(self.persist_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Hardware can only change across a reboot (boot time jitters slightly between reads)
+        if data.get("version") != CACHE_VERSION or abs((data.get("boot_time") or 0) - self.boot_time) > 5:
+            return
+        now = time.monotonic()
+        values = data.get("values", {})
+        snapshot = Snapshot.from_dict(values)
+        for name in values:
+            if name in self.ttls and self.ttls[name] is None and name not in UNPERSISTED_FIELDS:
+                self.values[name] = snapshot.get(name)
+                self.collected_at[name] = now
+
+    def save(self):
+        if not self.persist_path:
+            return
+        static = Snapshot()
+        with self.lock:
+            names = [name for name in self.values if self.ttls.get(name) is None and name not in UNPERSISTED_FIELDS]
+            for name in names:
+                static.set(name, self.values[name])
+        record = static.to_dict()
+        try:
+            os.makedirs(os.path.dirname(self.persist_path), exist_ok=True)
+            tmp_path = self.persist_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "boot_time": self.boot_time,
+                           "values": {name: record[name] for name in names}}, f)
+            os.replace(tmp_path, self.persist_path)
+        except OSError:
+            pass
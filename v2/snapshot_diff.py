@@ -0,0 +1,167 @@
+import sys
+import json
+import argparse
+from collections import Counter
+from records import Snapshot, Record, FieldError, FIELD_ATTRS, render_field
+
+# Change-only view of snapshots: what differs between two collections of the
+# same machine (a swapped disk, a new monitor, more RAM, a new IP).
+# Snapshots are compared typed (records.Snapshot). A delta holds only the
+# changed fields, as JSON values, and can be applied to the older snapshot to
+# get the newer one back.
+
+# Not compared: they change without the hardware changing
+IGNORED_FIELDS = ("OS Status",)
+# Compared item by item
+LIST_FIELDS = ("Disks", "Network Adapters", "Monitor Details")
+
+def encode(value):
+    # JSON form of a field value; a failed probe is {"Error": {status, message}}
+    if isinstance(value, FieldError):
+        return {"Error": value.to_dict()}
+    if isinstance(value, list):
+        return [item.to_dict() for item in value]
+    if isinstance(value, Record):
+        return value.to_dict()
+    return value
+
+def decode(name, value):
+    if isinstance(value, dict) and "Error" in value:
+        return FieldError(**value["Error"])
+    return Snapshot.from_dict({name: value}).get(name)
+
+def value_text(name, value):
+    # One line of display text for a delta value (a whole value, or a list of
+    # added/removed items), for reports
+    text = render_field(name, decode(name, value))
+    if isinstance(text, list):
+        return "; ".join(" / ".join(map(str, row)) for row in text)
+    return str(text).replace("\n\n", "; ").replace("\n", ", ")
+
+def item_key(item):
+    # Hashable form of a record (adapters hold address lists)
+    return tuple(tuple(part) if isinstance(part, list) else part for part in item.astuple())
+
+def diff_items(old, new):
+    # Multiset difference, so two identical disks count as two
+    items = {item_key(item): item for item in old + new}
+    old_counts, new_counts = Counter(map(item_key, old)), Counter(map(item_key, new))
+    removed = [items[key] for key in (old_counts - new_counts).elements()]
+    added = [items[key] for key in (new_counts - old_counts).elements()]
+    if not added and not removed:
+        return None
+    return {"added": encode(added), "removed": encode(removed)}
+
+def diff_snapshots(old, new, ignore_failures=True):
+    # {field: change}; whole-value change = {"old": a, "new": b}, list field
+    # (Disks, Network Adapters, Monitor Details) change =
+    # {"added": [...], "removed": [...]}
+    changes = {}
+    for name in FIELD_ATTRS:
+        if name in IGNORED_FIELDS:
+            continue
+        before, after = old.get(name), new.get(name)
+        # A probe that failed on one side says nothing about the hardware
+        if ignore_failures and (isinstance(before, FieldError) or isinstance(after, FieldError)):
+            continue
+        if name in LIST_FIELDS and isinstance(before, list) and isinstance(after, list):
+            change = diff_items(before, after)
+        else:
+            change = {"old": encode(before), "new": encode(after)} if before != after else None
+        if change:
+            changes[name] = change
+    return changes
+
+def make_delta(old, new, ignore_failures=True):
+    return {
+        "System Name": new.system_name,
+        "From": old.collected_at,
+        "To": new.collected_at,
+        "Changes": diff_snapshots(old, new, ignore_failures),
+    }
+
+def apply_delta(base, delta):
+    # Rebuild the newer snapshot from the older one and a delta
+    snapshot = Snapshot.from_dict(base.to_dict())
+    for name, change in delta["Changes"].items():
+        if "new" in change:
+            snapshot.set(name, decode(name, change["new"]))
+            continue
+        items = list(base.get(name))
+        for item in decode(name, change["removed"]):
+            items.remove(item)
+        snapshot.set(name, items + decode(name, change["added"]))
+    if delta.get("To"):
+        snapshot.collected_at = delta["To"]
+    return snapshot
+
+def diff_series(snapshots, ignore_failures=True):
+    # Deltas between consecutive snapshots of one host (oldest first),
+    # leaving out collections where nothing changed
+    ordered = sorted(snapshots, key=lambda snapshot: snapshot.collected_at or "")
+    deltas = []
+    for old, new in zip(ordered, ordered[1:]):
+        delta = make_delta(old, new, ignore_failures)
+        if delta["Changes"]:
+            deltas.append(delta)
+    return deltas
+
+def diff_stream(snapshots, ignore_failures=True):
+    # diff_series for an interleaved stream of many hosts, one pass: keeps only
+    # the newest snapshot seen per host. Snapshots older than that are skipped.
+    latest = {}
+    for snapshot in snapshots:
+        host = snapshot.system_name
+        previous = latest.get(host)
+        if previous is not None and (snapshot.collected_at or "") < (previous.collected_at or ""):
+            continue
+        latest[host] = snapshot
+        if previous is not None:
+            delta = make_delta(previous, snapshot, ignore_failures)
+            if delta["Changes"]:
+                yield delta
+
+def diff_against_store(snapshots, store, ignore_failures=True):
+    # For each new snapshot, the delta to the latest stored one of that host;
+    # unseen hosts come back with every field as a change
+    for snapshot in snapshots:
+        previous = store.latest(snapshot.system_name)
+        delta = make_delta(previous or Snapshot(), snapshot, ignore_failures)
+        if delta["Changes"]:
+            yield delta
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show only what changed between snapshots.")
+    parser.add_argument("inputs", nargs="*", help="two snapshot files (old, new), or new snapshots with --against-store")
+    parser.add_argument("--history", metavar="SYSTEM_NAME", help="changes over the stored history of one host")
+    parser.add_argument("--against-store", action="store_true", help="compare new snapshots with the latest stored ones")
+    parser.add_argument("--db", default=None, help="snapshot store to use with --history/--against-store")
+    parser.add_argument("--include-failures", action="store_true", help="also report fields whose probe failed")
+    parser.add_argument("--pdf", help="also render the changes as a PDF report")
+    args = parser.parse_args(argv)
+    ignore = not args.include_failures
+
+    from snapshot_files import iter_snapshots
+    if args.history or args.against_store:
+        from snapshot_store import SnapshotStore
+        with SnapshotStore(args.db) as store:
+            if args.history:
+                deltas = diff_series(store.history(args.history), ignore)
+            else:
+                deltas = list(diff_against_store(iter_snapshots(args.inputs), store, ignore))
+    else:
+        snapshots = [snapshot for path in args.inputs for snapshot in iter_snapshots([path])]
+        if len(snapshots) < 2:
+            parser.error("give two snapshot files to compare")
+        delta = make_delta(snapshots[0], snapshots[-1], ignore)
+        deltas = [delta] if delta["Changes"] else []
+
+    for delta in deltas:
+        print(json.dumps(delta, ensure_ascii=False))
+    if args.pdf:
+        from report import get_template
+        get_template().render_changes(deltas, args.pdf)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
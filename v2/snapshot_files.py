@@ -0,0 +1,65 @@
+import os
+import json
+from records import Snapshot, FIELD_ATTRS, snapshot_from_info, TABLE_FIELDS
+
+# Reading stored snapshots back: .json files (one object or a list) and .ndjson
+# files (one object per line), as written by headless.py and fleet.py. Records
+# are typed (Snapshot.to_dict()); files written before that hold display text,
+# which is parsed back once as they are read.
+SNAPSHOT_EXTENSIONS = (".json", ".ndjson", ".jsonl")
+
+def iter_snapshot_paths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(SNAPSHOT_EXTENSIONS):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+def is_raw_record(record):
+    # Typed (Snapshot.to_dict()), rather than display text; display records
+    # never hold null
+    return ("Errors" in record or isinstance(record.get("RAM"), int) or isinstance(record.get("CPU Details"), dict)
+            or any(record[name] is None for name in FIELD_ATTRS if name in record)
+            or any(isinstance(item, dict) for name in TABLE_FIELDS for item in record.get(name) or []))
+
+def normalize_snapshot(record):
+    # A display record of an older file in the gather_info() shape: table rows
+    # as tuples, every field present. Version 1 reports the BIOS serial as
+    # "CPU Tag Number".
+    if "Serial Number" not in record and "CPU Tag Number" in record:
+        record = dict(record, **{"Serial Number": record["CPU Tag Number"]})
+    info = {name: record.get(name, "") for name in FIELD_ATTRS}
+    for name in TABLE_FIELDS:
+        info[name] = [tuple(row) for row in record.get(name) or []]
+    if record.get("Collected At"):
+        info["Collected At"] = record["Collected At"]
+    return info
+
+def load_snapshot(record):
+    # Typed form (records.Snapshot) of any stored record: typed records as they
+    # are; display records from older files parsed back once ("16.00 GB" -> bytes)
+    if not isinstance(record, dict) or "System Name" not in record:
+        return None
+    if is_raw_record(record):
+        return Snapshot.from_dict(record)
+    return snapshot_from_info(normalize_snapshot(record))
+
+def iter_records(path):
+    with open(path, encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            data = json.load(f)
+            yield from data if isinstance(data, list) else [data]
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def iter_snapshots(paths):
+    # Typed snapshots (records.Snapshot) from snapshot files and directories
+    for path in iter_snapshot_paths(paths):
+        for record in iter_records(path):
+            snapshot = load_snapshot(record)
+            if snapshot is not None:
+                yield snapshot
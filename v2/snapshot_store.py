@@ -0,0 +1,220 @@
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import datetime
+import threading
+from records import Snapshot, TABLE_FIELDS, UNPERSISTED_FIELDS, snapshot_from_info
+
+# Persistent history of collected snapshots (SQLite). Lookups by host, BIOS
+# serial and time go through indexes; the latest snapshot of every host is
+# kept in its own small table so "latest per host" never scans history.
+# Each snapshot is stored typed, as Snapshot.to_dict() JSON in `record`,
+# without the UNPERSISTED_FIELDS (the product key).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    system_name TEXT NOT NULL,
+    serial_number TEXT,
+    collected_at TEXT NOT NULL,
+    record TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_host_time ON snapshots (system_name, collected_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_serial_time ON snapshots (serial_number, collected_at);
+CREATE INDEX IF NOT EXISTS idx_snapshots_time ON snapshots (collected_at);
+CREATE TABLE IF NOT EXISTS latest (
+    system_name TEXT PRIMARY KEY,
+    snapshot_id INTEGER NOT NULL,
+    collected_at TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Databases written before `record` hold display text, one column per
+# gather_info() key; their rows are parsed back as they are read
+LEGACY_COLUMNS = {
+    "System Name": "system_name",
+    "IP Address": "ip_address",
+    "Network Adapters": "network_adapters",
+    "RAM": "ram",
+    "CPU Model Name": "cpu_model_name",
+    "CPU Details": "cpu_details",
+    "Serial Number": "serial_number",
+    "Product Key": "product_key",
+    "Monitor Details": "monitor_details",
+    "Disks": "disks",
+    "OS Name": "os_name",
+    "OS Status": "os_status",
+}
+# Columns added after the first release, for databases created before them
+ADDED_COLUMNS = ("record",)
+
+INSERT_SNAPSHOT = ("INSERT INTO snapshots (collected_at, system_name, serial_number, record) "
+                   "VALUES (?, ?, ?, ?)")
+UPSERT_LATEST = """
+INSERT INTO latest (system_name, snapshot_id, collected_at) VALUES (?, ?, ?)
+ON CONFLICT (system_name) DO UPDATE SET snapshot_id = excluded.snapshot_id, collected_at = excluded.collected_at
+WHERE excluded.collected_at >= latest.collected_at
+"""
+
+def default_store_path():
+    # snapshot_cache brings in the collectors; only the default path needs it
+    from snapshot_cache import app_data_dir
+    return os.path.join(app_data_dir(), "snapshots.db")
+
+def utc_timestamp(value=None):
+    # Every timestamp is stored as UTC ISO-8601 text, so text order is time order
+    if value is None:
+        moment = datetime.datetime.now(datetime.timezone.utc)
+    elif isinstance(value, datetime.datetime):
+        moment = value
+    else:
+        moment = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment.astimezone(datetime.timezone.utc).isoformat(timespec="seconds")
+
+def snapshot_row(snapshot):
+    # snapshot: a records.Snapshot, or any stored record (snapshot_files.load_snapshot)
+    if not isinstance(snapshot, Snapshot):
+        from snapshot_files import load_snapshot
+        snapshot = load_snapshot(snapshot)
+    record = snapshot.to_dict()
+    record["Collected At"] = utc_timestamp(snapshot.collected_at)
+    for name in UNPERSISTED_FIELDS:
+        record.pop(name, None)
+        record.get("Errors", {}).pop(name, None)
+    return [record["Collected At"], snapshot.system_name or "", snapshot.serial_number,
+            json.dumps(record, ensure_ascii=False, separators=(",", ":"))]
+
+def row_snapshot(row, legacy):
+    # (id, collected_at, record, *legacy columns)
+    if row[2] is not None:
+        return Snapshot.from_dict(json.loads(row[2]))
+    info = {"Collected At": row[1]}
+    for key, value in zip(legacy, row[3:]):
+        info[key] = [tuple(item) for item in json.loads(value or "[]")] if key in TABLE_FIELDS else value or ""
+    return snapshot_from_info(info)
+
+class SnapshotStore:
+    def __init__(self, path=None):
+        self.path = path or default_store_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.execute("PRAGMA synchronous = NORMAL")
+        self.db.executescript(SCHEMA)
+        existing = {row[1] for row in self.db.execute("PRAGMA table_info(snapshots)")}
+        for column in ADDED_COLUMNS:
+            if column not in existing:
+                self.db.execute(f"ALTER TABLE snapshots ADD COLUMN {column} TEXT")
+        # gather_info() keys of the display columns of a legacy database
+        self.legacy = [key for key, column in LEGACY_COLUMNS.items() if column in existing] if "ram" in existing else []
+        self.columns = ["id", "collected_at", "record"] + [LEGACY_COLUMNS[key] for key in self.legacy]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+    def add(self, snapshot):
+        return self.add_many([snapshot])[0]
+
+    def add_many(self, snapshots, batch_size=5000):
+        return list(self.iter_add(snapshots, batch_size))
+
+    def iter_add(self, snapshots, batch_size=5000):
+        # One transaction per batch: a single fsync for thousands of rows.
+        # Yields the new ids batch by batch, so a stream of any length is
+        # stored with one batch in memory.
+        batch = []
+        for snapshot in snapshots:
+            batch.append(snapshot_row(snapshot))
+            if len(batch) >= batch_size:
+                yield from self.write_batch(batch)
+                batch = []
+        if batch:
+            yield from self.write_batch(batch)
+
+    def write_batch(self, rows):
+        ids = []
+        with self.lock, self.db:
+            cursor = self.db.cursor()
+            latest = {}
+            for row in rows:
+                cursor.execute(INSERT_SNAPSHOT, row)
+                ids.append(cursor.lastrowid)
+                host, collected_at = row[1], row[0]
+                if host not in latest or collected_at >= latest[host][1]:
+                    latest[host] = (cursor.lastrowid, collected_at)
+            cursor.executemany(UPSERT_LATEST, [(host, sid, at) for host, (sid, at) in latest.items()])
+        return ids
+
+    def query(self, sql, params=()):
+        with self.lock:
+            return [row_snapshot(row, self.legacy) for row in self.db.execute(sql, params)]
+
+    def find_by_serial(self, serial, limit=None):
+        # Which machine(s) had this BIOS serial, newest first
+        sql = f"SELECT {', '.join(self.columns)} FROM snapshots WHERE serial_number = ? ORDER BY collected_at DESC"
+        return self.query(sql + (" LIMIT ?" if limit else ""), (serial, limit) if limit else (serial,))
+
+    def history(self, system_name, limit=None):
+        sql = f"SELECT {', '.join(self.columns)} FROM snapshots WHERE system_name = ? ORDER BY collected_at DESC"
+        return self.query(sql + (" LIMIT ?" if limit else ""), (system_name, limit) if limit else (system_name,))
+
+    def latest(self, system_name):
+        rows = self.history(system_name, limit=1)
+        return rows[0] if rows else None
+
+    def latest_per_host(self):
+        sql = (f"SELECT {', '.join('s.' + column for column in self.columns)} "
+               "FROM latest l JOIN snapshots s ON s.id = l.snapshot_id ORDER BY l.system_name")
+        return self.query(sql)
+
+    def between(self, start, end):
+        sql = f"SELECT {', '.join(self.columns)} FROM snapshots WHERE collected_at >= ? AND collected_at < ? ORDER BY collected_at"
+        return self.query(sql, (utc_timestamp(start), utc_timestamp(end)))
+
+    def count(self):
+        with self.lock:
+            return self.db.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or fill the local snapshot history.")
+    parser.add_argument("--db", default=None, help=f"database file (default: {default_store_path()})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    add = sub.add_parser("import", help="import JSON/NDJSON snapshot files or directories")
+    add.add_argument("inputs", nargs="+")
+    serial = sub.add_parser("serial", help="snapshots that had this BIOS serial")
+    serial.add_argument("serial")
+    host = sub.add_parser("history", help="snapshots of one host, newest first")
+    host.add_argument("system_name")
+    sub.add_parser("latest", help="latest snapshot of every host")
+    args = parser.parse_args(argv)
+
+    with SnapshotStore(args.db) as store:
+        if args.command == "import":
+            from snapshot_files import iter_snapshots
+            count = sum(1 for _ in store.iter_add(iter_snapshots(args.inputs)))
+            print(f"imported {count} snapshot(s); {store.count()} in store", file=sys.stderr)
+            return 0
+        if args.command == "serial":
+            rows = store.find_by_serial(args.serial)
+        elif args.command == "history":
+            rows = store.history(args.system_name)
+        else:
+            rows = store.latest_per_host()
+        for snapshot in rows:
+            print(json.dumps(snapshot.to_dict(), ensure_ascii=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
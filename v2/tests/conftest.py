@@ -0,0 +1,24 @@
+import os
+import sys
+import pytest
+
+# The v2 modules are imported by bare name, as the app and benchmarks do
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+V2_DIR = os.path.dirname(TESTS_DIR)
+sys.path.insert(0, V2_DIR)
+sys.path.insert(0, os.path.join(V2_DIR, "benchmarks"))
+
+import backends
+import collectors
+from fake_powershell import make_replay_runner
+
+@pytest.fixture
+def replay_powershell():
+    # Recorded PowerShell output (benchmarks/fixtures), replayed in process,
+    # through the PowerShell backend
+    runner = make_replay_runner(spawn=False)
+    previous_runner = collectors.set_command_runner(runner)
+    previous_backend = backends.set_backend(backends.PowerShellBackend())
+    yield runner
+    collectors.set_command_runner(previous_runner)
+    backends.set_backend(previous_backend)
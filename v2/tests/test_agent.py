@@ -0,0 +1,62 @@
+import json
+import asyncio
+from agent import Agent, SnapshotPublisher
+from records import Snapshot, Disk
+
+class FakeCache:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.calls = 0
+
+    def get(self):
+        self.calls += 1
+        return self.snapshot
+
+def test_etag_and_not_modified():
+    snapshot = Snapshot(system_name="PC-0001", ram_bytes=8 * 1024 ** 3, disks=[Disk("SSD", 512 * 10 ** 9, "SSD")])
+    cache = FakeCache(snapshot)
+    publisher = SnapshotPublisher(cache, max_age=3600)
+    agent = Agent(publisher)
+
+    async def run():
+        status, headers, body = await agent.respond("GET", "/snapshot", {})
+        assert status == 200 and json.loads(body)["RAM"] == 8 * 1024 ** 3
+        etag = headers["ETag"]
+        assert etag.startswith('W/"')
+        # Strong or weak form of the tag, in a list, or "*": bodiless 304
+        for header in (etag, etag[2:], f'"other", {etag}', "*"):
+            status, headers, body = await agent.respond("GET", "/snapshot", {"if-none-match": header})
+            assert (status, body, headers["ETag"]) == (304, b"", etag)
+        status, _, body = await agent.respond("GET", "/snapshot", {"if-none-match": '"other"'})
+        assert status == 200 and body
+        # Served from the published snapshot: one collection only
+        assert cache.calls == publisher.collections == 1
+
+        # The machine changes: the next collection gets a new tag and a 200
+        cache.snapshot = Snapshot(system_name="PC-0001", ram_bytes=16 * 1024 ** 3)
+        await publisher.refresh()
+        status, headers, body = await agent.respond("GET", "/snapshot", {"if-none-match": etag})
+        assert status == 200 and headers["ETag"] != etag and json.loads(body)["RAM"] == 16 * 1024 ** 3
+        assert cache.calls == 2
+
+    asyncio.run(run())
+
+def test_same_snapshot_keeps_its_etag():
+    # The tag ignores the collection time
+    cache = FakeCache(Snapshot(system_name="PC-0001"))
+    publisher = SnapshotPublisher(cache, max_age=3600)
+
+    async def run():
+        await publisher.refresh()
+        etag = publisher.etag
+        await publisher.refresh()
+        return etag
+
+    assert asyncio.run(run()) == publisher.etag and cache.calls == 2
+
+def test_token_required():
+    agent = Agent(SnapshotPublisher(FakeCache(Snapshot(system_name="PC-0001"))), token="secret")
+    status, _, _ = asyncio.run(agent.respond("GET", "/snapshot", {"authorization": "Bearer wrong"}))
+    assert status == 401
+    status, _, _ = asyncio.run(agent.respond("GET", "/snapshot", {"authorization": "Bearer secret"}))
+    assert status == 200
@@ -0,0 +1,129 @@
+import pytest
+import backends
+import collectors
+from records import Cpu, Disk, Monitor, FieldError
+
+# --------- Selection ---------
+def fakes(**available):
+    # A backends table of fakes: {name: factory}, available or not per name
+    return {name: (lambda name=name, ok=ok: backends.FakeBackend({"model": name}, available=ok))
+            for name, ok in available.items()}
+
+def test_auto_picks_first_available_in_order():
+    backend = backends.select_backend("auto", fakes(wmi=False, linux=True, powershell=True))
+    assert backend.values == {"model": "linux"}
+
+def test_auto_falls_back_to_powershell():
+    backend = backends.select_backend("auto", fakes(wmi=False, linux=False, powershell=False))
+    assert isinstance(backend, backends.PowerShellBackend)
+
+def test_named_backend_must_be_available():
+    with pytest.raises(RuntimeError):
+        backends.select_backend("wmi", fakes(wmi=False, linux=True, powershell=True))
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        backends.select_backend("nope", fakes(wmi=True, linux=True, powershell=True))
+
+@pytest.fixture
+def fresh_selection():
+    previous = backends.set_backend(None)
+    yield
+    backends.set_backend(previous)
+
+def test_env_override(monkeypatch, fresh_selection):
+    monkeypatch.setitem(backends.BACKENDS, "fake", backends.FakeBackend)
+    monkeypatch.setenv(backends.BACKEND_ENV, "fake")
+    assert isinstance(backends.get_backend(), backends.FakeBackend)
+
+def test_env_override_unavailable(monkeypatch, fresh_selection):
+    monkeypatch.setitem(backends.BACKENDS, "fake", lambda: backends.FakeBackend(available=False))
+    monkeypatch.setenv(backends.BACKEND_ENV, "fake")
+    with pytest.raises(RuntimeError):
+        backends.get_backend()
+
+def test_query_falls_back_when_backend_fails(fresh_selection):
+    class Fallback(backends.FakeBackend):
+        def __init__(self):
+            super().__init__({"serial": "FROM-FALLBACK"})
+    backends.set_backend(backends.FakeBackend(error=OSError("RPC server unavailable")))
+    result = backends.query(["serial"], fallback=Fallback)
+    assert result == {"serial": {"ok": True, "value": "FROM-FALLBACK"}}
+
+# --------- WMI COM mapping ---------
+class Item:
+    def __init__(self, **properties):
+        self.__dict__.update(properties)
+
+class FakeServices:
+    # Imitates SWbemServices.ExecQuery: rows by WMI class; a class mapped to an
+    # exception raises it, as a missing provider does
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def ExecQuery(self, wql):
+        self.queries.append(wql)
+        rows = self.rows.get(wql.split(" FROM ")[1], [])
+        if isinstance(rows, Exception):
+            raise rows
+        return rows
+
+def ids(text):
+    # WmiMonitorID strings: character codes padded with zeros
+    return [ord(c) for c in text] + [0, 0]
+
+WMI_ROWS = {
+    backends.CIMV2: {
+        "Win32_ComputerSystem": [Item(Model="OptiPlex 7090")],
+        "Win32_Processor": [Item(Name="Intel(R) Core(TM) i5-10500", MaxClockSpeed=3100, NumberOfCores=6,
+                                 NumberOfLogicalProcessors=12)],
+        "Win32_BIOS": [Item(SerialNumber="5CD1234")],
+        "SoftwareLicensingService": [Item(OA3xOriginalProductKey="AAAAA-BBBBB-CCCCC-DDDDD-EEEEE")],
+        "Win32_DiskDrive": [Item(Model="WDC PC SN730", Size="256052966400")],
+    },
+    backends.STORAGE: {"MSFT_PhysicalDisk": OSError("Invalid namespace")},
+    backends.WMI: {"WmiMonitorID": [Item(ManufacturerName=ids("DEL"), UserFriendlyName=ids("DELL P2419H"),
+                                         ProductCodeID=ids("A0C4"), SerialNumberID=ids("7XYZ123"))]},
+}
+
+def test_wmi_com_result_mapping():
+    services = {namespace: FakeServices(rows) for namespace, rows in WMI_ROWS.items()}
+    backend = backends.WmiComBackend(connect=services.__getitem__)
+    try:
+        values = collectors.parse_batch(backend.query(collectors.BATCH_PROBES))
+    finally:
+        backend.close()
+    assert values["CPU Model Name"] == "OptiPlex 7090"
+    assert values["CPU Details"] == Cpu("Intel(R) Core(TM) i5-10500", 3100, 6, 12)
+    assert values["Serial Number"] == "5CD1234"
+    assert values["Product Key"] == "AAAAA-BBBBB-CCCCC-DDDDD-EEEEE"
+    # No Storage namespace: Win32_DiskDrive, without a media type
+    assert values["Disks"] == [Disk("WDC PC SN730", 256052966400, "Unknown")]
+    assert values["Monitor Details"] == [Monitor("DEL", "DELL P2419H", "A0C4", "7XYZ123")]
+
+def test_wmi_com_failed_query_is_a_field_error():
+    rows = dict(WMI_ROWS[backends.CIMV2], Win32_BIOS=OSError("Access denied"))
+    backend = backends.WmiComBackend(connect=lambda namespace: FakeServices(rows))
+    try:
+        values = collectors.parse_batch(backend.query(["serial", "model"]))
+    finally:
+        backend.close()
+    assert values["Serial Number"] == FieldError("error", "Access denied")
+    assert values["CPU Model Name"] == "OptiPlex 7090"
+
+# --------- PowerShell ---------
+def test_powershell_backend_parses_replayed_batch(replay_powershell):
+    streamed = []
+    document = backends.PowerShellBackend().query(collectors.BATCH_PROBES, lambda key, probe: streamed.append(key))
+    values = collectors.parse_batch(document)
+    assert sorted(streamed) == sorted(collectors.BATCH_PROBES)
+    assert values["Serial Number"] == "8CG0123XYZ"
+    assert values["CPU Details"].cores == 8
+    assert [disk.media_type for disk in values["Disks"]] == ["SSD", "HDD"]
+
+@pytest.mark.parametrize("key", ["serial", "disks", "monitors"])
+def test_powershell_backend_single_key(replay_powershell, key):
+    document = backends.PowerShellBackend().query([key])
+    assert list(document) == [key]
+    assert document[key]["ok"]
@@ -0,0 +1,25 @@
+import json
+import collectors
+from records import FieldError
+
+def test_load_batch_single_probe_line():
+    # One probe is one line, which is also a complete JSON document
+    line = json.dumps({"key": "serial", "ok": True, "value": "8CG0123XYZ", "ms": 3})
+    assert collectors.load_batch(line) == {"serial": {"ok": True, "value": "8CG0123XYZ", "ms": 3}}
+
+def test_load_batch_document_and_lines():
+    document = json.dumps({"serial": {"ok": True, "value": "A"}, "product_key": {"ok": False, "error": "x"}})
+    assert collectors.load_batch(document)["product_key"] == {"ok": False, "error": "x"}
+    lines = "\n".join(json.dumps(dict(probe, key=key)) for key, probe in json.loads(document).items())
+    assert collectors.load_batch(lines) == json.loads(document)
+
+def test_single_field_batch(replay_powershell):
+    assert collectors.get_wmi_details(fields=["Serial Number"]) == {"Serial Number": "8CG0123XYZ"}
+    assert collectors.get_serial_number() == "8CG0123XYZ"
+    assert replay_powershell.calls == ["batch", "batch"]
+
+def test_single_field_snapshot(replay_powershell):
+    snapshot = collectors.collect_snapshot(fields=["Monitor Details"])
+    assert not isinstance(snapshot.get("Monitor Details"), FieldError)
+    assert snapshot.monitors
+    assert snapshot.errors == {}
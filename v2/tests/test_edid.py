@@ -0,0 +1,85 @@
+import edid
+from edid import parse_edid, parse_edids, drm_edids
+from records import Monitor
+
+def text_descriptor(tag, text):
+    # 13 bytes of text: ended by a line feed, then padded with spaces
+    body = (text.encode("cp437") + b"\n").ljust(13, b" ")[:13]
+    return bytes([0, 0, 0, tag, 0]) + body
+
+def timing_descriptor():
+    # A detailed timing (pixel clock first, so never three zero bytes)
+    return bytes([0x3A, 0x02]) + bytes(16)
+
+def make_edid(manufacturer="DEL", product_code=0xA0EC, serial_number=0x01020304, week=12, year=2021,
+              size_cm=(53, 30), descriptors=()):
+    block = bytearray(edid.BLOCK_SIZE)
+    block[:8] = edid.EDID_HEADER
+    letters = [ord(letter) - 64 for letter in manufacturer]
+    packed = letters[0] << 10 | letters[1] << 5 | letters[2]
+    block[8:10] = packed.to_bytes(2, "big")
+    block[10:12] = product_code.to_bytes(2, "little")
+    block[12:16] = serial_number.to_bytes(4, "little")
+    block[16], block[17] = week, year - 1990 if year else 0
+    block[21], block[22] = size_cm
+    descriptors = list(descriptors) + [timing_descriptor()] * (4 - len(descriptors))
+    for offset, descriptor in zip(edid.DESCRIPTORS, descriptors):
+        block[offset:offset + 18] = descriptor
+    block[127] = -sum(block[:127]) & 0xFF
+    return bytes(block)
+
+def test_valid_block():
+    data = make_edid(descriptors=[text_descriptor(edid.NAME_TAG, "DELL U2421E"),
+                                  text_descriptor(edid.SERIAL_TAG, "CN0ABC123")])
+    expected = Monitor("DEL", "DELL U2421E", "A0EC", "CN0ABC123", 12, 2021, 53, 30)
+    assert parse_edid(data, verify_checksum=True) == expected
+
+def test_numeric_serial_without_serial_descriptor():
+    monitor = parse_edid(make_edid(serial_number=16909060))
+    assert monitor.serial == "16909060" and monitor.product is None
+
+def test_text_descriptors_padding():
+    # A full 13-character name has no line feed; a short one is padded after it
+    data = make_edid(descriptors=[text_descriptor(edid.NAME_TAG, "ABCDEFGHIJKLM"),
+                                  text_descriptor(edid.SERIAL_TAG, " 42 ")])
+    monitor = parse_edid(data)
+    assert (monitor.product, monitor.serial) == ("ABCDEFGHIJKLM", "42")
+    # A blank serial descriptor falls back to the numeric serial
+    monitor = parse_edid(make_edid(serial_number=7, descriptors=[text_descriptor(edid.SERIAL_TAG, "")]))
+    assert monitor.serial == "7"
+
+def test_unknown_dates_and_size():
+    # Week 0xFF marks a model year; zero size means a projector or unknown
+    monitor = parse_edid(make_edid(week=0xFF, year=2020, size_cm=(0, 0), serial_number=0))
+    assert (monitor.week, monitor.year, monitor.width_cm, monitor.height_cm) == (None, 2020, None, None)
+    assert monitor.serial is None
+
+def test_bad_checksum():
+    data = bytearray(make_edid())
+    data[127] ^= 0xFF
+    assert parse_edid(bytes(data), verify_checksum=True) is None
+    # Off by default: the rest of the block is still good
+    assert parse_edid(bytes(data)).manufacturer == "DEL"
+
+def test_bad_header():
+    data = bytearray(make_edid())
+    data[0] = 0xFF
+    assert parse_edid(bytes(data)) is None
+
+def test_truncated():
+    data = make_edid()
+    assert parse_edid(data[:edid.BLOCK_SIZE - 1]) is None
+    assert parse_edid(b"") is None
+    # Extension blocks after the base block are ignored
+    assert parse_edid(data + bytes(128), verify_checksum=True).product_code == "A0EC"
+
+def test_parse_edids_skips_bad_blobs():
+    monitors = parse_edids([make_edid(manufacturer="SAM"), b"\x00" * 8, make_edid(manufacturer="GSM")])
+    assert [monitor.manufacturer for monitor in monitors] == ["SAM", "GSM"]
+
+def test_drm_edids(tmp_path):
+    # Disconnected connectors have an empty edid file
+    for connector, data in (("card0-HDMI-A-1", make_edid()), ("card0-DP-1", b"")):
+        (tmp_path / "sys/class/drm" / connector).mkdir(parents=True)
+        (tmp_path / "sys/class/drm" / connector / "edid").write_bytes(data)
+    assert list(drm_edids(str(tmp_path))) == [make_edid()]
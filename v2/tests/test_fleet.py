@@ -0,0 +1,139 @@
+import sys
+import time
+import threading
+import subprocess
+import scheduler
+import fleet
+from records import Snapshot
+
+def answer(host):
+    return Snapshot(system_name=host.upper(), ram_bytes=16 * 1024 ** 3, os_name="Windows 11")
+
+def collect(hosts, collect_host, **options):
+    options = dict({"workers": 4, "timeout": 5, "retries": 0, "retry_delay": 0}, **options)
+    return fleet.collect_fleet(hosts, fleet.LocalTransport(collect_host), **options)
+
+def test_concurrency_limited_to_workers():
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def slow(host):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return answer(host)
+
+    results = collect([f"pc-{n}" for n in range(12)], slow, workers=3)
+    assert len(results.succeeded()) == 12
+    assert peak[0] == 3
+
+def test_per_host_timeout():
+    def collect_host(host):
+        if host == "slow":
+            # As run_powershell does: wait out the deadline the engine set for this host
+            time.sleep(scheduler.remaining_time())
+            raise subprocess.TimeoutExpired("powershell", 0.2)
+        return answer(host)
+
+    start = time.monotonic()
+    results = collect(["fast", "slow"], collect_host, timeout=0.2)
+    by_host = {r["host"]: r for r in results.results}
+    assert by_host["fast"]["status"] == fleet.STATUS_OK
+    assert by_host["slow"]["status"] == fleet.STATUS_TIMED_OUT
+    assert by_host["slow"]["error"] == "No answer within 0.2 s"
+    assert by_host["slow"]["snapshot"] is None
+    assert time.monotonic() - start < 2
+
+def test_failures_are_reported_after_retries():
+    attempts = {}
+
+    def collect_host(host):
+        attempts[host] = attempts.get(host, 0) + 1
+        if host == "down":
+            raise ConnectionError("WinRM cannot complete the operation")
+        if host == "flaky" and attempts[host] == 1:
+            raise OSError("The RPC server is unavailable")
+        return answer(host)
+
+    results = collect(["down", "flaky", "up"], collect_host, retries=2)
+    by_host = {r["host"]: r for r in results.results}
+    assert (by_host["down"]["status"], by_host["down"]["attempts"]) == (fleet.STATUS_FAILED, 3)
+    assert by_host["down"]["error"] == "WinRM cannot complete the operation"
+    assert (by_host["flaky"]["status"], by_host["flaky"]["attempts"]) == (fleet.STATUS_OK, 2)
+    assert (by_host["up"]["status"], by_host["up"]["attempts"]) == (fleet.STATUS_OK, 1)
+
+def test_results_are_aggregated():
+    def collect_host(host):
+        if host.startswith("bad"):
+            raise RuntimeError("unreachable")
+        return answer(host)
+
+    seen = []
+    hosts = ["pc-1", "pc-2", "bad-1", "pc-1", "pc-3"]
+    results = collect(hosts, collect_host, on_result=lambda result: seen.append(result["host"]))
+    # Repeated hosts are collected once
+    assert sorted(seen) == ["bad-1", "pc-1", "pc-2", "pc-3"]
+    assert results.counts == {fleet.STATUS_OK: 3, fleet.STATUS_FAILED: 1}
+    assert sorted(r["host"] for r in results.succeeded()) == ["pc-1", "pc-2", "pc-3"]
+    assert [r["host"] for r in results.failed()] == ["bad-1"]
+    assert "4 host(s)" in results.summary() and "failed: 1, ok: 3" in results.summary()
+    result = next(r for r in results.results if r["host"] == "pc-2")
+    record = fleet.result_record(result)
+    assert (record["Host"], record["Status"], record["Attempts"]) == ("pc-2", "ok", 1)
+    # Typed by default; display text for CSV
+    assert (record["System Name"], record["RAM"]) == ("PC-2", 16 * 1024 ** 3)
+    assert fleet.result_record(result, display=True)["RAM"] == "16.00 GB"
+    assert set(fleet.FLEET_COLUMNS) <= set(fleet.result_record(result, display=True))
+
+def test_cancelled_hosts():
+    cancel = threading.Event()
+    cancel.set()
+    results = collect(["pc-1", "pc-2"], answer, cancel_event=cancel)
+    assert results.counts == {fleet.STATUS_CANCELLED: 2}
+
+# Speaks the PowerShell worker protocol: one base64 script per line, output,
+# then the done marker. Hosts named down-* fail, hang-* never answer.
+FAKE_WORKER = r"""
+import os, re, sys, json, time, base64
+for line in sys.stdin:
+    host = re.search(r"-ComputerName '([^']*)'", base64.b64decode(line).decode()).group(1)
+    if host.startswith("hang"):
+        time.sleep(60)
+    if host.startswith("down"):
+        print("#asset-info-done# error WinRM cannot complete the operation", flush=True)
+        continue
+    ok = lambda value: {"ok": True, "value": value}
+    print(json.dumps({"name": ok(host.upper()), "ram": ok(17179869184), "os": ok(f"pid {os.getpid()}")}))
+    print("#asset-info-done# ok", flush=True)
+"""
+
+def test_cim_hosts_share_powershell_workers():
+    transport = fleet.CimSessionTransport(fleet.PowerShellPool([sys.executable, "-c", FAKE_WORKER]))
+    hosts = [f"pc-{n}" for n in range(40)] + ["down-1"]
+    try:
+        results = fleet.collect_fleet(hosts, transport, workers=4, timeout=10, retries=0)
+    finally:
+        transport.close()
+    assert results.counts == {fleet.STATUS_OK: 40, fleet.STATUS_FAILED: 1}
+    assert results.failed()[0]["error"] == "WinRM cannot complete the operation"
+    assert {r["snapshot"].system_name for r in results.succeeded()} == {host.upper() for host in hosts[:40]}
+    # 41 hosts, at most 4 processes
+    pids = {r["snapshot"].os_name for r in results.succeeded()}
+    assert len(pids) <= transport.pool.spawned <= 4
+    assert not transport.pool.workers
+
+def test_cim_worker_killed_on_timeout():
+    pool = fleet.PowerShellPool([sys.executable, "-c", FAKE_WORKER])
+    transport = fleet.CimSessionTransport(pool)
+    try:
+        results = fleet.collect_fleet(["hang-1", "pc-1"], transport, workers=1, timeout=0.5, retries=0)
+        by_host = {r["host"]: r for r in results.results}
+        assert by_host["hang-1"]["status"] == fleet.STATUS_TIMED_OUT
+        # The hung worker is not handed to the next host
+        assert by_host["pc-1"]["status"] == fleet.STATUS_OK and pool.spawned == 2
+        assert len(pool.workers) == 1
+    finally:
+        transport.close()
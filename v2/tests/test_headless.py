@@ -0,0 +1,19 @@
+import sys
+import json
+import headless
+
+def test_windowed_exe_needs_an_output_file(monkeypatch, tmp_path, replay_powershell):
+    # The windowed EXE has no stdout: refuse before collecting, and say how
+    monkeypatch.setattr(sys, "stdout", None)
+    assert headless.main([]) == 2
+    assert replay_powershell.calls == []
+    output = tmp_path / "asset.json"
+    assert headless.main(["--output", str(output)]) == 0
+    assert json.loads(output.read_text(encoding="utf-8"))["Serial Number"] == "8CG0123XYZ"
+
+def test_records_are_typed_unless_display(tmp_path, replay_powershell):
+    typed, display = tmp_path / "typed.json", tmp_path / "display.json"
+    assert headless.main(["--output", str(typed)]) == headless.main(["--output", str(display), "--display"]) == 0
+    typed, display = (json.loads(path.read_text(encoding="utf-8")) for path in (typed, display))
+    assert isinstance(typed["RAM"], int) and isinstance(typed["Disks"][0]["size_bytes"], int)
+    assert display["RAM"].endswith(" GB") and display["Disks"][0][1].endswith(" GB")
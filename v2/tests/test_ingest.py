@@ -0,0 +1,56 @@
+import json
+import pytest
+from ingest import ingest, fan_out, IngestStats
+from records import Snapshot, Disk
+
+def write_ndjson(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return str(path)
+
+def record(name, collected_at="2026-01-01T09:00:00+00:00"):
+    return json.dumps(Snapshot(system_name=name, ram_bytes=8 * 1024 ** 3, collected_at=collected_at,
+                               disks=[Disk("Samsung SSD", 512 * 10 ** 9, "SSD")]).to_dict())
+
+def test_stream_with_bad_lines(tmp_path):
+    path = write_ndjson(tmp_path / "fleet.ndjson", [
+        record("PC-0001"),
+        "{not json",
+        "",
+        json.dumps({"RAM": 1}),
+        json.dumps({"Host": "pc-0404", "Status": "timed out"}),
+        json.dumps({"System Name": "PC-0002", "Collected At": "yesterday"}),
+        "x" * 3000,
+        # A display-text record from an older file is parsed back
+        json.dumps({"System Name": "PC-0003", "RAM": "16.00 GB", "Disks": [["Samsung SSD", "476.94 GB", "SSD"]]}),
+        record("PC-0004"),
+    ])
+    stats = IngestStats()
+    snapshots = list(ingest([path], stats, max_line_bytes=2000))
+    assert [snapshot.system_name for snapshot in snapshots] == ["PC-0001", "PC-0003", "PC-0004"]
+    assert snapshots[1].ram_bytes == 16 * 1024 ** 3
+    assert (stats.files, stats.records, stats.skipped, stats.invalid) == (1, 3, 1, 4)
+    reasons = [reason for _, _, reason in stats.examples]
+    assert [line for _, line, _ in stats.examples] == [2, 4, 6, 7]
+    assert reasons[0].startswith("not JSON") and "System Name" in reasons[1]
+    assert "Collected At" in reasons[2] and "longer than 2000 bytes" in reasons[3]
+
+def test_every_stage_gets_every_record_in_order():
+    def collect(items):
+        return list(items)
+
+    def first_only(items):
+        # Stops reading early; must not block the others
+        return next(iter(items))
+    results = fan_out(iter(range(1000)), {"a": collect, "b": collect, "c": first_only}, queue_size=20, chunk_size=7)
+    assert results["a"] == results["b"] == list(range(1000))
+    assert results["c"] == 0
+
+def test_failing_stage_is_raised():
+    def fail(items):
+        for item in items:
+            if item == 50:
+                raise ValueError("boom")
+
+    stages = {"bad": fail, "ok": lambda items: sum(1 for _ in items)}
+    with pytest.raises(RuntimeError, match="stage 'bad' failed: boom"):
+        fan_out(iter(range(10000)), stages, queue_size=20, chunk_size=5)
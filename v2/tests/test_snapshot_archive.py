@@ -0,0 +1,63 @@
+import pytest
+import snapshot_archive
+from snapshot_archive import SnapshotArchive, write_archive
+from records import Snapshot, Disk, Monitor, Adapter, Cpu, FieldError
+
+def full_snapshot(name, collected_at="2026-01-01 09:00:00"):
+    return Snapshot(
+        system_name=name, ip_address="10.0.0.5", ram_bytes=16 * 1024 ** 3, model="EliteBook 840",
+        cpu=Cpu("Intel Core i5", 2400, 4, 8), serial_number="8CG0123XYZ", os_name="Windows 11 Pro",
+        collected_at=collected_at, disks=[Disk("Samsung SSD", 512 * 10 ** 9, "SSD")],
+        monitors=[Monitor("HPN", "HP E24", "3344", "CN123", 12, 2021, 53, 30)],
+        adapters=[Adapter("Ethernet", ["10.0.0.5"], [], "00:11:22:33:44:55", 1000, True)])
+
+@pytest.fixture
+def archive_of(tmp_path):
+    opened = []
+
+    def archive_of(snapshots):
+        path = tmp_path / f"fleet{snapshot_archive.ARCHIVE_EXTENSION}"
+        write_archive(str(path), snapshots)
+        opened.append(SnapshotArchive(str(path)))
+        return opened[-1]
+    yield archive_of
+    for archive in opened:
+        archive.close()
+
+def test_round_trip(archive_of):
+    snapshot = full_snapshot("PC-0001")
+    assert archive_of([snapshot])[0].to_dict() == snapshot.to_dict()
+
+def test_uncollected_lists_stay_none(archive_of):
+    # None (not collected / timed out) and [] (none present) are different answers
+    missing = full_snapshot("PC-0001")
+    missing.disks = missing.monitors = missing.adapters = None
+    empty = full_snapshot("PC-0002")
+    empty.disks = empty.monitors = empty.adapters = []
+    failed = full_snapshot("PC-0003")
+    failed.set("Disks", FieldError("timed out", "No answer within 30 s"))
+    archive = archive_of([missing, empty, failed])
+    assert (archive[0].disks, archive[0].monitors, archive[0].adapters) == (None, None, None)
+    assert (archive[1].disks, archive[1].monitors, archive[1].adapters) == ([], [], [])
+    assert archive[2].disks is None and archive[2].errors["Disks"].status == "timed out"
+    assert archive[2].monitors and archive[2].adapters
+    assert [record.to_dict() for record in archive] == [s.to_dict() for s in (missing, empty, failed)]
+
+def test_find_latest(archive_of):
+    archive = archive_of([full_snapshot("PC-0002"), full_snapshot("PC-0001", "2026-01-01 09:00:00"),
+                          full_snapshot("PC-0001", "2026-02-01 09:00:00")])
+    assert archive.find("PC-0001") == 2
+    assert archive.find("PC-0003") is None
+
+def test_other_version_refused(tmp_path, archive_of, monkeypatch):
+    archive_of([full_snapshot("PC-0001")])
+    monkeypatch.setattr(snapshot_archive, "VERSION", snapshot_archive.VERSION + 1)
+    with pytest.raises(ValueError, match="not supported"):
+        SnapshotArchive(str(tmp_path / f"fleet{snapshot_archive.ARCHIVE_EXTENSION}"))
+
+def test_product_key_not_archived(tmp_path, archive_of):
+    snapshot = full_snapshot("PC-0001")
+    snapshot.product_key = "AAAAA-BBBBB-CCCCC-DDDDD-EEEEE"
+    archive = archive_of([snapshot])
+    assert archive[0].product_key is None
+    assert b"AAAAA" not in (tmp_path / f"fleet{snapshot_archive.ARCHIVE_EXTENSION}").read_bytes()
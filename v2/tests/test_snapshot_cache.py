@@ -0,0 +1,28 @@
+import json
+from snapshot_cache import SnapshotCache
+from records import Snapshot, Cpu
+
+KEY = "AAAAA-BBBBB-CCCCC-DDDDD-EEEEE"
+
+def fake_collect(calls):
+    def collect(cancel_event=None, fields=None, on_result=None, **extra):
+        calls.append(list(fields))
+        return Snapshot(system_name="PC-0001", serial_number="8CG0123XYZ", product_key=KEY,
+                        cpu=Cpu("Intel Core i5", 2400, 4, 8))
+    return collect
+
+def test_product_key_stays_in_memory(tmp_path):
+    path = str(tmp_path / "snapshot_cache.json")
+    calls = []
+    cache = SnapshotCache(fake_collect(calls), persist_path=path)
+    assert cache.get().product_key == KEY
+    # Kept for the process lifetime...
+    assert cache.get().product_key == KEY and len(calls) == 1
+    # ...but never written, so the next run reads it again
+    with open(path, encoding="utf-8") as f:
+        values = json.load(f)["values"]
+    assert values["Serial Number"] == "8CG0123XYZ" and "Product Key" not in values
+    again = []
+    reloaded = SnapshotCache(fake_collect(again), persist_path=path)
+    assert "Serial Number" in reloaded.peek() and "Product Key" not in reloaded.peek()
+    assert reloaded.get().product_key == KEY and "Product Key" in again[0]
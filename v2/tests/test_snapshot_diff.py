@@ -0,0 +1,74 @@
+from snapshot_diff import diff_snapshots, make_delta, apply_delta, diff_series, diff_stream
+from records import Snapshot, Disk, Monitor, Adapter, Cpu, FieldError
+
+def base_snapshot(collected_at="2026-01-01T09:00:00+00:00"):
+    return Snapshot(
+        system_name="PC-0001", ip_address="10.0.0.5", ram_bytes=8 * 1024 ** 3, model="EliteBook 840",
+        cpu=Cpu("Intel Core i5", 2400, 4, 8), serial_number="8CG0123XYZ", os_name="Windows 11 Pro",
+        os_status="Running", collected_at=collected_at,
+        disks=[Disk("Samsung SSD", 512 * 10 ** 9, "SSD"), Disk("Samsung SSD", 512 * 10 ** 9, "SSD")],
+        monitors=[Monitor("HPN", "HP E24", "3344", "CN123", 12, 2021, 53, 30)],
+        adapters=[Adapter("Ethernet", ["10.0.0.5"], [], "00:11:22:33:44:55", 1000, True)])
+
+def newer(**changes):
+    snapshot = Snapshot.from_dict(base_snapshot().to_dict())
+    snapshot.collected_at = "2026-02-01T09:00:00+00:00"
+    for name, value in changes.items():
+        setattr(snapshot, name, value)
+    return snapshot
+
+def assert_round_trip(old, new, ignore_failures=True):
+    assert apply_delta(old, make_delta(old, new, ignore_failures)) == new
+
+def test_no_changes():
+    assert diff_snapshots(base_snapshot(), newer()) == {}
+    # OS Status changes without the hardware changing
+    assert diff_snapshots(base_snapshot(), newer(os_status="Stopped")) == {}
+
+def test_scalar_changes():
+    new = newer(ram_bytes=16 * 1024 ** 3, ip_address="10.0.0.9", cpu=Cpu("Intel Core i7", 2800, 4, 8))
+    changes = diff_snapshots(base_snapshot(), new)
+    assert changes["RAM"] == {"old": 8 * 1024 ** 3, "new": 16 * 1024 ** 3}
+    assert changes["IP Address"] == {"old": "10.0.0.5", "new": "10.0.0.9"}
+    assert changes["CPU Details"]["new"]["name"] == "Intel Core i7"
+    assert set(changes) == {"RAM", "IP Address", "CPU Details"}
+    assert_round_trip(base_snapshot(), new)
+
+def test_list_items_added_and_removed():
+    ssd, hdd = Disk("Samsung SSD", 512 * 10 ** 9, "SSD"), Disk("WD Blue", 10 ** 12, "HDD")
+    wifi = Adapter("Wi-Fi", [], [], "66:77:88:99:AA:BB", None, False)
+    # One of two identical disks swapped for another one
+    new = newer(disks=[ssd, hdd], monitors=[], adapters=base_snapshot().adapters + [wifi])
+    changes = diff_snapshots(base_snapshot(), new)
+    assert changes["Disks"] == {"added": [hdd.to_dict()], "removed": [ssd.to_dict()]}
+    assert changes["Monitor Details"]["added"] == [] and len(changes["Monitor Details"]["removed"]) == 1
+    assert [item["name"] for item in changes["Network Adapters"]["added"]] == ["Wi-Fi"]
+    assert_round_trip(base_snapshot(), new)
+
+def test_field_between_error_and_value():
+    failed = newer()
+    failed.set("Disks", FieldError("timed out", "No answer within 30 s"))
+    # A failed probe says nothing about the hardware, unless asked for
+    assert diff_snapshots(base_snapshot(), failed) == {}
+    changes = diff_snapshots(base_snapshot(), failed, ignore_failures=False)
+    assert changes["Disks"]["new"] == {"Error": {"status": "timed out", "message": "No answer within 30 s"}}
+    assert_round_trip(base_snapshot(), failed, ignore_failures=False)
+    # ...and back to a value
+    recovered = newer(disks=[Disk("WD Blue", 10 ** 12, "HDD")])
+    assert diff_snapshots(failed, recovered, ignore_failures=False)["Disks"]["old"]["Error"]["status"] == "timed out"
+    assert_round_trip(failed, recovered, ignore_failures=False)
+
+def test_apply_delta_leaves_base_alone():
+    base = base_snapshot()
+    apply_delta(base, make_delta(base, newer(disks=[])))
+    assert base == base_snapshot()
+
+def test_series_and_stream():
+    first, second, third = base_snapshot(), newer(ram_bytes=16 * 1024 ** 3), newer(ram_bytes=16 * 1024 ** 3)
+    third.collected_at = "2026-03-01T09:00:00+00:00"
+    # Unchanged collections are left out; input order does not matter
+    deltas = diff_series([third, first, second])
+    assert [(delta["From"], delta["To"]) for delta in deltas] == [(first.collected_at, second.collected_at)]
+    assert list(diff_stream([first, second, third])) == deltas
+    # An older snapshot arriving late is skipped
+    assert list(diff_stream([second, first])) == []
@@ -0,0 +1,53 @@
+import json
+import sqlite3
+from snapshot_store import SnapshotStore
+from records import Snapshot, Disk, Cpu, FieldError
+
+def typed_snapshot(name="PC-0001", collected_at="2026-01-01T09:00:00+00:00"):
+    snapshot = Snapshot(system_name=name, serial_number="8CG0123XYZ", ram_bytes=17179869184, collected_at=collected_at,
+                        cpu=Cpu("Intel Core i5", 2400, 4, 8), disks=[Disk("Samsung SSD", 512110190592, "SSD")])
+    snapshot.set("Monitor Details", FieldError("timed out", "Timed Out"))
+    return snapshot
+
+def test_snapshots_are_stored_typed(tmp_path):
+    snapshot = typed_snapshot()
+    with SnapshotStore(str(tmp_path / "snapshots.db")) as store:
+        store.add(snapshot)
+        store.add(typed_snapshot(collected_at="2026-02-01T09:00:00+00:00"))
+        # Exact byte counts, the error and the uncollected list all come back
+        assert store.history("PC-0001")[-1] == snapshot
+        assert store.latest("PC-0001").collected_at == "2026-02-01T09:00:00+00:00"
+        assert store.find_by_serial("8CG0123XYZ", limit=1)[0].adapters is None
+        assert [s.system_name for s in store.latest_per_host()] == ["PC-0001"]
+
+def test_legacy_database_is_read_and_extended(tmp_path):
+    # A database written before snapshots were stored typed: display text per column
+    path = str(tmp_path / "snapshots.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE snapshots (id INTEGER PRIMARY KEY, system_name TEXT NOT NULL, serial_number TEXT, "
+               "collected_at TEXT NOT NULL, ip_address TEXT, ram TEXT, cpu_model_name TEXT, cpu_details TEXT, "
+               "product_key TEXT, monitor_details TEXT, disks TEXT, os_name TEXT, os_status TEXT)")
+    db.execute("INSERT INTO snapshots (system_name, serial_number, collected_at, ram, cpu_details, monitor_details, "
+               "disks) VALUES (?, ?, ?, ?, ?, ?, ?)",
+               ("PC-0001", "8CG0123XYZ", "2025-01-01T09:00:00+00:00", "16.00 GB",
+                "Intel Core i5, 2400 MHz, 4 Core(s), 8 Logical Processor(s)", "Name: HP E24\nSerial: CN123",
+                json.dumps([["Samsung SSD", "476.94 GB", "SSD"]])))
+    db.commit()
+    db.close()
+    with SnapshotStore(path) as store:
+        store.add(typed_snapshot())
+        old, new = store.history("PC-0001")[::-1]
+        # Parsed back once, at the 0.01 GB the text was shown at
+        assert (old.ram_bytes, old.cpu) == (17179869184, Cpu("Intel Core i5", 2400, 4, 8))
+        assert old.disks == [Disk("Samsung SSD", 512110425539, "SSD")]
+        assert old.monitors[0].serial == "CN123"
+        assert new == typed_snapshot()
+
+def test_product_key_not_stored(tmp_path):
+    snapshot = typed_snapshot()
+    snapshot.product_key = "AAAAA-BBBBB-CCCCC-DDDDD-EEEEE"
+    path = tmp_path / "snapshots.db"
+    with SnapshotStore(str(path)) as store:
+        store.add(snapshot)
+        assert store.latest("PC-0001").product_key is None
+    assert b"AAAAA" not in path.read_bytes()